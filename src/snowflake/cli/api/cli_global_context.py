@@ -4,6 +4,7 @@ from typing import Dict, Optional
 
 from snowflake.cli.api.exceptions import InvalidSchemaError
 from snowflake.cli.api.output.formats import OutputFormat
+from snowflake.cli.api.session_state import SessionState
 from snowflake.connector import SnowflakeConnection
 
 schema_pattern = re.compile(r".+\..+")
@@ -12,6 +13,7 @@ schema_pattern = re.compile(r".+\..+")
 class _ConnectionContext:
     def __init__(self):
         self._cached_connection: Optional[SnowflakeConnection] = None
+        self._session_state = SessionState()
 
         self._connection_name: Optional[str] = None
         self._account: Optional[str] = None
@@ -31,7 +33,7 @@ class _ConnectionContext:
         We invalidate connection cache every time connection attributes change.
         """
         super().__setattr__(key, value)
-        if key != "_cached_connection":
+        if key not in ("_cached_connection", "_session_state"):
             self._cached_connection = None
 
     @property
@@ -128,9 +130,15 @@ class _ConnectionContext:
     @property
     def connection(self) -> SnowflakeConnection:
         if not self._cached_connection:
+            self._session_state = SessionState()
             self._cached_connection = self._build_connection()
         return self._cached_connection
 
+    @property
+    def session_state(self) -> SessionState:
+        """State of the session of the cached connection, as tracked by the CLI."""
+        return self._session_state
+
     def _collect_not_empty_connection_attributes(self):
         return {
             "account": self.account,
@@ -144,6 +152,13 @@ class _ConnectionContext:
             "warehouse": self.warehouse,
         }
 
+    def new_connection(self) -> SnowflakeConnection:
+        """
+        Opens an additional connection using the same parameters as the cached one.
+        The caller owns the returned connection and is responsible for closing it.
+        """
+        return self._build_connection()
+
     def _build_connection(self):
         from snowflake.cli.app.snow_connector import connect_to_snowflake
 
@@ -165,6 +180,7 @@ class _CliGlobalContextManager:
         self._project_definition = None
         self._project_root = None
         self._silent: bool = False
+        self._profile_queries: bool = False
 
     def reset(self):
         self.__init__()
@@ -197,6 +213,13 @@ class _CliGlobalContextManager:
     def set_experimental(self, value: bool):
         self._experimental = value
 
+    @property
+    def profile_queries(self) -> bool:
+        return self._profile_queries
+
+    def set_profile_queries(self, value: bool):
+        self._profile_queries = value
+
     @property
     def project_definition(self) -> Optional[Dict]:
         return self._project_definition
@@ -235,6 +258,13 @@ class _CliGlobalContextAccess:
     def connection(self) -> SnowflakeConnection:
         return self._manager.connection
 
+    def new_connection(self) -> SnowflakeConnection:
+        return self._manager.connection_context.new_connection()
+
+    @property
+    def session_state(self) -> SessionState:
+        return self._manager.connection_context.session_state
+
     @property
     def enable_tracebacks(self) -> bool:
         return self._manager.enable_tracebacks
@@ -251,6 +281,10 @@ class _CliGlobalContextAccess:
     def experimental(self) -> bool:
         return self._manager.experimental
 
+    @property
+    def profile_queries(self) -> bool:
+        return self._manager.profile_queries
+
     @property
     def project_definition(self):
         return self._manager.project_definition
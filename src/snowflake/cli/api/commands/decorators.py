@@ -16,6 +16,7 @@ from snowflake.cli.api.commands.flags import (
     OutputFormatOption,
     PasswordOption,
     PrivateKeyPathOption,
+    ProfileQueriesOption,
     RoleOption,
     SchemaOption,
     SilentOption,
@@ -242,6 +243,12 @@ GLOBAL_CONNECTION_OPTIONS = [
         annotation=Optional[str],
         default=MfaPasscodeOption,
     ),
+    inspect.Parameter(
+        "profile_queries",
+        inspect.Parameter.KEYWORD_ONLY,
+        annotation=Optional[bool],
+        default=ProfileQueriesOption,
+    ),
 ]
 
 GLOBAL_OPTIONS = [
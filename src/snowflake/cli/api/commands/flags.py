@@ -202,6 +202,15 @@ DebugOption = typer.Option(
     rich_help_panel=_CLI_BEHAVIOUR,
 )
 
+ProfileQueriesOption = typer.Option(
+    False,
+    "--profile-queries",
+    help="Reports the compilation, queued and execution times of the queries issued by the command from the query history, next to the client wall time.",
+    callback=_callback(lambda: cli_context_manager.set_profile_queries),
+    is_flag=True,
+    rich_help_panel=_CONNECTION_SECTION,
+)
+
 LikeOption = typer.Option(
     "%%",
     "--like",
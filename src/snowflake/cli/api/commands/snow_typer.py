@@ -1,17 +1,22 @@
 from __future__ import annotations
 
 import logging
+import sys
+from contextlib import redirect_stdout
 from functools import wraps
 from typing import Optional
 
 import typer
+from snowflake.cli.api.cli_global_context import cli_context
 from snowflake.cli.api.commands.decorators import (
     global_options,
     global_options_with_connection,
 )
 from snowflake.cli.api.commands.flags import DEFAULT_CONTEXT_SETTINGS
 from snowflake.cli.api.exceptions import CommandReturnTypeError
-from snowflake.cli.api.output.types import CommandResult
+from snowflake.cli.api.in_flight_queries import cancel_queries_on_interrupt
+from snowflake.cli.api.output.types import CollectionResult, CommandResult
+from snowflake.cli.api.query_profile import query_profiler
 from snowflake.cli.app.printing import print_result
 from snowflake.cli.app.telemetry import flush_telemetry, log_command_usage
 
@@ -52,12 +57,14 @@ class SnowTyper(typer.Typer):
                 """Wrapper around command callable. This is what happens at "runtime"."""
                 self.pre_execute()
                 try:
-                    result = command_callable(*args, **kw)
-                    return self.process_result(result)
+                    with cancel_queries_on_interrupt():
+                        result = command_callable(*args, **kw)
+                        return self.process_result(result)
                 except Exception as err:
                     self.exception_handler(err)
                     raise
                 finally:
+                    self.report_query_profile()
                     self.post_execute()
 
             return super(SnowTyper, self).command(name=name, **kwargs)(
@@ -87,6 +94,23 @@ class SnowTyper(typer.Typer):
             raise CommandReturnTypeError(type(result))
         print_result(result)
 
+    @staticmethod
+    def report_query_profile():
+        """
+        Prints the server and client times of the queries of the command if
+        requested with --profile-queries. The report goes to stderr, so that it
+        does not mix with the output of the command.
+        """
+        if not cli_context.profile_queries or not len(query_profiler):
+            return
+        try:
+            rows = query_profiler.report(cli_context.connection)
+        except Exception as err:
+            log.warning("Could not profile the queries: %s", err)
+            return
+        with redirect_stdout(sys.stderr):
+            print_result(CollectionResult(rows))
+
     @staticmethod
     def exception_handler(exception: Exception):
         """
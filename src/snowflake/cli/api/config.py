@@ -36,6 +36,8 @@ PLUGINS_SECTION = "plugins"
 LOGS_SECTION_PATH = [CLI_SECTION, LOGS_SECTION]
 PLUGINS_SECTION_PATH = [CLI_SECTION, PLUGINS_SECTION]
 
+CACHE_DIRECTORY_NAME = "cache"
+
 CONFIG_MANAGER.add_option(
     name=CLI_SECTION,
     parse_str=tomlkit.parse,
@@ -144,6 +146,14 @@ def get_config_value(*path, key: str, default: Optional[Any] = Empty) -> Any:
         raise
 
 
+def get_cache_dir() -> Path:
+    """
+    Returns the directory in which the CLI keeps local caches. It lives next to
+    the default configuration files, so it follows SNOWFLAKE_HOME.
+    """
+    return CONFIG_FILE.parent / CACHE_DIRECTORY_NAME
+
+
 def _initialise_config(config_file: Path) -> None:
     config_file = SecurePath(config_file)
     config_file.parent.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List
+
+from snowflake.connector import SnowflakeConnection
+
+# how long an interrupted command waits for its queries to be cancelled
+CANCEL_TIMEOUT_SECONDS = 5.0
+INTERRUPT_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+log = logging.getLogger(__name__)
+
+
+class InFlightQueries:
+    """
+    Thread-safe registry of the queries which may still be running on behalf of the
+    current command. Asynchronous queries are known by id from the moment they are
+    submitted. A synchronous statement only gets its id once it has finished, so
+    its session is registered as busy while it runs instead.
+    """
+
+    def __init__(self):
+        # reentrant, as the signal handler may interrupt the main thread holding it
+        self._lock = threading.RLock()
+        self._query_ids: Dict[str, SnowflakeConnection] = {}
+        self._busy_sessions: Dict[int, List] = {}
+
+    def add_query(self, connection: SnowflakeConnection, query_id: str) -> None:
+        with self._lock:
+            self._query_ids[query_id] = connection
+
+    def remove_query(self, query_id: str) -> None:
+        with self._lock:
+            self._query_ids.pop(query_id, None)
+
+    @contextmanager
+    def running_on(self, connection: SnowflakeConnection) -> Iterator[None]:
+        """Marks the session as busy with a synchronous statement."""
+        key = id(connection)
+        with self._lock:
+            entry = self._busy_sessions.setdefault(key, [connection, 0])
+            entry[1] += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    self._busy_sessions.pop(key, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._query_ids) + len(self._busy_sessions)
+
+    def cancel_all(self, timeout: float = CANCEL_TIMEOUT_SECONDS) -> int:
+        """
+        Cancels all registered queries concurrently and waits at most timeout
+        seconds for Snowflake to confirm. Returns the number of cancel requests.
+        """
+        with self._lock:
+            query_ids = dict(self._query_ids)
+            sessions = [connection for connection, _ in self._busy_sessions.values()]
+            self._query_ids.clear()
+
+        requests: List[Callable[[], None]] = [
+            lambda c=connection, q=query_id: _execute(
+                c, f"select system$cancel_query('{q}')"
+            )
+            for query_id, connection in query_ids.items()
+        ] + [
+            lambda c=connection: _execute(
+                c, f"select system$cancel_all_queries({c.session_id})"
+            )
+            for connection in sessions
+        ]
+        # daemon threads, so that an unresponsive server cannot block the exit
+        threads = [
+            threading.Thread(target=request, daemon=True) for request in requests
+        ]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+        return len(requests)
+
+
+def _execute(connection: SnowflakeConnection, query: str) -> None:
+    try:
+        connection.cursor().execute(query)
+    except Exception as err:
+        log.debug("Could not cancel queries with %s: %s", query, err)
+
+
+in_flight_queries = InFlightQueries()
+
+
+@contextmanager
+def cancel_queries_on_interrupt() -> Iterator[None]:
+    """
+    Cancels the in-flight queries when the command is interrupted with SIGINT or
+    SIGTERM, then lets the signal take its usual effect. Signal handlers can only
+    be installed from the main thread, elsewhere this is a no-op.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    # handlers not installed from Python (None) cannot be restored, so keep them
+    previous_handlers = {
+        signum: signal.getsignal(signum)
+        for signum in INTERRUPT_SIGNALS
+        if signal.getsignal(signum) is not None
+    }
+
+    def _handler(signum, frame):
+        if len(in_flight_queries):
+            log.info("Interrupted, cancelling in-flight queries")
+            in_flight_queries.cancel_all()
+        # restore the previous behaviour, e.g. KeyboardInterrupt for SIGINT
+        signal.signal(signum, previous_handlers[signum])
+        os.kill(os.getpid(), signum)
+
+    for signum in previous_handlers:
+        signal.signal(signum, _handler)
+    try:
+        yield
+    finally:
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import json
+import logging
+import typing as t
+from pathlib import Path
+
+from snowflake.connector.constants import FIELD_ID_TO_NAME
+from snowflake.connector.cursor import ResultMetadata, SnowflakeCursor
+from snowflake.connector.errors import (
+    MissingDependencyError,
+    NotSupportedError,
+    ProgrammingError,
+)
+
+if t.TYPE_CHECKING:
+    import pyarrow
+
+log = logging.getLogger(__name__)
+
+# Snowflake types whose Arrow values convert to the same Python values as the rows
+# of the cursor. Scaled numbers arrive as floats and zoned timestamps lose their
+# offsets, so their JSON would differ.
+_JSON_COMPATIBLE_TYPES = {
+    "FIXED",
+    "REAL",
+    "TEXT",
+    "DATE",
+    "TIME",
+    "TIMESTAMP_NTZ",
+    "BOOLEAN",
+    "VARIANT",
+    "OBJECT",
+    "ARRAY",
+}
+
+
+def fetch_arrow_batches(
+    cursor: SnowflakeCursor,
+) -> t.Optional[t.Iterator[pyarrow.Table]]:
+    """
+    Returns the result of the cursor as Arrow tables, chunked as sent by Snowflake.
+    Returns None if the result is not available in Arrow format, for example when
+    the optional pyarrow and pandas dependencies are not installed, in which case
+    the rows of the cursor have to be used instead.
+    """
+    try:
+        return cursor.fetch_arrow_batches()
+    except (MissingDependencyError, NotSupportedError, ProgrammingError) as err:
+        log.debug("Result is not available in Arrow format: %s", err)
+        return None
+
+
+def write_csv(batches: t.Iterable[pyarrow.Table], stream: t.BinaryIO) -> int:
+    """
+    Writes the batches as CSV with a single header line and returns the number of
+    rows written. Nothing is written for an empty result, as its columns are not
+    known.
+    """
+    from pyarrow import csv
+
+    writer = None
+    rows = 0
+    for batch in _with_common_schema(batches):
+        if writer is None:
+            writer = csv.CSVWriter(stream, batch.schema)
+        writer.write_table(batch)
+        rows += batch.num_rows
+    if writer is not None:
+        writer.close()
+    return rows
+
+
+def is_json_compatible(description: t.Iterable[ResultMetadata]) -> bool:
+    """
+    Checks whether a result with the given columns can be written as JSON from its
+    Arrow batches, giving the same output as when it is written from its rows.
+    """
+    for column in description:
+        type_name = FIELD_ID_TO_NAME.get(column.type_code)
+        if type_name not in _JSON_COMPATIBLE_TYPES:
+            return False
+        if type_name == "FIXED" and column.scale:
+            return False
+    return True
+
+
+def iter_json_chunks(
+    batches: t.Iterable[pyarrow.Table],
+    column_names: t.List[str],
+    encoder: json.JSONEncoder,
+    indent: int,
+) -> t.Iterator[str]:
+    """
+    Yields the batches as a JSON array of row objects, in the same chunks as
+    `json.dump` yields for a list of dicts mapping column names to row values.
+    Values are converted a column at a time, without creating a dict per row.
+    """
+    # like a dict, keeps the position of the first and the value of the last
+    # column with a repeated name
+    positions = {name: index for index, name in enumerate(column_names)}
+    keys = [encoder.encode(name) for name in positions]
+    row_indent = "\n" + " " * indent
+    value_indent = "\n" + " " * (2 * indent)
+
+    empty = True
+    for batch in batches:
+        columns = [
+            [encoder.encode(value) for value in _to_json_values(batch.column(index))]
+            for index in positions.values()
+        ]
+        for values in zip(*columns):
+            yield f"[{row_indent}" if empty else f",{row_indent}"
+            empty = False
+            yield "{"
+            yield value_indent
+            for index, (key, value) in enumerate(zip(keys, values)):
+                if index:
+                    yield f",{value_indent}"
+                yield key
+                yield ": "
+                yield value
+            yield row_indent
+            yield "}"
+    if empty:
+        yield "[]"
+    else:
+        yield "\n"
+        yield "]"
+
+
+def write_ndjson(batches: t.Iterable[pyarrow.Table], stream: t.TextIO) -> int:
+    """
+    Writes the batches as newline-delimited JSON, one row object per line, and
+    returns the number of rows written.
+    """
+    rows = 0
+    for batch in batches:
+        if not batch.num_rows:
+            continue
+        records = _to_json_records(batch, lines=True)
+        stream.write(records if records.endswith("\n") else f"{records}\n")
+        rows += batch.num_rows
+    return rows
+
+
+def write_parquet(
+    batches: t.Iterable[pyarrow.Table], sink: t.Union[Path, t.BinaryIO]
+) -> int:
+    """
+    Writes the batches to a Parquet file, one row group per batch, and returns the
+    number of rows written. Nothing is written for an empty result, as its
+    columns are not known.
+    """
+    from pyarrow import parquet
+
+    writer = None
+    rows = 0
+    try:
+        for batch in _with_common_schema(batches):
+            if writer is None:
+                writer = parquet.ParquetWriter(sink, batch.schema)
+            writer.write_table(batch)
+            rows += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def _with_common_schema(
+    batches: t.Iterable[pyarrow.Table],
+) -> t.Iterator[pyarrow.Table]:
+    """
+    Casts the batches to the schema of the first one, with integer columns widened
+    to int64. The connector sends integer columns in the narrowest type fitting the
+    values of each chunk, so their types can differ between batches.
+    """
+    import pyarrow
+
+    schema = None
+    for batch in batches:
+        if schema is None:
+            schema = pyarrow.schema(
+                [
+                    field.with_type(pyarrow.int64())
+                    if pyarrow.types.is_integer(field.type)
+                    else field
+                    for field in batch.schema
+                ],
+                metadata=batch.schema.metadata,
+            )
+        yield batch.cast(schema)
+
+
+def _to_json_values(column: pyarrow.ChunkedArray) -> list:
+    import pyarrow
+
+    column_type = column.type
+    if pyarrow.types.is_decimal(column_type):
+        # unscaled numbers too large for int64
+        return [None if value is None else int(value) for value in column.to_pylist()]
+    if pyarrow.types.is_timestamp(column_type) or pyarrow.types.is_time64(column_type):
+        # rows of the cursor hold microseconds, Arrow batches may hold nanoseconds
+        unit_type = (
+            pyarrow.timestamp("us")
+            if pyarrow.types.is_timestamp(column_type)
+            else pyarrow.time64("us")
+        )
+        column = column.cast(unit_type, safe=False)
+    return column.to_pylist()
+
+
+def _to_json_records(batch: pyarrow.Table, **to_json_kwargs) -> str:
+    return batch.to_pandas(integer_object_nulls=True).to_json(
+        orient="records",
+        date_format="iso",
+        date_unit="us",
+        force_ascii=False,
+        default_handler=str,
+        **to_json_kwargs,
+    )
@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import typing as t
 
+from snowflake.cli.api.output.arrow import fetch_arrow_batches, is_json_compatible
 from snowflake.connector.cursor import SnowflakeCursor
 
 
@@ -56,6 +57,35 @@ class QueryResult(CollectionResult):
         return self._query
 
 
+class ArrowQueryResult(QueryResult):
+    """
+    Query result which can be written straight from the Arrow batches of the
+    cursor, without creating a Python object per row. Either the rows or the
+    batches can be consumed, not both.
+    """
+
+    def __init__(self, cursor: SnowflakeCursor):
+        super().__init__(cursor)
+        self._cursor = cursor
+        self._description = list(cursor.description)
+
+    def arrow_batches(self):
+        """
+        Returns the result as Arrow tables or None if it is not available in Arrow
+        format, in which case `result` has to be used instead.
+        """
+        return fetch_arrow_batches(self._cursor)
+
+    def json_arrow_batches(self):
+        """
+        Like `arrow_batches`, but also returns None if the columns have types whose
+        JSON would differ when written from the Arrow tables instead of the rows.
+        """
+        if not is_json_compatible(self._description):
+            return None
+        return self.arrow_batches()
+
+
 class SingleQueryResult(ObjectResult):
     def __init__(self, cursor: SnowflakeCursor):
         super().__init__(element=self._prepare_payload(cursor))
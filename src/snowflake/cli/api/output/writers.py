@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import csv
+import json
+import typing as t
+from datetime import date, datetime, time
+from enum import Enum
+from itertools import islice
+from pathlib import Path
+
+from click import ClickException
+from snowflake.cli.api.output import arrow
+from snowflake.cli.api.output.types import ArrowQueryResult, QueryResult
+from snowflake.cli.api.secure_path import SecurePath
+
+# number of rows converted at once when writing Parquet files from rows
+ROWS_PER_CHUNK = 10_000
+
+
+class OutputFileFormat(Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
+
+    @classmethod
+    def from_path(cls, path: Path) -> OutputFileFormat:
+        suffix = path.suffix.lower().lstrip(".")
+        if suffix == "jsonl":
+            return cls.NDJSON
+        try:
+            return cls(suffix)
+        except ValueError:
+            raise ClickException(
+                f"Cannot infer the format of {path} from its extension. "
+                f"Use one of: {', '.join(f.value for f in cls)}."
+            )
+
+
+def write_query_result(
+    result: QueryResult, path: Path, file_format: OutputFileFormat
+) -> int:
+    """
+    Writes the result to the file as it is read, so that it never has to be held in
+    memory as a whole. Arrow batches are used when the result provides them.
+    Returns the number of rows written.
+    """
+    batches = result.arrow_batches() if isinstance(result, ArrowQueryResult) else None
+    if batches is not None and file_format != OutputFileFormat.NDJSON:
+        # the columns of an empty result are only known from the cursor
+        batches = _with_empty_table(batches, result.column_names)
+
+    file_path = SecurePath(path)
+    if file_format == OutputFileFormat.CSV:
+        if batches is not None:
+            with file_path.open("wb") as fh:
+                return arrow.write_csv(batches, fh)
+        with file_path.open("w", newline="") as fh:
+            return _write_csv_rows(result, fh)
+    if file_format == OutputFileFormat.NDJSON:
+        with file_path.open("w") as fh:
+            if batches is not None:
+                return arrow.write_ndjson(batches, fh)
+            return _write_ndjson_rows(result, fh)
+
+    _assert_pyarrow_installed(file_format)
+    with file_path.open("wb") as fh:
+        if batches is None:
+            batches = _rows_to_tables(result)
+        return arrow.write_parquet(batches, fh)
+
+
+def _write_csv_rows(result: QueryResult, stream: t.TextIO) -> int:
+    writer = csv.writer(stream)
+    writer.writerow(result.column_names)
+    rows = 0
+    for row in result.result:
+        writer.writerow(_csv_value(v) for v in row.values())
+        rows += 1
+    return rows
+
+
+def _write_ndjson_rows(result: QueryResult, stream: t.TextIO) -> int:
+    rows = 0
+    for row in result.result:
+        stream.write(json.dumps(row, default=_json_default, ensure_ascii=False))
+        stream.write("\n")
+        rows += 1
+    return rows
+
+
+def _rows_to_tables(result: QueryResult):
+    import pyarrow
+
+    rows = iter(result.result)
+    schema = None
+    while chunk := list(islice(rows, ROWS_PER_CHUNK)):
+        table = pyarrow.Table.from_pylist(chunk, schema=schema)
+        schema = table.schema
+        yield table
+    if schema is None:
+        yield _empty_table(result.column_names)
+
+
+def _with_empty_table(batches, column_names: t.List[str]):
+    empty = True
+    for batch in batches:
+        empty = False
+        yield batch
+    if empty:
+        yield _empty_table(column_names)
+
+
+def _empty_table(column_names: t.List[str]):
+    import pyarrow
+
+    return pyarrow.table({name: pyarrow.array([]) for name in column_names})
+
+
+def _assert_pyarrow_installed(file_format: OutputFileFormat) -> None:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ClickException(
+            f"Writing {file_format.value} files requires pyarrow. "
+            "Install it with `pip install pyarrow`."
+        )
+
+
+def _csv_value(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    return value
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    return str(value)
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from snowflake.connector import SnowflakeConnection
+from snowflake.connector.cursor import DictCursor
+from snowflake.connector.errors import ProgrammingError
+
+# QUERY_HISTORY_BY_SESSION returns at most this many queries of each session
+QUERY_HISTORY_LIMIT = 10_000
+QUEUED_TIME_COLUMNS = (
+    "QUEUED_PROVISIONING_TIME",
+    "QUEUED_REPAIR_TIME",
+    "QUEUED_OVERLOAD_TIME",
+)
+HISTORY_COLUMNS = (
+    "QUERY_ID",
+    "TOTAL_ELAPSED_TIME",
+    "COMPILATION_TIME",
+    *QUEUED_TIME_COLUMNS,
+    "EXECUTION_TIME",
+)
+STATEMENT_PREVIEW_LENGTH = 40
+TOTAL_ROW = "(total)"
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class ProfiledQuery:
+    query_id: str
+    session_id: Optional[int]
+    statement: str
+    client_seconds: float
+
+
+class QueryProfiler:
+    """
+    Thread-safe collector of the queries executed by the current command together
+    with their client-side wall time, from submitting the statement until the
+    first part of its result arrived.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queries: List[ProfiledQuery] = []
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._queries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._queries = []
+
+    def record(
+        self, connection: SnowflakeConnection, cursor, client_seconds: float
+    ) -> None:
+        query_id = getattr(cursor, "sfqid", None)
+        if not query_id:
+            return
+        with self._lock:
+            self._queries.append(
+                ProfiledQuery(
+                    query_id=query_id,
+                    session_id=getattr(connection, "session_id", None),
+                    statement=str(getattr(cursor, "query", None) or ""),
+                    client_seconds=client_seconds,
+                )
+            )
+
+    def report(self, connection: SnowflakeConnection) -> List[Dict]:
+        """
+        Reads the server times of the recorded queries of all sessions from the
+        query history with a single query and returns them next to the client wall
+        time, followed by their totals. The difference between both is spent on the
+        network and in the client. Server times stay empty for queries missing from
+        the history. The recorded queries are cleared.
+        """
+        with self._lock:
+            queries, self._queries = self._queries, []
+        if not queries:
+            return []
+
+        session_ids = list(dict.fromkeys(q.session_id for q in queries if q.session_id))
+        history = self._read_history(connection, session_ids)
+        rows = [_profile_row(query, history.get(query.query_id)) for query in queries]
+        return [*rows, _total_row(rows)]
+
+    @staticmethod
+    def _read_history(
+        connection: SnowflakeConnection, session_ids: List[int]
+    ) -> Dict[str, Dict]:
+        if not session_ids:
+            return {}
+        query = " union all ".join(
+            f"select {', '.join(HISTORY_COLUMNS).lower()} from table("
+            f"information_schema.query_history_by_session(session_id => {session_id},"
+            f" result_limit => {QUERY_HISTORY_LIMIT}))"
+            for session_id in session_ids
+        )
+        try:
+            cursor = connection.cursor(DictCursor)
+            cursor.execute(query)
+        except ProgrammingError as err:
+            log.warning("Could not read the query history: %s", err)
+            return {}
+        return {row["QUERY_ID"]: row for row in cursor}
+
+
+def _profile_row(query: ProfiledQuery, history: Optional[Dict]) -> Dict:
+    statement = " ".join(query.statement.split())
+    if len(statement) > STATEMENT_PREVIEW_LENGTH:
+        statement = statement[: STATEMENT_PREVIEW_LENGTH - 3] + "..."
+    client_ms = round(query.client_seconds * 1000)
+    row: Dict = {
+        "query_id": query.query_id,
+        "statement": statement,
+        "client_ms": client_ms,
+        "server_ms": None,
+        "compilation_ms": None,
+        "queued_ms": None,
+        "execution_ms": None,
+        "network_and_client_ms": None,
+    }
+    if history:
+        row.update(
+            server_ms=history["TOTAL_ELAPSED_TIME"],
+            compilation_ms=history["COMPILATION_TIME"],
+            queued_ms=sum(history[column] or 0 for column in QUEUED_TIME_COLUMNS),
+            execution_ms=history["EXECUTION_TIME"],
+            network_and_client_ms=max(client_ms - history["TOTAL_ELAPSED_TIME"], 0),
+        )
+    return row
+
+
+def _total_row(rows: List[Dict]) -> Dict:
+    total: Dict = {"query_id": TOTAL_ROW, "statement": f"{len(rows)} queries"}
+    for column in list(rows[0])[2:]:
+        values = [row[column] for row in rows if row[column] is not None]
+        total[column] = sum(values) if values else None
+    return total
+
+
+query_profiler = QueryProfiler()
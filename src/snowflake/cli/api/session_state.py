@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Optional, Set, Tuple
+
+_LEADING_COMMENTS_REGEX = re.compile(r"^(?:\s+|--[^\n]*(?:\n|$)|/\*.*?\*/)*", re.S)
+# statements which may drop a database or schema validated earlier, including
+# ones which may run arbitrary code
+_MAY_DROP_REGEX = re.compile(
+    r"(?:drop\s+(?:database|schema)|call|execute|begin|declare)\b", re.I
+)
+
+
+@dataclass
+class SessionState:
+    """
+    Databases and schemas successfully used during a session, so that their
+    existence does not need to be validated again. The current role, warehouse,
+    database and schema are not tracked here, as the connection keeps them up to
+    date from the response to every query.
+    """
+
+    validated_databases: Set[str] = field(default_factory=set)
+    validated_schemas: Set[Tuple[str, str]] = field(default_factory=set)
+
+    def invalidate(self) -> None:
+        self.validated_databases.clear()
+        self.validated_schemas.clear()
+
+    def is_database_validated(self, database: Optional[str]) -> bool:
+        return database in self.validated_databases
+
+    def is_schema_validated(
+        self, database: Optional[str], schema: Optional[str]
+    ) -> bool:
+        return (database, schema) in self.validated_schemas
+
+    def add_validated_database(self, database: str) -> None:
+        self.validated_databases.add(database)
+
+    def add_validated_schema(self, database: str, schema: str) -> None:
+        self.validated_databases.add(database)
+        self.validated_schemas.add((database, schema))
+
+    def update_from_query(self, query: Optional[str]) -> None:
+        """
+        Forgets the validated databases and schemas after a statement which may
+        have dropped them. This is only a hint, so it errs on the side of
+        forgetting.
+        """
+        if not isinstance(query, str):
+            return
+        query = _LEADING_COMMENTS_REGEX.sub("", query, count=1)
+        if _MAY_DROP_REGEX.match(query):
+            self.invalidate()
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import logging
+import time
 from contextlib import contextmanager
 from functools import cached_property
 from io import StringIO
 from textwrap import dedent
-from typing import Iterable, Optional
+from typing import Iterable, Iterator, Optional
 
 from click import ClickException
 from snowflake.cli.api.cli_global_context import cli_context
@@ -14,10 +15,13 @@ from snowflake.cli.api.exceptions import (
     SchemaNotProvidedError,
     SnowflakeSQLExecutionError,
 )
+from snowflake.cli.api.in_flight_queries import in_flight_queries
 from snowflake.cli.api.project.util import (
     identifier_to_show_like_pattern,
     unquote_identifier,
 )
+from snowflake.cli.api.query_profile import query_profiler
+from snowflake.cli.api.session_state import SessionState
 from snowflake.cli.api.utils.cursor import find_first_row
 from snowflake.connector.cursor import DictCursor, SnowflakeCursor
 from snowflake.connector.errors import ProgrammingError
@@ -31,6 +35,10 @@ class SqlExecutionMixin:
     def _conn(self):
         return cli_context.connection
 
+    @property
+    def _session_state(self) -> SessionState:
+        return cli_context.session_state
+
     @cached_property
     def _log(self):
         return logging.getLogger(__name__)
@@ -53,25 +61,64 @@ class SqlExecutionMixin:
         stream_generator = self._conn.execute_stream(
             stream, remove_comments=remove_comments, cursor_class=cursor_class, **kwargs
         )
-        return stream_generator if return_cursors else list()
+        tracked_generator = self._track_queries(stream_generator)
+        return tracked_generator if return_cursors else list()
+
+    def _track_queries(
+        self, cursors: Iterable[SnowflakeCursor]
+    ) -> Iterator[SnowflakeCursor]:
+        """
+        Marks the session as busy while each statement runs, so that it can be
+        cancelled if the command is interrupted, and records the statements for
+        --profile-queries.
+        """
+        iterator = iter(cursors)
+        while True:
+            start = time.monotonic()
+            with in_flight_queries.running_on(self._conn):
+                try:
+                    cursor = next(iterator)
+                except StopIteration:
+                    return
+            if cli_context.profile_queries:
+                query_profiler.record(self._conn, cursor, time.monotonic() - start)
+            yield cursor
 
     def _execute_query(self, query: str, **kwargs):
         *_, last_result = self._execute_queries(query, **kwargs)
         return last_result
 
     def _execute_queries(self, queries: str, **kwargs):
-        return list(self._execute_string(dedent(queries), **kwargs))
+        """
+        Executes the queries and forgets the databases and schemas validated in the
+        session if any of them may have dropped them. Callers executing statements
+        via _execute_string directly are responsible for invalidating the session
+        state.
+        """
+        try:
+            cursors = list(self._execute_string(dedent(queries), **kwargs))
+        except Exception:
+            # some of the statements may have been executed before the failure
+            self._session_state.invalidate()
+            raise
+        for cursor in cursors:
+            self._session_state.update_from_query(getattr(cursor, "query", None))
+        return cursors
 
     @contextmanager
     def use_role(self, new_role: str):
         """
         Switches to a different role for a while, then switches back.
-        This is a no-op if the requested role is already active.
+        This is a no-op if the requested role is already active. The current role
+        is taken from the connection, which updates it after every query, and only
+        queried if the connection does not know it.
         """
-        role_result = self._execute_query(
-            f"select current_role()", cursor_class=DictCursor
-        ).fetchone()
-        prev_role = role_result["CURRENT_ROLE()"]
+        prev_role = self._conn.role
+        if prev_role is None:
+            role_result = self._execute_query(
+                f"select current_role()", cursor_class=DictCursor
+            ).fetchone()
+            prev_role = role_result["CURRENT_ROLE()"]
         is_different_role = new_role.lower() != prev_role.lower()
         if is_different_role:
             self._log.debug("Assuming different role: %s", new_role)
@@ -101,10 +148,15 @@ class SqlExecutionMixin:
         """
         if not database:
             raise DatabaseNotProvidedError()
+        if self._session_state.is_database_validated(
+            database
+        ) and self._is_current_object(self._conn.database, database):
+            return
         try:
             self._execute_query(f"USE DATABASE {database}")
         except ProgrammingError as e:
             raise ClickException(f"Exception occurred: {e}.") from e
+        self._session_state.add_validated_database(database)
 
     def check_schema_exists(self, database: str, schema: str) -> None:
         """
@@ -113,13 +165,31 @@ class SqlExecutionMixin:
         including not authorized to use schema, schema doesn't exist,
         schema is not a valid identifier, and more.
         """
-        self.check_database_exists(database)
-        if not schema:
-            raise SchemaNotProvidedError()
+        session_state = self._session_state
+        if session_state.is_schema_validated(database, schema):
+            if self._is_current_object(
+                self._conn.database, database
+            ) and self._is_current_object(self._conn.schema, schema):
+                return
+        else:
+            self.check_database_exists(database)
+            if not schema:
+                raise SchemaNotProvidedError()
+        # for schemas validated earlier in this session, this only restores them
+        # as the current schema
         try:
             self._execute_query(f"USE {database}.{schema}")
         except ProgrammingError as e:
             raise ClickException(f"Exception occurred: {e}.") from e
+        session_state.add_validated_schema(database, schema)
+
+    @staticmethod
+    def _is_current_object(current_name: Optional[str], name: str) -> bool:
+        """
+        Checks whether the name reported by the connection, as returned by
+        Snowflake, refers to the given database or schema identifier.
+        """
+        return current_name is not None and current_name == unquote_identifier(name)
 
     def to_fully_qualified_name(
         self, name: str, database: Optional[str] = None, schema: Optional[str] = None
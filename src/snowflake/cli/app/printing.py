@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import json
 import sys
-from datetime import datetime
+from datetime import date, datetime, time
+from decimal import Decimal
 from json import JSONEncoder
 from pathlib import Path
 from textwrap import indent
@@ -13,8 +14,10 @@ from rich import print as rich_print
 from rich.live import Live
 from rich.table import Table
 from snowflake.cli.api.cli_global_context import cli_context
+from snowflake.cli.api.output.arrow import iter_json_chunks
 from snowflake.cli.api.output.formats import OutputFormat
 from snowflake.cli.api.output.types import (
+    ArrowQueryResult,
     CollectionResult,
     CommandResult,
     MessageResult,
@@ -37,8 +40,10 @@ class CustomJSONEncoder(JSONEncoder):
             return o.result
         if isinstance(o, (CollectionResult, MultipleResults)):
             return list(o.result)
-        if isinstance(o, datetime):
+        if isinstance(o, (datetime, date, time)):
             return o.isoformat()
+        if isinstance(o, Decimal):
+            return str(o)
         if isinstance(o, Path):
             return str(o)
         return super().default(o)
@@ -83,10 +88,28 @@ def print_structured(result: CommandResult):
     """Handles outputs like json, yml and other structured and parsable formats."""
     if isinstance(result, MultipleResults):
         _stream_json(result)
-    else:
+    elif not _print_arrow_json(result, sys.stdout, indent=4):
         return json.dump(result, sys.stdout, cls=CustomJSONEncoder, indent=4)
 
 
+def _print_arrow_json(result: CommandResult, stream: TextIO, indent: int) -> bool:
+    """
+    Prints the result straight from its Arrow batches, if it has them.
+    Returns False if the result has to be printed row by row instead.
+    """
+    if not isinstance(result, ArrowQueryResult):
+        return False
+    batches = result.json_arrow_batches()
+    if batches is None:
+        return False
+    chunks = iter_json_chunks(
+        batches, result.column_names, CustomJSONEncoder(), indent=indent
+    )
+    for chunk in chunks:
+        stream.write(chunk)
+    return True
+
+
 def _stream_json(result):
     """Simple helper for streaming multiple results as a JSON."""
     indent_size = 2
@@ -102,7 +125,9 @@ def _stream_json(result):
     results = result.result
     res = next(results, None)
     while res:
-        json.dump(res, _Indented(sys.stdout), cls=CustomJSONEncoder, indent=indent_size)  # type: ignore
+        stream = _Indented(sys.stdout)
+        if not _print_arrow_json(res, stream, indent=indent_size):  # type: ignore
+            json.dump(res, stream, cls=CustomJSONEncoder, indent=indent_size)  # type: ignore
         if res := next(results, None):
             print(",")
     print("\n]")
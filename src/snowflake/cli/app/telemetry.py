@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import json
 import platform
 import sys
+import uuid
 from enum import Enum, unique
-from typing import Any, Dict, Union
+from typing import Any, Dict, Optional, Union
 
 import click
 from snowflake.cli.__about__ import VERSION
@@ -41,6 +43,9 @@ class TelemetryEvent(Enum):
 
 TelemetryDict = Dict[Union[CLITelemetryField, TelemetryField], Any]
 
+# identifies a single run of the CLI, e.g. to group all queries of a command
+INVOCATION_ID = uuid.uuid4().hex
+
 
 def _find_command_info() -> TelemetryDict:
     ctx = click.get_current_context()
@@ -64,6 +69,33 @@ def command_info() -> str:
     return ("SNOWCLI." + ".".join(info[CLITelemetryField.COMMAND])).upper()
 
 
+def _find_project_name() -> Optional[str]:
+    project_definition = cli_context.project_definition
+    if not project_definition:
+        return None
+    # native apps and streamlits have a name, snowpark projects a project_name
+    name = project_definition.get("name") or project_definition.get("project_name")
+    return str(name) if name else None
+
+
+def command_query_tag() -> str:
+    """
+    Returns the QUERY_TAG identifying the queries of the current command in
+    QUERY_HISTORY by command, project and invocation.
+    """
+    info = _find_command_info()
+    query_tag = {
+        "source": "snowcli",
+        "version": VERSION,
+        "command": " ".join(info[CLITelemetryField.COMMAND]),
+        "invocation_id": INVOCATION_ID,
+    }
+    project_name = _find_project_name()
+    if project_name:
+        query_tag["project"] = project_name
+    return json.dumps(query_tag, separators=(",", ":"))
+
+
 def python_version() -> str:
     py_ver = sys.version_info
     return f"{py_ver.major}.{py_ver.minor}.{py_ver.micro}"
@@ -8,7 +8,11 @@ from snowflake.cli.api.commands.decorators import (
 )
 from snowflake.cli.api.commands.snow_typer import SnowTyper
 from snowflake.cli.api.output.types import CommandResult, MessageResult
-from snowflake.cli.plugins.nativeapp.common_flags import ForceOption, InteractiveOption
+from snowflake.cli.plugins.nativeapp.common_flags import (
+    ForceOption,
+    HashWorkersOption,
+    InteractiveOption,
+)
 from snowflake.cli.plugins.nativeapp.init import nativeapp_init
 from snowflake.cli.plugins.nativeapp.manager import NativeAppManager
 from snowflake.cli.plugins.nativeapp.policy import (
@@ -108,6 +112,7 @@ def app_run(
     ),
     interactive: Optional[bool] = InteractiveOption,
     force: Optional[bool] = ForceOption,
+    hash_workers: int = HashWorkersOption,
     **options,
 ) -> CommandResult:
     """
@@ -135,6 +140,7 @@ def app_run(
         patch=patch,
         from_release_directive=from_release_directive,
         is_interactive=is_interactive,
+        hash_workers=hash_workers,
     )
     return MessageResult(
         f"Your application ({processor.app_name}) is now live:\n"
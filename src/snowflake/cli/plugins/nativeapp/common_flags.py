@@ -1,4 +1,5 @@
 import typer
+from snowflake.cli.plugins.object.stage.diff import DEFAULT_HASH_WORKERS
 
 InteractiveOption = typer.Option(
     False,
@@ -15,3 +16,10 @@ ForceOption = typer.Option(
     You should enable this option if interactive mode is not specified and if you want perform potentially destructive actions. Defaults to unset.""",
     is_flag=True,
 )
+
+HashWorkersOption = typer.Option(
+    DEFAULT_HASH_WORKERS,
+    "--hash-workers",
+    min=1,
+    help="""Number of parallel threads to use when computing checksums of files in the deploy root, to find out which of them need to be uploaded to the stage.""",
+)
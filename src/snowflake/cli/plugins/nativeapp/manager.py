@@ -33,6 +33,7 @@ from snowflake.cli.plugins.nativeapp.constants import (
 )
 from snowflake.cli.plugins.nativeapp.exceptions import UnexpectedOwnerError
 from snowflake.cli.plugins.object.stage.diff import (
+    DEFAULT_HASH_WORKERS,
     DiffResult,
     stage_diff,
     sync_local_diff_with_stage,
@@ -246,7 +247,9 @@ class NativeAppManager(SqlExecutionMixin):
         """
         build_bundle(self.project_root, self.deploy_root, self.artifacts)
 
-    def sync_deploy_root_with_stage(self, role: str) -> DiffResult:
+    def sync_deploy_root_with_stage(
+        self, role: str, hash_workers: int = DEFAULT_HASH_WORKERS
+    ) -> DiffResult:
         """
         Ensures that the files on our remote stage match the artifacts we have in
         the local filesystem. Returns the DiffResult used to make changes.
@@ -271,7 +274,12 @@ class NativeAppManager(SqlExecutionMixin):
             "Performing a diff between the Snowflake stage and your local deploy_root ('%s') directory."
             % self.deploy_root
         )
-        diff: DiffResult = stage_diff(self.deploy_root, self.stage_fqn)
+        diff: DiffResult = stage_diff(
+            self.deploy_root,
+            self.stage_fqn,
+            hash_workers=hash_workers,
+            use_manifest=True,
+        )
         cc.message(str(diff))
 
         # Upload diff-ed files to app pkg stage
@@ -280,11 +288,15 @@ class NativeAppManager(SqlExecutionMixin):
                 "Uploading diff-ed files from your local %s directory to the Snowflake stage."
                 % self.deploy_root,
             )
+        # Also runs without changes if the stage had to be listed, so that the
+        # manifest is written and the next run does not need to list it again
+        if diff.has_changes() or not diff.from_manifest:
             sync_local_diff_with_stage(
                 role=role,
                 deploy_root_path=self.deploy_root,
                 diff_result=diff,
                 stage_path=self.stage_fqn,
+                update_manifest=True,
             )
         return diff
 
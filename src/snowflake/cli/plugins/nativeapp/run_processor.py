@@ -28,7 +28,7 @@ from snowflake.cli.plugins.nativeapp.manager import (
     generic_sql_error_handler,
 )
 from snowflake.cli.plugins.nativeapp.policy import PolicyBase
-from snowflake.cli.plugins.object.stage.diff import DiffResult
+from snowflake.cli.plugins.object.stage.diff import DEFAULT_HASH_WORKERS, DiffResult
 from snowflake.cli.plugins.object.stage.manager import StageManager
 from snowflake.connector import ProgrammingError
 from snowflake.connector.cursor import SnowflakeCursor
@@ -354,6 +354,7 @@ class NativeAppRunProcessor(NativeAppManager, NativeAppCommandProcessor):
         patch: Optional[str] = None,
         from_release_directive: bool = False,
         is_interactive: bool = False,
+        hash_workers: int = DEFAULT_HASH_WORKERS,
         *args,
         **kwargs,
     ):
@@ -391,7 +392,9 @@ class NativeAppRunProcessor(NativeAppManager, NativeAppCommandProcessor):
             self._apply_package_scripts()
 
             # 3. Upload files from deploy root local folder to the above stage
-            diff = self.sync_deploy_root_with_stage(self.package_role)
+            diff = self.sync_deploy_root_with_stage(
+                self.package_role, hash_workers=hash_workers
+            )
 
         # 4. Create an application if none exists, else upgrade the application
         self._create_dev_app(diff)
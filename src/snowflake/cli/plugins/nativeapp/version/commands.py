@@ -9,7 +9,11 @@ from snowflake.cli.api.commands.decorators import (
 )
 from snowflake.cli.api.commands.snow_typer import SnowTyper
 from snowflake.cli.api.output.types import CommandResult, MessageResult, QueryResult
-from snowflake.cli.plugins.nativeapp.common_flags import ForceOption, InteractiveOption
+from snowflake.cli.plugins.nativeapp.common_flags import (
+    ForceOption,
+    HashWorkersOption,
+    InteractiveOption,
+)
 from snowflake.cli.plugins.nativeapp.policy import (
     AllowAlwaysPolicy,
     AskAlwaysPolicy,
@@ -51,6 +55,7 @@ def create(
     ),
     interactive: Optional[bool] = InteractiveOption,
     force: Optional[bool] = ForceOption,
+    hash_workers: int = HashWorkersOption,
     **options,
 ) -> CommandResult:
     """
@@ -86,6 +91,7 @@ def create(
         policy=policy,
         git_policy=git_policy,
         is_interactive=is_interactive,
+        hash_workers=hash_workers,
     )
     return MessageResult(f"Version create is now complete.")
 
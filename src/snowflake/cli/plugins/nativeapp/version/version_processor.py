@@ -23,6 +23,7 @@ from snowflake.cli.plugins.nativeapp.manager import (
 )
 from snowflake.cli.plugins.nativeapp.policy import PolicyBase
 from snowflake.cli.plugins.nativeapp.run_processor import NativeAppRunProcessor
+from snowflake.cli.plugins.object.stage.diff import DEFAULT_HASH_WORKERS
 from snowflake.connector import ProgrammingError
 from snowflake.connector.cursor import DictCursor
 
@@ -150,6 +151,7 @@ class NativeAppVersionCreateProcessor(NativeAppRunProcessor):
         policy: PolicyBase,
         git_policy: PolicyBase,
         is_interactive: bool,
+        hash_workers: int = DEFAULT_HASH_WORKERS,
         *args,
         **kwargs,
     ):
@@ -198,7 +200,9 @@ class NativeAppVersionCreateProcessor(NativeAppRunProcessor):
             self._apply_package_scripts()
 
             # Upload files from deploy root local folder to the above stage
-            self.sync_deploy_root_with_stage(self.package_role)
+            self.sync_deploy_root_with_stage(
+                self.package_role, hash_workers=hash_workers
+            )
 
         # Warn if the version exists in a release directive(s)
         existing_release_directives = (
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Callable, Optional
+
+from snowflake.cli.api.config import get_cache_dir
+from snowflake.cli.api.secure_path import UNLIMITED, SecurePath
+
+CHECKSUM_CACHE_FILE_NAME = "stage_checksums.json"
+CHECKSUM_CACHE_VERSION = 2
+DEFAULT_CHECKSUM_KIND = "md5"
+DEFAULT_MAX_ENTRIES = 100_000
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FileSignature:
+    """
+    Cheap-to-obtain description of a file's state. If any of these change,
+    the cached checksum of the file can no longer be trusted.
+    """
+
+    size: int
+    mtime_ns: int
+    inode: int
+
+    @classmethod
+    def from_stat(cls, stat_result: os.stat_result) -> FileSignature:
+        return cls(
+            size=stat_result.st_size,
+            mtime_ns=stat_result.st_mtime_ns,
+            inode=stat_result.st_ino,
+        )
+
+
+class ChecksumCache:
+    """
+    On-disk cache of local file checksums, keyed by absolute path and validated
+    against the file's size, modification time and inode. Entries are kept in
+    least-recently-used order and the oldest ones are evicted once the cache
+    holds more than max_entries files. Lookups and updates are thread-safe, so a
+    single cache can be shared by concurrent hashing workers.
+    """
+
+    def __init__(self, path: Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self._path = path
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, list] = OrderedDict()
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def default(cls) -> ChecksumCache:
+        return cls(get_cache_dir() / CHECKSUM_CACHE_FILE_NAME)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __enter__(self) -> ChecksumCache:
+        self.load()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.save()
+
+    def load(self) -> None:
+        """
+        Reads the cache from disk. A missing, unreadable or outdated cache file
+        results in an empty cache rather than an error.
+        """
+        self._entries = OrderedDict()
+        self._dirty = False
+        if not self._path.is_file():
+            return
+        try:
+            with SecurePath(self._path).open("r", read_file_limit_mb=UNLIMITED) as fh:
+                content = json.load(fh)
+        except (OSError, ValueError) as err:
+            log.debug("Ignoring unreadable checksum cache %s: %s", self._path, err)
+            return
+
+        if (
+            not isinstance(content, dict)
+            or content.get("version") != CHECKSUM_CACHE_VERSION
+            or not isinstance(content.get("entries"), dict)
+        ):
+            log.debug("Ignoring checksum cache %s in unknown format", self._path)
+            return
+        self._entries = OrderedDict(
+            (key, entry)
+            for key, entry in content["entries"].items()
+            if _is_valid_entry(entry)
+        )
+
+    def save(self) -> None:
+        """
+        Writes the cache to disk if it changed since it was loaded. The file is
+        replaced atomically, so concurrent readers never see a partial cache.
+        """
+        if not self._dirty:
+            return
+        self._evict()
+        cache_dir = SecurePath(self._path.parent)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_name(f"{self._path.name}.{os.getpid()}.tmp")
+        try:
+            with SecurePath(tmp_path).open("w") as fh:
+                json.dump(
+                    {"version": CHECKSUM_CACHE_VERSION, "entries": self._entries},
+                    fh,
+                    separators=(",", ":"),
+                )
+            os.replace(tmp_path, self._path)
+        except OSError as err:
+            log.debug("Could not save checksum cache %s: %s", self._path, err)
+            SecurePath(tmp_path).unlink(missing_ok=True)
+            return
+        self._dirty = False
+
+    def get(
+        self, file: Path, signature: FileSignature, kind: str = DEFAULT_CHECKSUM_KIND
+    ) -> Optional[str]:
+        """
+        Returns the cached checksum of the given kind for the file, or None if it is
+        not cached or the file has changed since its checksum was stored.
+        """
+        key = _cache_key(file)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            *cached_signature, checksums = entry
+            if cached_signature != _signature_to_list(signature):
+                del self._entries[key]
+                self._dirty = True
+                return None
+            self._entries.move_to_end(key)
+            return checksums.get(kind)
+
+    def put(
+        self,
+        file: Path,
+        signature: FileSignature,
+        checksum: str,
+        kind: str = DEFAULT_CHECKSUM_KIND,
+    ) -> None:
+        """
+        Stores a checksum of the given kind for the file. Checksums of other kinds are
+        kept as long as they were computed for the same state of the file.
+        """
+        key = _cache_key(file)
+        signature_list = _signature_to_list(signature)
+        with self._lock:
+            entry = self._entries.get(key)
+            checksums = {}
+            if entry is not None and entry[:-1] == signature_list:
+                checksums = entry[-1]
+            checksums[kind] = checksum
+            self._entries[key] = [*signature_list, checksums]
+            self._entries.move_to_end(key)
+            self._dirty = True
+            self._evict()
+
+    def invalidate(self, file: Path) -> None:
+        key = _cache_key(file)
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._dirty = True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+
+    def checksum(
+        self,
+        file: Path,
+        compute: Callable[[Path], str],
+        kind: str = DEFAULT_CHECKSUM_KIND,
+        stat_result: Optional[os.stat_result] = None,
+    ) -> str:
+        """
+        Returns the checksum of the given kind for the file, computing it with the
+        provided function only if there is no valid cached value. Callers that
+        already know the file's stat information can pass it to avoid another stat.
+        """
+        signature = FileSignature.from_stat(stat_result or file.stat())
+        checksum = self.get(file, signature, kind)
+        if checksum is None:
+            checksum = compute(file)
+            self.put(file, signature, checksum, kind)
+        return checksum
+
+    def _evict(self) -> None:
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._dirty = True
+
+
+def _cache_key(file: Path) -> str:
+    # unlike resolving symlinks, making the path absolute needs no file system calls
+    # per file; callers resolve the directory they walk once instead
+    return os.path.abspath(file)
+
+
+def _is_valid_entry(entry) -> bool:
+    """Entries are the file signature followed by the checksums of each kind."""
+    return (
+        isinstance(entry, list)
+        and len(entry) == len(fields(FileSignature)) + 1
+        and isinstance(entry[-1], dict)
+    )
+
+
+def _signature_to_list(signature: FileSignature) -> list:
+    return [signature.size, signature.mtime_ns, signature.inode]
@@ -1,18 +1,53 @@
 from __future__ import annotations
 
+import time
+from contextlib import ExitStack
 from pathlib import Path
+from typing import Dict, List, Optional
 
 import click
 import typer
 from snowflake.cli.api.commands.snow_typer import SnowTyper
+from snowflake.cli.api.console import cli_console as cc
 from snowflake.cli.api.output.types import (
+    CollectionResult,
     CommandResult,
     ObjectResult,
     QueryResult,
     SingleQueryResult,
 )
-from snowflake.cli.plugins.object.stage.diff import DiffResult
-from snowflake.cli.plugins.object.stage.manager import StageManager
+from snowflake.cli.api.secure_path import SecurePath
+from snowflake.cli.plugins.object.stage.diff import (
+    DEFAULT_HASH_WORKERS,
+    DiffResult,
+    enumerate_files,
+    group_files_by_stage_path,
+)
+from snowflake.cli.plugins.object.stage.diff import stage_diff as compute_stage_diff
+from snowflake.cli.plugins.object.stage.load import (
+    DEFAULT_CHUNK_SIZE_MB,
+    default_copy_options,
+    default_file_format,
+    load_directory_name,
+    prepare_chunks,
+)
+from snowflake.cli.plugins.object.stage.manager import (
+    PutRequest,
+    StageManager,
+    StageSessionPool,
+    cursor_to_rows,
+    get_upload_sessions,
+    put_sources_for_files,
+    split_files_by_size,
+)
+from snowflake.cli.plugins.object.stage.unload import (
+    DEFAULT_MAX_FILE_SIZE_MB,
+    DEFAULT_UNLOAD_FILE_FORMAT,
+    concatenate_files,
+    concatenated_file_name,
+    decompress_files,
+    unload_directory_name,
+)
 
 app = SnowTyper(
     name="stage",
@@ -51,6 +86,19 @@ def copy(
         4,
         help="Number of parallel threads to use when uploading files.",
     ),
+    recursive: bool = typer.Option(
+        False,
+        "--recursive",
+        "-r",
+        help="Uploads the local directory with all its sub-directories, preserving the directory tree on the stage.",
+    ),
+    upload_sessions: Optional[int] = typer.Option(
+        None,
+        "--upload-sessions",
+        help="Number of Snowflake sessions uploading files of a local directory concurrently. Defaults to the `upload_sessions` value in the `[cli.stage]` configuration section, or 1.",
+        min=1,
+        show_default=False,
+    ),
     **options,
 ) -> CommandResult:
     """
@@ -68,6 +116,10 @@ def copy(
         raise click.ClickException(
             "Both source and target path are local. This operation is not supported."
         )
+    if is_get and recursive:
+        raise click.UsageError(
+            "--recursive is only supported when uploading a local directory."
+        )
 
     if is_get:
         target = Path(destination_path).resolve()
@@ -76,6 +128,23 @@ def copy(
         )
     else:
         source = Path(source_path).resolve()
+        sessions = upload_sessions or get_upload_sessions()
+        if recursive and source.is_dir():
+            return _put_directory_recursively(
+                source=source,
+                destination_path=destination_path,
+                overwrite=overwrite,
+                parallel=parallel,
+                sessions=sessions,
+            )
+        if sessions > 1 and source.is_dir():
+            return _put_directory_concurrently(
+                source=source,
+                destination_path=destination_path,
+                overwrite=overwrite,
+                parallel=parallel,
+                sessions=sessions,
+            )
         local_path = str(source) + "/*" if source.is_dir() else str(source)
 
         cursor = StageManager().put(
@@ -87,6 +156,294 @@ def copy(
     return QueryResult(cursor)
 
 
+def _put_directory_concurrently(
+    source: Path, destination_path: str, overwrite: bool, parallel: int, sessions: int
+) -> CommandResult:
+    files = [child for child in source.iterdir() if child.is_file()]
+    batches = split_files_by_size(files, sessions)
+    if not batches:
+        return CollectionResult([])
+
+    with ExitStack() as stack:
+        requests = [
+            PutRequest(local_path, destination_path)
+            for batch in batches
+            for local_path in stack.enter_context(put_sources_for_files(batch))
+        ]
+        with StageSessionPool(sessions=len(batches)) as session_pool:
+            rows = session_pool.put(requests, overwrite=overwrite, parallel=parallel)
+    cc.step(str(session_pool.summary))
+    return CollectionResult(rows)
+
+
+def _put_directory_recursively(
+    source: Path, destination_path: str, overwrite: bool, parallel: int, sessions: int
+) -> CommandResult:
+    relative_files = [
+        file.relative_to(source).as_posix()
+        for file in enumerate_files(source, ignore_patterns=[])
+    ]
+    groups = group_files_by_stage_path(relative_files)
+    if not groups:
+        return CollectionResult([])
+
+    stage_root = destination_path.rstrip("/")
+    stage_sub_paths = {}
+    with ExitStack() as stack:
+        requests = []
+        for stage_sub_path, group in sorted(groups.items()):
+            stage_path = (
+                f"{stage_root}/{stage_sub_path}" if stage_sub_path else stage_root
+            )
+            stage_sub_paths[stage_path] = stage_sub_path
+            local_paths = stack.enter_context(
+                put_sources_for_files([source / _file for _file in group])
+            )
+            requests.extend(PutRequest(path, stage_path) for path in local_paths)
+
+        def _on_complete(request: PutRequest, rows: List[Dict]):
+            stage_sub_path = stage_sub_paths[request.stage_path]
+            for row in rows:
+                if stage_sub_path and "target" in row:
+                    row["target"] = f"{stage_sub_path}/{row['target']}"
+            cc.step(f"Uploaded {len(rows)} file(s) to {request.stage_path}")
+
+        with StageSessionPool(sessions=min(sessions, len(requests))) as session_pool:
+            rows = session_pool.put(
+                requests,
+                overwrite=overwrite,
+                parallel=parallel,
+                on_complete=_on_complete,
+            )
+    cc.step(str(session_pool.summary))
+    return CollectionResult(rows)
+
+
+@app.command("load", requires_connection=True)
+def stage_load(
+    stage_name: str = StageNameArgument,
+    table_name: str = typer.Argument(
+        ..., help="Name of the table to load the files into."
+    ),
+    local_files: List[Path] = typer.Argument(
+        ...,
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        help="Local CSV or Parquet files to load.",
+    ),
+    file_format: Optional[str] = typer.Option(
+        None,
+        "--file-format",
+        help="Format type options of the files, e.g. `TYPE = CSV FIELD_DELIMITER = '|'`. Inferred from the `.csv` or `.parquet` extension of the files by default.",
+        show_default=False,
+    ),
+    header_lines: int = typer.Option(
+        0,
+        "--header-lines",
+        min=0,
+        help="Number of header lines of the CSV files, repeated at the top of each chunk and skipped when loading.",
+    ),
+    chunk_size_mb: int = typer.Option(
+        DEFAULT_CHUNK_SIZE_MB,
+        "--chunk-size-mb",
+        min=1,
+        help="Approximate size of the compressed chunks the CSV files are split into.",
+    ),
+    split: bool = typer.Option(
+        True,
+        "--split/--no-split",
+        help="Splits the CSV files into chunks at line breaks. Use `--no-split` for files with line breaks inside quoted values.",
+    ),
+    parallel: int = typer.Option(
+        4,
+        help="Number of parallel threads to use when uploading files.",
+    ),
+    upload_sessions: Optional[int] = typer.Option(
+        None,
+        "--upload-sessions",
+        help="Number of Snowflake sessions uploading the chunks concurrently. Defaults to the `upload_sessions` value in the `[cli.stage]` configuration section, or 1.",
+        min=1,
+        show_default=False,
+    ),
+    purge: bool = typer.Option(
+        False,
+        "--purge",
+        help="Removes the uploaded chunks from the stage once they are loaded.",
+    ),
+    **options,
+) -> CommandResult:
+    """
+    Loads local files into a table. The files are split into chunks, compressed
+    concurrently, uploaded to a new directory of the stage and loaded with a single
+    COPY INTO statement.
+    """
+    copy_options = None
+    if file_format is None:
+        file_format = default_file_format(local_files, header_lines)
+        copy_options = default_copy_options(local_files)
+    stage_path = f"{stage_name.rstrip('/')}/{load_directory_name()}"
+    source_bytes = sum(_file.stat().st_size for _file in local_files)
+
+    start = time.monotonic()
+    with SecurePath.temporary_directory() as chunk_dir:
+        chunks = prepare_chunks(
+            files=[_file.resolve() for _file in local_files],
+            target_dir=chunk_dir.path,
+            chunk_size_bytes=chunk_size_mb * 1024 * 1024,
+            header_lines=header_lines,
+            split=split,
+        )
+        cc.step(f"Prepared {len(chunks)} chunk(s) in {time.monotonic() - start:.2f}s")
+        batches = split_files_by_size(chunks, upload_sessions or get_upload_sessions())
+        with ExitStack() as stack:
+            requests = [
+                PutRequest(local_path, stage_path)
+                for batch in batches
+                for local_path in stack.enter_context(put_sources_for_files(batch))
+            ]
+            with StageSessionPool(sessions=len(batches)) as session_pool:
+                session_pool.put(requests, parallel=parallel)
+        cc.step(str(session_pool.summary))
+
+    cursor = StageManager().copy_into_table(
+        table_name=table_name,
+        stage_path=stage_path,
+        file_format=file_format,
+        copy_options=copy_options,
+        purge=purge,
+    )
+    elapsed = time.monotonic() - start
+    megabytes = source_bytes / (1024 * 1024)
+    throughput = megabytes / elapsed if elapsed > 0 else 0.0
+    cc.step(
+        f"Loaded {len(local_files)} file(s) ({megabytes:.2f} MB) "
+        f"in {elapsed:.2f}s ({throughput:.2f} MB/s)"
+    )
+    return QueryResult(cursor)
+
+
+@app.command("unload", requires_connection=True)
+def stage_unload(
+    stage_name: str = StageNameArgument,
+    table_name: str = typer.Argument(..., help="Name of the table to export."),
+    destination_path: Path = typer.Argument(
+        ...,
+        file_okay=False,
+        dir_okay=True,
+        help="Local directory to download the exported files to.",
+    ),
+    file_format: str = typer.Option(
+        DEFAULT_UNLOAD_FILE_FORMAT,
+        "--file-format",
+        help="Format type options of the exported files.",
+    ),
+    header: bool = typer.Option(
+        False,
+        "--header",
+        help="Writes the column names as the first line of each CSV file.",
+    ),
+    max_file_size_mb: int = typer.Option(
+        DEFAULT_MAX_FILE_SIZE_MB,
+        "--max-file-size-mb",
+        min=1,
+        help="Maximum size of each file written by Snowflake.",
+    ),
+    parallel: int = typer.Option(
+        4,
+        help="Number of parallel threads to use when downloading files.",
+    ),
+    decompress: bool = typer.Option(
+        False,
+        "--decompress",
+        help="Decompresses the gzipped files after downloading them.",
+    ),
+    concatenate: bool = typer.Option(
+        False,
+        "--concatenate",
+        help="Concatenates the downloaded files into a single file named after the table.",
+    ),
+    purge: bool = typer.Option(
+        False,
+        "--purge",
+        help="Removes the exported files from the stage once they are downloaded.",
+    ),
+    **options,
+) -> CommandResult:
+    """
+    Exports a table to local files. Snowflake unloads the table into compressed
+    files on a new directory of the stage with a single COPY INTO statement, and
+    the files are downloaded in parallel.
+    """
+    if concatenate and "PARQUET" in file_format.upper():
+        raise click.UsageError("Parquet files cannot be concatenated.")
+    if concatenate and header and not decompress:
+        raise click.UsageError("--concatenate with --header requires --decompress.")
+
+    stage_manager = StageManager()
+    unload_directory = unload_directory_name()
+    stage_path = f"{stage_name.rstrip('/')}/{unload_directory}/"
+    copy_options = f"max_file_size = {max_file_size_mb * 1024 * 1024}"
+    if header:
+        copy_options += " header = true"
+
+    start = time.monotonic()
+    unloaded = cursor_to_rows(
+        stage_manager.copy_into_location(
+            stage_path=stage_path,
+            table_name=table_name,
+            file_format=file_format,
+            copy_options=copy_options,
+        )
+    )
+    rows_unloaded = sum(int(row.get("rows_unloaded") or 0) for row in unloaded)
+    cc.step(f"Unloaded {rows_unloaded} rows in {time.monotonic() - start:.2f}s")
+
+    with ExitStack() as stack:
+        download_path = destination_path.resolve()
+        if concatenate:
+            download_path = stack.enter_context(SecurePath.temporary_directory()).path
+        SecurePath(download_path).mkdir(parents=True, exist_ok=True)
+
+        download_start = time.monotonic()
+        downloaded = cursor_to_rows(
+            stage_manager.get(
+                stage_name=stage_path, dest_path=download_path, parallel=parallel
+            )
+        )
+        parts = sorted(download_path / row["file"] for row in downloaded)
+        _report_download(parts, time.monotonic() - download_start)
+        if purge:
+            stage_manager.remove(stage_name=stage_name, path=f"{unload_directory}/")
+
+        if concatenate and parts:
+            file_name = concatenated_file_name(table_name, parts[0], decompress)
+            SecurePath(destination_path).mkdir(parents=True, exist_ok=True)
+            parts = [
+                concatenate_files(
+                    parts,
+                    destination_path.resolve() / file_name,
+                    decompress=decompress,
+                    header_lines=1 if header else 0,
+                )
+            ]
+        elif decompress:
+            parts = decompress_files(parts)
+        result = [{"file": str(part), "size": part.stat().st_size} for part in parts]
+
+    cc.step(f"Exported {table_name} in {time.monotonic() - start:.2f}s")
+    return CollectionResult(result)
+
+
+def _report_download(parts: List[Path], elapsed_seconds: float) -> None:
+    megabytes = sum(part.stat().st_size for part in parts) / (1024 * 1024)
+    throughput = megabytes / elapsed_seconds if elapsed_seconds > 0 else 0.0
+    cc.step(
+        f"Downloaded {len(parts)} files ({megabytes:.2f} MB) "
+        f"in {elapsed_seconds:.2f}s ({throughput:.2f} MB/s)"
+    )
+
+
 @app.command("create", requires_connection=True)
 def stage_create(stage_name: str = StageNameArgument, **options) -> CommandResult:
     """
@@ -114,10 +471,18 @@ def stage_remove(
 def stage_diff(
     stage_name: str = typer.Argument(None, help="Fully qualified name of a stage"),
     folder_name: str = typer.Argument(None, help="Path to local folder"),
+    hash_workers: int = typer.Option(
+        DEFAULT_HASH_WORKERS,
+        "--hash-workers",
+        min=1,
+        help="Number of parallel threads to use when computing checksums of local files.",
+    ),
     **options,
 ) -> ObjectResult:
     """
     Diffs a stage with a local folder.
     """
-    diff: DiffResult = stage_diff(Path(folder_name), stage_name)
+    diff: DiffResult = compute_stage_diff(
+        Path(folder_name), stage_name, hash_workers=hash_workers
+    )
     return ObjectResult(str(diff))
@@ -1,18 +1,55 @@
 import hashlib
 import logging
+import math
+import os
 import re
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, nullcontext
 from dataclasses import dataclass, field
+from email.utils import formatdate
+from fnmatch import fnmatchcase
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
+from snowflake.cli.api.constants import DEFAULT_SIZE_LIMIT_MB
 from snowflake.cli.api.exceptions import SnowflakeSQLExecutionError
 from snowflake.cli.api.secure_path import UNLIMITED, SecurePath
+from snowflake.connector.constants import (
+    AZURE_CHUNK_SIZE,
+    S3_DEFAULT_CHUNK_SIZE,
+    S3_MAX_PARTS,
+    S3_MIN_PART_SIZE,
+)
 from snowflake.connector.cursor import SnowflakeCursor
 
-from .manager import StageManager
-
+from .checksum_cache import ChecksumCache
+from .manager import (
+    PutRequest,
+    StageManager,
+    StageSessionPool,
+    put_sources_for_files,
+)
+from .manifest import (
+    StageFileInfo,
+    StageManifest,
+    read_stage_manifest,
+    remove_stage_manifest,
+    write_stage_manifest,
+)
+
+IGNORE_FILE_NAME = ".snowignore"
 MD5SUM_REGEX = r"^[A-Fa-f0-9]{32}$"
-CHUNK_SIZE_BYTES = 8192
+MULTIPART_MD5SUM_REGEX = r"^[A-Fa-f0-9]{32}-(\d+)$"
+REGEX_SPECIAL_CHARACTERS = set(".^$*+?()[]{}|\\")
+# keeps REMOVE statements far below the statement size limit and the patterns
+# cheap to evaluate for the server
+MAX_REMOVE_PATTERN_LENGTH = 10_000
+# hashlib releases the GIL while digesting large buffers, so reading in big chunks
+# lets hashing threads run in parallel rather than contending for the interpreter
+CHUNK_SIZE_BYTES = 1024 * 1024
+DEFAULT_HASH_WORKERS = 4
 
 log = logging.getLogger(__name__)
 
@@ -36,6 +73,15 @@ class DiffResult:
     only_on_stage: List[str] = field(default_factory=list)
     "Files that only exist on the stage"
 
+    identical_stage_files: Dict[str, StageFileInfo] = field(default_factory=dict)
+    "Sizes, md5sums and modification times reported by the stage for identical files"
+
+    from_manifest: bool = False
+    "Whether the stage contents were read from the stage manifest instead of listed"
+
+    local_md5sums: Dict[str, str] = field(default_factory=dict)
+    "Md5sums of different local files computed while comparing them with the stage"
+
     def has_changes(self) -> bool:
         return (
             len(self.different) > 0
@@ -106,9 +152,9 @@ def compute_md5sum(file: Path) -> str:
     #  1. when the stage uses SNOWFLAKE_FULL encryption
     #  2. when the file was uploaded in multiple parts
 
-    # We can re-create the second if we know what chunk size was used by the
-    # upload process to the backing object store (e.g. S3, azure blob, etc.)
-    # but we cannot re-create the first as the encrpytion key is hidden.
+    # The second is handled by compute_multipart_md5sum, which re-creates the
+    # checksum using the chunk sizes the connector uploads with, but we cannot
+    # re-create the first as the encrpytion key is hidden.
 
     # We are assuming that we will not get accidental collisions here due to the
     # large space of the md5sum (32 * 4 = 128 bits means 1-in-9-trillion chance)
@@ -122,21 +168,161 @@ def compute_md5sum(file: Path) -> str:
     return file_hash.hexdigest()
 
 
-def enumerate_files(path: Path) -> List[Path]:
+def get_multipart_md5sum_parts(checksum: str) -> Optional[int]:
+    """
+    Returns the number of parts if the provided checksum has the form of a checksum
+    of a file uploaded in multiple parts (<md5sum>-<parts>), or None otherwise.
+    """
+    match = re.match(MULTIPART_MD5SUM_REGEX, checksum)
+    return int(match.group(1)) if match else None
+
+
+def compute_multipart_md5sum(file: Path, chunk_size: int) -> str:
+    """
+    Returns the checksum the object store reports for the file located at the given
+    path if it was uploaded in parts of chunk_size bytes: the md5sum of concatenated
+    binary md5sums of each part, followed by the number of parts.
+    """
+    if not file.is_file():
+        raise ValueError(
+            "The provided file does not exist or not a (symlink to a) regular file"
+        )
+
+    parts_hash = hashlib.md5()
+    parts = 0
+    with SecurePath(file).open("rb", read_file_limit_mb=UNLIMITED) as f:
+        while chunk := f.read(chunk_size):
+            parts_hash.update(hashlib.md5(chunk).digest())
+            parts += 1
+
+    return f"{parts_hash.hexdigest()}-{parts}"
+
+
+def get_upload_chunk_sizes(file_size: int) -> List[int]:
+    """
+    Returns the part sizes the connector may have used to upload a file of the given
+    size in multiple parts, depending on the cloud provider backing the stage.
+    """
+    s3_chunk_size = (
+        max(math.ceil(file_size / S3_MAX_PARTS), S3_MIN_PART_SIZE)
+        if math.ceil(file_size / S3_DEFAULT_CHUNK_SIZE) > S3_MAX_PARTS
+        else S3_DEFAULT_CHUNK_SIZE
+    )
+    return list(dict.fromkeys([s3_chunk_size, AZURE_CHUNK_SIZE]))
+
+
+def matches_stage_md5sum(
+    local_file: Path,
+    stage_md5sum: str,
+    checksum_cache: ChecksumCache,
+    stat_result: Optional[os.stat_result] = None,
+) -> bool:
+    """
+    Does the checksum of the local file match the checksum reported for it by the
+    stage? Checksums of files uploaded in multiple parts are re-created for every
+    chunk size that could have produced the reported number of parts.
+    """
+    stat_result = stat_result or local_file.stat()
+    if is_valid_md5sum(stage_md5sum):
+        local_md5sum = checksum_cache.checksum(
+            local_file, compute_md5sum, stat_result=stat_result
+        )
+        return local_md5sum == stage_md5sum.lower()
+
+    parts = get_multipart_md5sum_parts(stage_md5sum)
+    if parts is None:
+        return False
+    file_size = stat_result.st_size
+    for chunk_size in get_upload_chunk_sizes(file_size):
+        if math.ceil(file_size / chunk_size) != parts:
+            continue
+        local_md5sum = checksum_cache.checksum(
+            local_file,
+            partial(compute_multipart_md5sum, chunk_size=chunk_size),
+            kind=f"md5-multipart-{chunk_size}",
+            stat_result=stat_result,
+        )
+        if local_md5sum == stage_md5sum.lower():
+            return True
+    return False
+
+
+def load_ignore_patterns(path: Path) -> List[str]:
     """
-    Get a list of all files in a directory (recursively).
+    Reads ignore patterns from the ignore file in the given directory, if there is one.
+    Empty lines and lines starting with # are skipped.
+    """
+    ignore_file = path / IGNORE_FILE_NAME
+    if not ignore_file.is_file():
+        return []
+    lines = SecurePath(ignore_file).read_text(file_size_limit_mb=DEFAULT_SIZE_LIMIT_MB)
+    return [
+        line.strip()
+        for line in lines.splitlines()
+        if line.strip() and not line.strip().startswith("#")
+    ]
+
+
+def _is_ignored(relpath: str, is_dir: bool, ignore_patterns: List[str]) -> bool:
+    """
+    Checks a path against glob-style ignore patterns. Patterns containing a slash are
+    matched against the whole path relative to the enumerated directory, others only
+    against the file name. Patterns ending with a slash only match directories.
+    """
+    posix_relpath = relpath.replace(os.sep, "/")
+    name = posix_relpath.rsplit("/", 1)[-1]
+    for pattern in ignore_patterns:
+        if pattern.endswith("/"):
+            if not is_dir:
+                continue
+            pattern = pattern.rstrip("/")
+        if "/" in pattern:
+            if fnmatchcase(posix_relpath, pattern.lstrip("/")):
+                return True
+        elif fnmatchcase(name, pattern):
+            return True
+    return False
+
+
+def scan_files(
+    path: Path, ignore_patterns: Optional[List[str]] = None
+) -> Iterator[os.DirEntry]:
+    """
+    Lazily yields directory entries of all files in a directory (recursively). Entries
+    matching any of the ignore patterns are skipped, and so are whole sub-directories
+    matching them. The entries carry the file type and stat information gathered
+    while walking, so callers don't need to query the filesystem again.
     """
     if not path.is_dir():
         raise ValueError("Path must point to a directory")
 
-    paths: List[Path] = []
-    for child in sorted(path.iterdir()):
-        if child.is_dir():
-            paths += enumerate_files(child)
-        else:
-            paths.append(child)
-
-    return paths
+    def _walk() -> Iterator[os.DirEntry]:
+        prefix = os.path.join(str(path), "")
+        directories = [str(path)]
+        while directories:
+            with os.scandir(directories.pop()) as entries:
+                for entry in entries:
+                    is_dir = entry.is_dir()
+                    if ignore_patterns and _is_ignored(
+                        entry.path[len(prefix) :], is_dir, ignore_patterns
+                    ):
+                        continue
+                    if is_dir:
+                        directories.append(entry.path)
+                    else:
+                        yield entry
+
+    return _walk()
+
+
+def enumerate_files(
+    path: Path, ignore_patterns: Optional[List[str]] = None
+) -> Iterator[Path]:
+    """
+    Lazily get all files in a directory (recursively), skipping those matching any
+    of the ignore patterns.
+    """
+    return (Path(entry.path) for entry in scan_files(path, ignore_patterns))
 
 
 def strip_stage_name(path: str) -> str:
@@ -144,50 +330,133 @@ def strip_stage_name(path: str) -> str:
     return "/".join(path.split("/")[1:])
 
 
-def build_md5_map(list_stage_cursor: SnowflakeCursor) -> Dict[str, str]:
+def build_stage_file_map(
+    list_stage_cursor: SnowflakeCursor,
+) -> Dict[str, StageFileInfo]:
     """
-    Returns a mapping of relative stage paths to their md5sums.
+    Returns a mapping of relative stage paths to their sizes, md5sums and
+    modification times.
     """
     return {
-        strip_stage_name(name): md5
+        strip_stage_name(name): StageFileInfo(
+            size=size, md5=md5, last_modified=modified
+        )
         for (name, size, md5, modified) in list_stage_cursor.fetchall()
     }
 
 
-def stage_diff(local_path: Path, stage_fqn: str) -> DiffResult:
+def stage_diff(
+    local_path: Path,
+    stage_fqn: str,
+    checksum_cache: Optional[ChecksumCache] = None,
+    hash_workers: int = DEFAULT_HASH_WORKERS,
+    ignore_patterns: Optional[List[str]] = None,
+    use_manifest: bool = False,
+) -> DiffResult:
     """
-    Diffs the files in a stage with a local folder.
+    Diffs the files in a stage with a local folder. Local files matching the ignore
+    patterns (by default read from the .snowignore file in the local folder) are
+    left out. Files whose sizes differ are reported as different right away. The
+    remaining local files that also exist on the stage are hashed concurrently by
+    hash_workers threads while the local folder is still being walked, and checksums
+    are looked up in the checksum cache first, so unchanged files are not re-hashed.
+    If use_manifest is set, the stage contents are read from the manifest written by
+    the last sync if the stage has not changed since, which is checked by comparing
+    the fingerprint of the stage listing. Otherwise the listing is downloaded.
     """
+    # resolved once, so that checksums are cached under the same paths however the
+    # directory is reached
+    local_path = local_path.resolve()
     stage_manager = StageManager()
-    local_files = enumerate_files(local_path)
-    remote_md5 = build_md5_map(stage_manager.list_files(stage_fqn))
-
-    result: DiffResult = DiffResult()
-
-    for local_file in local_files:
-        relpath = str(local_file.relative_to(local_path))
-        if relpath not in remote_md5:
-            # doesn't exist on the stage
-            result.only_local.append(relpath)
-        else:
-            # N.B. we could compare local size vs remote size to skip the relatively-
-            # expensive md5sum operation, but after seeing a comment that says the value
-            # may not always be correctly populated, we'll ignore that column.
-            stage_md5sum = remote_md5[relpath]
-            if is_valid_md5sum(stage_md5sum) and stage_md5sum == compute_md5sum(
-                local_file
+    manifest = read_stage_manifest(stage_manager, stage_fqn) if use_manifest else None
+    # The listing is still needed to tell whether the manifest is up to date, as
+    # the stage may have been changed without the CLI. Its rows stay on the server
+    # though, only their fingerprint is fetched, unless the manifest cannot be used.
+    list_files_cursor = stage_manager.list_files(stage_fqn)
+    if manifest is not None and manifest.stage_fingerprint != (
+        stage_manager.fingerprint_listed_files(list_files_cursor)
+    ):
+        log.info("Stage %s changed since its manifest was written", stage_fqn)
+        manifest = None
+    if manifest is not None:
+        remote_files = dict(manifest.files)
+    else:
+        remote_files = build_stage_file_map(list_files_cursor)
+    if ignore_patterns is None:
+        ignore_patterns = load_ignore_patterns(local_path)
+    local_files = scan_files(local_path, ignore_patterns)
+    if checksum_cache is None:
+        checksum_cache = ChecksumCache.default()
+
+    result: DiffResult = DiffResult(from_manifest=manifest is not None)
+
+    def _compare_with_stage(
+        local_file: Path, stage_md5sum: str, local_stat: os.stat_result
+    ) -> Tuple[bool, Optional[str]]:
+        matches = matches_stage_md5sum(
+            local_file, stage_md5sum, checksum_cache, local_stat
+        )
+        local_md5sum = None
+        if not matches and is_valid_md5sum(stage_md5sum):
+            # already cached by the comparison, kept for the stage manifest
+            local_md5sum = checksum_cache.checksum(
+                local_file, compute_md5sum, stat_result=local_stat
+            )
+        return matches, local_md5sum
+
+    with checksum_cache, ThreadPoolExecutor(max_workers=hash_workers) as executor:
+        pending: Dict[Future, Tuple[str, StageFileInfo]] = {}
+        prefix_length = len(os.path.join(str(local_path), ""))
+        for local_entry in local_files:
+            relpath = local_entry.path[prefix_length:]
+            if relpath not in remote_files:
+                # doesn't exist on the stage
+                result.only_local.append(relpath)
+                continue
+
+            # Popping the entry also marks this file as seen.
+            stage_file = remote_files.pop(relpath)
+            local_stat = local_entry.stat()
+            if stage_file.size is not None and stage_file.size != local_stat.st_size:
+                # LS reports the unencrypted size for server-side encrypted stages,
+                # so a different size means a different file. Client-side encrypted
+                # (SNOWFLAKE_FULL) stages report the encrypted size and md5sum, which
+                # never match the local file anyway, so skipping the md5sum
+                # comparison cannot change the outcome there either.
+                result.different.append(relpath)
+            elif is_valid_md5sum(stage_file.md5) or get_multipart_md5sum_parts(
+                stage_file.md5
             ):
+                future = executor.submit(
+                    _compare_with_stage,
+                    Path(local_entry.path),
+                    stage_file.md5,
+                    local_stat,
+                )
+                pending[future] = (relpath, stage_file)
+            else:
+                # we can't tell if the file has changed
+                result.different.append(relpath)
+
+        for future in as_completed(pending):
+            relpath, stage_file = pending[future]
+            matches, local_md5sum = future.result()
+            if matches:
                 # the file definitely hasn't changed
                 result.identical.append(relpath)
+                result.identical_stage_files[relpath] = stage_file
             else:
-                # either the file has changed, or we can't tell if it has
                 result.different.append(relpath)
+                if local_md5sum is not None:
+                    result.local_md5sums[relpath] = local_md5sum
 
-            # mark this file as seen
-            del remote_md5[relpath]
+    # walking and hashing happen in arbitrary order; keep the reported result stable
+    result.only_local.sort()
+    result.identical.sort()
+    result.different.sort()
 
     # every entry here is a file we never saw locally
-    for relpath in remote_md5.keys():
+    for relpath in remote_files.keys():
         result.only_on_stage.append(relpath)
 
     return result
@@ -199,6 +468,36 @@ def get_stage_path_from_file(filepath: str):
     return stage_path
 
 
+def _escape_regex(text: str) -> str:
+    return "".join(f"\\{c}" if c in REGEX_SPECIAL_CHARACTERS else c for c in text)
+
+
+def build_remove_patterns(
+    files: List[str], max_length: int = MAX_REMOVE_PATTERN_LENGTH
+) -> List[str]:
+    """
+    Compiles relative stage paths into as few regular expressions as possible, each
+    matching exactly the given files as listed by LS (i.e. prefixed by the stage name)
+    and not longer than max_length, unless a single path is longer than that. The
+    expressions are anchored, so that they never match other files containing one
+    of the paths.
+    """
+    prefix, suffix = "^[^/]*/(", ")$"
+    patterns: List[str] = []
+    current: List[str] = []
+    current_length = len(prefix) + len(suffix)
+    for _file in files:
+        escaped = _escape_regex(_file)
+        if current and current_length + len(escaped) + 1 > max_length:
+            patterns.append(prefix + "|".join(current) + suffix)
+            current, current_length = [], len(prefix) + len(suffix)
+        current.append(escaped)
+        current_length += len(escaped) + 1
+    if current:
+        patterns.append(prefix + "|".join(current) + suffix)
+    return patterns
+
+
 def delete_only_on_stage_files(
     stage_manager: StageManager,
     stage_fqn: str,
@@ -207,9 +506,23 @@ def delete_only_on_stage_files(
 ):
     """
     Deletes all files from a Snowflake stage according to the input list of filenames, using a custom role.
+    Files are removed with as few REMOVE ... PATTERN statements as possible, executed under a single role switch.
+    """
+    if not only_on_stage:
+        return
+    with stage_manager.use_role(role) if role else nullcontext():
+        for pattern in build_remove_patterns(only_on_stage):
+            stage_manager.remove_matching(stage_name=stage_fqn, pattern=pattern)
+
+
+def group_files_by_stage_path(files: List[str]) -> Dict[str, List[str]]:
     """
-    for _file in only_on_stage:
-        stage_manager.remove(stage_name=stage_fqn, path=_file, role=role)
+    Groups relative file paths by the stage sub-directory they should be uploaded to.
+    """
+    groups: Dict[str, List[str]] = defaultdict(list)
+    for _file in files:
+        groups[get_stage_path_from_file(_file)].append(_file)
+    return groups
 
 
 def put_files_on_stage(
@@ -219,50 +532,122 @@ def put_files_on_stage(
     files: List[str],
     role: Optional[str] = None,
     overwrite: bool = False,
-):
+    parallel: int = 4,
+    session_pool: Optional[StageSessionPool] = None,
+) -> List[Dict]:
     """
     Uploads all files given input list of filenames on your local filesystem, to a Snowflake stage, using a custom role.
+    Files going to the same stage directory are uploaded together with a single PUT statement,
+    except hidden files, which are uploaded one by one.
+    If a session pool is provided, these statements run concurrently in its sessions
+    and the role of the pool is used instead.
     """
-    for _file in files:
-        stage_sub_path = get_stage_path_from_file(_file)
-        full_stage_path = (
-            f"{stage_fqn}/{stage_sub_path}" if stage_sub_path else stage_fqn
+    with ExitStack() as stack:
+        if session_pool is None:
+            session_pool = stack.enter_context(
+                StageSessionPool(stage_manager, sessions=1, role=role)
+            )
+        requests = []
+        for stage_sub_path, group in group_files_by_stage_path(files).items():
+            full_stage_path = (
+                f"{stage_fqn}/{stage_sub_path}" if stage_sub_path else stage_fqn
+            )
+            local_paths = stack.enter_context(
+                put_sources_for_files([deploy_root_path / _file for _file in group])
+            )
+            requests.extend(
+                PutRequest(local_path, full_stage_path) for local_path in local_paths
+            )
+        return session_pool.put(requests, overwrite=overwrite, parallel=parallel)
+
+
+def build_stage_manifest(
+    stage_fqn: str,
+    deploy_root_path: Path,
+    diff_result: DiffResult,
+    checksum_cache: Optional[ChecksumCache] = None,
+    hash_workers: int = DEFAULT_HASH_WORKERS,
+) -> StageManifest:
+    """
+    Returns the manifest describing the stage once the given diff has been synced.
+    Files to be uploaded are recorded with their local md5sums and the current time.
+    Md5sums computed by the diff are reused, the remaining ones are looked up in the
+    checksum cache or computed concurrently by hash_workers threads.
+    """
+    if checksum_cache is None:
+        checksum_cache = ChecksumCache.default()
+    deploy_root_path = deploy_root_path.resolve()
+    uploaded_at = formatdate(usegmt=True)
+
+    def _local_file_info(relpath: str) -> StageFileInfo:
+        local_file = deploy_root_path / relpath
+        local_stat = local_file.stat()
+        md5 = diff_result.local_md5sums.get(relpath) or checksum_cache.checksum(
+            local_file, compute_md5sum, stat_result=local_stat
         )
-        stage_manager.put(
-            local_path=deploy_root_path / _file,
-            stage_path=full_stage_path,
-            role=role,
-            overwrite=overwrite,
+        return StageFileInfo(
+            size=local_stat.st_size, md5=md5, last_modified=uploaded_at
         )
 
+    files = dict(diff_result.identical_stage_files)
+    relpaths = [*diff_result.different, *diff_result.only_local]
+    with checksum_cache, ThreadPoolExecutor(max_workers=hash_workers) as executor:
+        files.update(zip(relpaths, executor.map(_local_file_info, relpaths)))
+    return StageManifest(stage_fqn=stage_fqn, files=files)
+
 
 def sync_local_diff_with_stage(
-    role: str, deploy_root_path: Path, diff_result: DiffResult, stage_path: str
+    role: str,
+    deploy_root_path: Path,
+    diff_result: DiffResult,
+    stage_path: str,
+    upload_sessions: Optional[int] = None,
+    update_manifest: bool = False,
 ):
     """
     Syncs a given local directory's contents with a Snowflake stage, including removing old files, and re-uploading modified and new files.
+    Uploads are spread across upload_sessions concurrent sessions, which defaults to the configured number.
+    If update_manifest is set, the stage manifest is removed before changing the stage and rewritten once all changes succeeded.
     """
     stage_manager = StageManager()
     log.info(
         "Uploading diff-ed files from your local %s directory to the Snowflake stage.",
         deploy_root_path,
     )
-
     try:
-        delete_only_on_stage_files(
-            stage_manager, stage_path, diff_result.only_on_stage, role
-        )
-        put_files_on_stage(
-            stage_manager,
-            stage_path,
-            deploy_root_path,
-            diff_result.different,
-            role,
-            overwrite=True,
-        )
-        put_files_on_stage(
-            stage_manager, stage_path, deploy_root_path, diff_result.only_local, role
-        )
+        with StageSessionPool(
+            stage_manager, sessions=upload_sessions, role=role
+        ) as session_pool:
+            manifest = (
+                build_stage_manifest(stage_path, deploy_root_path, diff_result)
+                if update_manifest
+                else None
+            )
+            if manifest is not None and diff_result.has_changes():
+                remove_stage_manifest(stage_manager, stage_path)
+            delete_only_on_stage_files(
+                stage_manager, stage_path, diff_result.only_on_stage
+            )
+            put_files_on_stage(
+                stage_manager,
+                stage_path,
+                deploy_root_path,
+                diff_result.different,
+                overwrite=True,
+                session_pool=session_pool,
+            )
+            put_files_on_stage(
+                stage_manager,
+                stage_path,
+                deploy_root_path,
+                diff_result.only_local,
+                session_pool=session_pool,
+            )
+            if manifest is not None:
+                manifest.stage_fingerprint = stage_manager.fingerprint_listed_files(
+                    stage_manager.list_files(stage_path)
+                )
+                write_stage_manifest(stage_manager, stage_path, manifest)
     except Exception as err:
         # Could be ProgrammingError or IntegrityError from SnowflakeCursor
         log.error(err)
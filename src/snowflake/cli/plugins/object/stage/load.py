@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import gzip
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+from click import ClickException
+from snowflake.cli.api.secure_path import UNLIMITED, SecurePath
+
+from .manager import _link_or_copy
+
+# Snowflake recommends loading files of 100-250 MB compressed
+DEFAULT_CHUNK_SIZE_MB = 150
+DEFAULT_COMPRESS_WORKERS = os.cpu_count() or 4
+# zlib's default level, a good balance between speed and size
+COMPRESSION_LEVEL = 6
+COMPRESSION_SAMPLE_BYTES = 1024 * 1024
+READ_BLOCK_BYTES = 8 * 1024 * 1024
+
+PARQUET_SUFFIX = ".parquet"
+COMPRESSED_SUFFIXES = {".gz", ".bz2", ".zst", ".br", ".deflate", ".raw_deflate"}
+DEFAULT_FILE_FORMATS = {".csv": "TYPE = CSV", PARQUET_SUFFIX: "TYPE = PARQUET"}
+# without it, each row of a Parquet file is loaded into a single VARIANT column
+PARQUET_COPY_OPTIONS = "MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE"
+
+log = logging.getLogger(__name__)
+
+
+class FileChunk(NamedTuple):
+    """Byte range of a local file, always starting and ending at a line break."""
+
+    source: Path
+    start: int
+    end: int
+    destination: Path
+
+
+def default_file_format(files: List[Path], header_lines: int = 0) -> str:
+    """
+    Returns the COPY INTO file format for files which all have the same extension,
+    either `.csv` or `.parquet`.
+    """
+    suffixes = {_file.suffix.lower() for _file in files}
+    if len(suffixes) != 1 or not suffixes <= DEFAULT_FILE_FORMATS.keys():
+        raise ClickException(
+            "Cannot infer the file format of the files. Use --file-format."
+        )
+    file_format = DEFAULT_FILE_FORMATS[suffixes.pop()]
+    if header_lines:
+        file_format += f" SKIP_HEADER = {header_lines}"
+    return file_format
+
+
+def default_copy_options(files: List[Path]) -> Optional[str]:
+    if all(_file.suffix.lower() == PARQUET_SUFFIX for _file in files):
+        return PARQUET_COPY_OPTIONS
+    return None
+
+
+def load_directory_name() -> str:
+    """Returns a unique stage directory for the chunks of a single load."""
+    return f"snow_load_{uuid.uuid4().hex}"
+
+
+def is_splittable(file: Path) -> bool:
+    """Parquet and compressed files cannot be split at line breaks."""
+    suffix = file.suffix.lower()
+    return suffix != PARQUET_SUFFIX and suffix not in COMPRESSED_SUFFIXES
+
+
+def estimate_compression_ratio(file: Path) -> float:
+    """Estimates how many times smaller the file gets when compressed."""
+    with SecurePath(file).open("rb", read_file_limit_mb=UNLIMITED) as fh:
+        sample = fh.read(COMPRESSION_SAMPLE_BYTES)
+    if not sample:
+        return 1.0
+    return len(sample) / len(gzip.compress(sample, compresslevel=COMPRESSION_LEVEL))
+
+
+def plan_chunks(
+    file: Path,
+    target_dir: Path,
+    raw_chunk_size: Optional[int],
+    header_lines: int = 0,
+    prefix: str = "",
+) -> List[FileChunk]:
+    """
+    Splits the file into byte ranges of about raw_chunk_size, moving each boundary
+    to the end of the line it falls into. The header lines are not part of any
+    range. Without raw_chunk_size, the whole file is a single chunk.
+    """
+    size = file.stat().st_size
+    with SecurePath(file).open("rb", read_file_limit_mb=UNLIMITED) as fh:
+        for _ in range(header_lines):
+            fh.readline()
+        boundaries = [fh.tell()]
+        while raw_chunk_size and boundaries[-1] + raw_chunk_size < size:
+            fh.seek(boundaries[-1] + raw_chunk_size - 1)
+            fh.readline()
+            if fh.tell() >= size:
+                break
+            boundaries.append(fh.tell())
+    boundaries.append(size)
+
+    return [
+        FileChunk(
+            source=file,
+            start=start,
+            end=end,
+            destination=target_dir / f"{prefix}{file.stem}_{number}{file.suffix}.gz",
+        )
+        for number, (start, end) in enumerate(zip(boundaries, boundaries[1:]))
+        if end > start or number == 0
+    ]
+
+
+def compress_chunk(chunk: FileChunk, header_lines: int = 0) -> Path:
+    """
+    Writes the chunk, preceded by the header lines of its file, to its gzipped
+    destination, streaming it in blocks.
+    """
+    with SecurePath(chunk.source).open(
+        "rb", read_file_limit_mb=UNLIMITED
+    ) as source, SecurePath(chunk.destination).open("wb") as destination:
+        with gzip.GzipFile(
+            fileobj=destination, mode="wb", compresslevel=COMPRESSION_LEVEL
+        ) as compressed:
+            for _ in range(header_lines):
+                compressed.write(source.readline())
+            source.seek(chunk.start)
+            remaining = chunk.end - chunk.start
+            while remaining > 0:
+                block = source.read(min(READ_BLOCK_BYTES, remaining))
+                if not block:
+                    break
+                compressed.write(block)
+                remaining -= len(block)
+    return chunk.destination
+
+
+def prepare_chunks(
+    files: List[Path],
+    target_dir: Path,
+    chunk_size_bytes: int,
+    header_lines: int = 0,
+    split: bool = True,
+    workers: int = DEFAULT_COMPRESS_WORKERS,
+) -> List[Path]:
+    """
+    Splits the files into chunks of about chunk_size_bytes once compressed and
+    compresses them concurrently into target_dir. Each chunk repeats the header
+    lines of its file. Parquet and already compressed files are used as they are.
+    Returns the paths of all chunks.
+    """
+    chunks: List[FileChunk] = []
+    prepared: List[Path] = []
+    for index, file in enumerate(files):
+        # files with the same name may come from different directories
+        prefix = f"{index}_"
+        if not is_splittable(file):
+            destination = target_dir / f"{prefix}{file.name}"
+            _link_or_copy(file, destination)
+            prepared.append(destination)
+            continue
+        raw_chunk_size = None
+        if split:
+            ratio = estimate_compression_ratio(file)
+            raw_chunk_size = max(int(chunk_size_bytes * ratio), 1)
+        chunks.extend(
+            plan_chunks(file, target_dir, raw_chunk_size, header_lines, prefix)
+        )
+
+    log.info("Compressing %d chunks using %d workers", len(chunks), workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        prepared.extend(
+            executor.map(lambda chunk: compress_chunk(chunk, header_lines), chunks)
+        )
+    return prepared
@@ -1,14 +1,26 @@
 from __future__ import annotations
 
+import heapq
 import logging
+import os
+import queue
 import re
-from contextlib import nullcontext
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager, nullcontext
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Union
+from typing import Callable, Dict, Generator, List, NamedTuple, Optional, Union
 
+from snowflake.cli.api.cli_global_context import cli_context
+from snowflake.cli.api.config import CLI_SECTION, get_config_value
 from snowflake.cli.api.project.util import to_string_literal
+from snowflake.cli.api.secure_path import SecurePath
+from snowflake.cli.api.session_state import SessionState
 from snowflake.cli.api.sql_execution import SqlExecutionMixin
 from snowflake.cli.api.utils.path_utils import path_resolver
+from snowflake.connector import SnowflakeConnection
 from snowflake.connector.cursor import SnowflakeCursor
 
 log = logging.getLogger(__name__)
@@ -16,8 +28,34 @@ log = logging.getLogger(__name__)
 
 UNQUOTED_FILE_URI_REGEX = r"[\w/*?\-.=&{}$#[\]\"\\!@%^+:]+"
 
+STAGE_SECTION_PATH = [CLI_SECTION, "stage"]
+UPLOAD_SESSIONS_KEY = "upload_sessions"
+DEFAULT_UPLOAD_SESSIONS = 1
+PUT_UPLOADED_STATUS = "UPLOADED"
+
 
 class StageManager(SqlExecutionMixin):
+    def __init__(self, connection: Optional[SnowflakeConnection] = None):
+        """
+        By default all statements run on the global CLI connection. A different
+        connection can be passed to run them in a separate session instead.
+        """
+        super().__init__()
+        self._connection = connection
+        self._connection_session_state = SessionState()
+
+    @property
+    def _conn(self):
+        if self._connection is not None:
+            return self._connection
+        return cli_context.connection
+
+    @property
+    def _session_state(self) -> SessionState:
+        if self._connection is not None:
+            return self._connection_session_state
+        return cli_context.session_state
+
     @staticmethod
     def get_standard_stage_name(name: str) -> str:
         # Handle embedded stages
@@ -57,6 +95,18 @@ class StageManager(SqlExecutionMixin):
         stage_name = self.get_standard_stage_name(stage_name)
         return self._execute_query(f"ls {self.quote_stage_name(stage_name)}")
 
+    def fingerprint_listed_files(self, list_files_cursor: SnowflakeCursor) -> str:
+        """
+        Returns a hash of the names, sizes, md5sums and modification times of all
+        files listed by the given LS statement. Snowflake computes it from the
+        cached result of the statement, so the listing is never downloaded.
+        """
+        cursor = self._execute_query(
+            'select hash_agg("name", "size", "md5", "last_modified") '
+            f"from table(result_scan('{list_files_cursor.sfqid}'))"
+        )
+        return str(cursor.fetchone()[0])
+
     def get(
         self, stage_name: str, dest_path: Path, parallel: int = 4
     ) -> SnowflakeCursor:
@@ -105,8 +155,279 @@ class StageManager(SqlExecutionMixin):
             quoted_stage_name = self.quote_stage_name(f"{stage_name}{path}")
             return self._execute_query(f"remove {quoted_stage_name}")
 
+    def remove_matching(
+        self, stage_name: str, pattern: str, role: Optional[str] = None
+    ) -> SnowflakeCursor:
+        """
+        This method will remove all files on a Snowflake stage whose paths match
+        the given regular expression, using a single statement.
+        If provided with a role, then temporarily use this role to perform the operation above,
+        and switch back to the original role for the next commands to run.
+        """
+        with self.use_role(role) if role else nullcontext():
+            stage_name = self.get_standard_stage_name(stage_name)
+            return self._execute_query(
+                f"remove {self.quote_stage_name(stage_name)} pattern={to_string_literal(pattern)}"
+            )
+
+    def copy_into_table(
+        self,
+        table_name: str,
+        stage_path: str,
+        file_format: str,
+        copy_options: Optional[str] = None,
+        purge: bool = False,
+    ) -> SnowflakeCursor:
+        """
+        Loads all files under the stage path into the table with a single COPY INTO
+        statement, so that Snowflake can load them in parallel.
+        """
+        stage_path = self.get_standard_stage_name(stage_path)
+        query = (
+            f"copy into {table_name} from {self.quote_stage_name(stage_path)} "
+            f"file_format = ({file_format})"
+        )
+        if copy_options:
+            query += f" {copy_options}"
+        return self._execute_query(f"{query} purge = {purge}")
+
+    def copy_into_location(
+        self,
+        stage_path: str,
+        table_name: str,
+        file_format: str,
+        copy_options: Optional[str] = None,
+    ) -> SnowflakeCursor:
+        """
+        Unloads the table into files under the stage path with a single COPY INTO
+        statement, so that Snowflake can write them in parallel.
+        """
+        stage_path = self.get_standard_stage_name(stage_path)
+        query = (
+            f"copy into {self.quote_stage_name(stage_path)} from {table_name} "
+            f"file_format = ({file_format})"
+        )
+        if copy_options:
+            query += f" {copy_options}"
+        return self._execute_query(query)
+
     def create(self, stage_name: str, comment: Optional[str] = None) -> SnowflakeCursor:
         query = f"create stage if not exists {stage_name}"
         if comment:
             query += f" comment='{comment}'"
         return self._execute_query(query)
+
+
+def get_upload_sessions() -> int:
+    """
+    Returns the number of sessions used for concurrent uploads, as configured
+    under [cli.stage] upload_sessions (or SNOWFLAKE_CLI_STAGE_UPLOAD_SESSIONS).
+    """
+    sessions = get_config_value(
+        *STAGE_SECTION_PATH, key=UPLOAD_SESSIONS_KEY, default=DEFAULT_UPLOAD_SESSIONS
+    )
+    return max(1, int(sessions))
+
+
+def _link_or_copy(source: Path, destination: Path) -> None:
+    try:
+        os.link(source, destination)
+    except OSError:
+        # e.g. the temporary directory is on another device
+        shutil.copyfile(source, destination)
+
+
+def _is_hidden(file: Path) -> bool:
+    return file.name.startswith(".")
+
+
+@contextmanager
+def put_sources_for_files(
+    files: List[Path],
+) -> Generator[List[Union[str, Path]], None, None]:
+    """
+    Yields local paths (possibly wildcards) matching exactly the given files, all of
+    which must live in the same directory, so they can be uploaded with as few PUT
+    statements as possible, one per path. If only some of the files in that
+    directory are requested, they are mirrored into a temporary directory first.
+    The connector expands wildcards with glob, which skips hidden files, so each of
+    them gets its own path.
+    """
+    sources: List[Union[str, Path]] = [_file for _file in files if _is_hidden(_file)]
+    visible_files = [_file for _file in files if not _is_hidden(_file)]
+    if not visible_files:
+        yield sources
+        return
+
+    local_dir = visible_files[0].parent
+    file_names = {_file.name for _file in visible_files}
+    visible_children = {
+        child.name
+        for child in local_dir.iterdir()
+        if child.is_file() and not _is_hidden(child)
+    }
+    if len(visible_files) == 1:
+        yield [visible_files[0], *sources]
+    elif file_names == visible_children:
+        yield [f"{local_dir}/*", *sources]
+    else:
+        with SecurePath.temporary_directory() as mirror_dir:
+            for _file in visible_files:
+                _link_or_copy(_file, mirror_dir.path / _file.name)
+            yield [f"{mirror_dir.path}/*", *sources]
+
+
+def split_files_by_size(files: List[Path], batches: int) -> List[List[Path]]:
+    """
+    Splits files into at most the given number of non-empty batches of similar total
+    size, so that uploading the batches concurrently finishes at about the same time.
+    """
+    heap = [(0, idx, []) for idx in range(min(batches, len(files)))]
+    for _file in sorted(files, key=lambda f: f.stat().st_size, reverse=True):
+        size, idx, batch = heapq.heappop(heap)
+        batch.append(_file)
+        heapq.heappush(heap, (size + _file.stat().st_size, idx, batch))
+    return [batch for _, _, batch in sorted(heap, key=lambda item: item[1])]
+
+
+class PutRequest(NamedTuple):
+    local_path: Union[str, Path]
+    stage_path: str
+
+
+@dataclass
+class UploadSummary:
+    files: int = 0
+    size_bytes: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def throughput_bytes_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.size_bytes / self.elapsed_seconds
+
+    def add_rows(self, rows: List[Dict]) -> None:
+        for row in rows:
+            if str(row.get("status", "")).upper() == PUT_UPLOADED_STATUS:
+                self.files += 1
+                self.size_bytes += int(row.get("source_size") or 0)
+
+    def __str__(self) -> str:
+        megabytes = self.size_bytes / (1024 * 1024)
+        throughput = self.throughput_bytes_per_second / (1024 * 1024)
+        return (
+            f"Uploaded {self.files} files ({megabytes:.2f} MB) "
+            f"in {self.elapsed_seconds:.2f}s ({throughput:.2f} MB/s)"
+        )
+
+
+def cursor_to_rows(cursor: SnowflakeCursor) -> List[Dict]:
+    columns = [column[0].lower() for column in cursor.description or []]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+class StageSessionPool:
+    """
+    Runs independent PUT statements concurrently, each session executing one
+    statement at a time. The first session is the global CLI connection; the
+    remaining ones are opened when entering the pool and closed on exit.
+    If provided with a role, all sessions use it while the pool is open, and the
+    global connection switches back to its original role afterwards.
+    """
+
+    def __init__(
+        self,
+        stage_manager: Optional[StageManager] = None,
+        sessions: Optional[int] = None,
+        role: Optional[str] = None,
+    ):
+        self._stage_manager = stage_manager or StageManager()
+        self._sessions = sessions if sessions is not None else get_upload_sessions()
+        if self._sessions < 1:
+            raise ValueError("Number of upload sessions must be at least 1.")
+        self._role = role
+        self._exit_stack = ExitStack()
+        self._managers: List[StageManager] = []
+        self.summary = UploadSummary()
+
+    @property
+    def sessions(self) -> int:
+        return self._sessions
+
+    def __enter__(self) -> StageSessionPool:
+        with ExitStack() as stack:
+            if self._role:
+                stack.enter_context(self._stage_manager.use_role(self._role))
+            self._managers = [self._stage_manager]
+            for _ in range(self._sessions - 1):
+                # connections are opened here rather than in the workers, as
+                # connecting needs the click context of the main thread
+                connection = cli_context.new_connection()
+                stack.callback(connection.close)
+                manager = StageManager(connection=connection)
+                if self._role:
+                    stack.enter_context(manager.use_role(self._role))
+                self._managers.append(manager)
+            self._exit_stack = stack.pop_all()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._exit_stack.close()
+        self._managers = []
+        if self.summary.files:
+            log.info("%s using %d session(s)", self.summary, self._sessions)
+
+    def put(
+        self,
+        requests: List[PutRequest],
+        overwrite: bool = False,
+        parallel: int = 4,
+        on_complete: Optional[Callable[[PutRequest, List[Dict]], None]] = None,
+    ) -> List[Dict]:
+        """
+        Executes one PUT statement per request, spreading them across the sessions
+        of the pool, and returns the rows reported by all of them in request order.
+        If provided, on_complete is called in the calling thread with each request
+        and its rows as soon as the request finishes, e.g. to report progress.
+        """
+        idle_managers: queue.SimpleQueue[StageManager] = queue.SimpleQueue()
+        for manager in self._managers:
+            idle_managers.put(manager)
+
+        def _put(request: PutRequest) -> List[Dict]:
+            manager = idle_managers.get()
+            try:
+                cursor = manager.put(
+                    local_path=request.local_path,
+                    stage_path=request.stage_path,
+                    overwrite=overwrite,
+                    parallel=parallel,
+                )
+                return cursor_to_rows(cursor)
+            finally:
+                idle_managers.put(manager)
+
+        start = time.monotonic()
+        results: List[List[Dict]] = [[] for _ in requests]
+        if len(self._managers) == 1:
+            for idx, request in enumerate(requests):
+                results[idx] = _put(request)
+                if on_complete:
+                    on_complete(request, results[idx])
+        else:
+            with ThreadPoolExecutor(max_workers=len(self._managers)) as executor:
+                pending = {
+                    executor.submit(_put, request): idx
+                    for idx, request in enumerate(requests)
+                }
+                for future in as_completed(pending):
+                    idx = pending[future]
+                    results[idx] = future.result()
+                    if on_complete:
+                        on_complete(requests[idx], results[idx])
+        self.summary.elapsed_seconds += time.monotonic() - start
+
+        rows = [row for result in results for row in result]
+        self.summary.add_rows(rows)
+        return rows
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Dict, NamedTuple, Optional
+
+from snowflake.cli.api.secure_path import UNLIMITED, SecurePath
+from snowflake.connector.errors import ProgrammingError
+
+from .manager import StageManager
+
+# Manifests are kept on the user stage rather than on the synced stage, whose
+# whole contents are deployed, e.g. as a version of an application package.
+MANIFEST_STAGE_PATH = "@~/.snowflake_cli/stage_manifests"
+MANIFEST_VERSION = 2
+
+log = logging.getLogger(__name__)
+
+
+def manifest_file_name(stage_fqn: str) -> str:
+    """Returns the name of the manifest of the given stage on the user stage."""
+    return re.sub(r"[^\w.$-]", "_", stage_fqn.lower()) + ".json"
+
+
+class StageFileInfo(NamedTuple):
+    size: Optional[int]
+    md5: str
+    last_modified: Optional[str] = None
+
+
+@dataclass
+class StageManifest:
+    """
+    Compact description of the files on a stage, written by the CLI to the user
+    stage after each successful sync, so the next sync does not need to list the
+    whole stage. Paths are relative to the stage root. The fingerprint of the
+    stage listing taken after the sync tells whether the stage changed since.
+    """
+
+    stage_fqn: str
+    files: Dict[str, StageFileInfo] = field(default_factory=dict)
+    stage_fingerprint: Optional[str] = None
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "version": MANIFEST_VERSION,
+                "stage": self.stage_fqn,
+                "fingerprint": self.stage_fingerprint,
+                "files": {
+                    path: [info.size, info.md5, info.last_modified]
+                    for path, info in sorted(self.files.items())
+                },
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, content: str, stage_fqn: str) -> Optional[StageManifest]:
+        """
+        Parses a manifest of the given stage. Returns None if the content is not a
+        manifest in the current format, it has no stage fingerprint or it was written
+        for a different stage.
+        """
+        try:
+            data = json.loads(content)
+            if data["version"] != MANIFEST_VERSION:
+                return None
+            if data["stage"].lower() != stage_fqn.lower():
+                return None
+            files = {
+                path: StageFileInfo(size=int(size), md5=md5, last_modified=modified)
+                for path, (size, md5, modified) in data["files"].items()
+                if isinstance(path, str) and isinstance(md5, str)
+            }
+            fingerprint = data["fingerprint"]
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return None
+        if len(files) != len(data["files"]) or not isinstance(fingerprint, str):
+            return None
+        return cls(stage_fqn=stage_fqn, files=files, stage_fingerprint=fingerprint)
+
+
+def read_stage_manifest(
+    stage_manager: StageManager, stage_fqn: str
+) -> Optional[StageManifest]:
+    """
+    Downloads the manifest of the given stage. Returns None if there is no manifest
+    or it cannot be used, in which case the stage has to be listed instead.
+    """
+    file_name = manifest_file_name(stage_fqn)
+    with SecurePath.temporary_directory() as tmp_dir:
+        try:
+            stage_manager.get(f"{MANIFEST_STAGE_PATH}/{file_name}", tmp_dir.path)
+        except ProgrammingError as err:
+            log.debug("Could not download the manifest of %s: %s", stage_fqn, err)
+            return None
+        manifest_file = tmp_dir / file_name
+        if not manifest_file.exists():
+            log.debug("Stage %s has no manifest", stage_fqn)
+            return None
+        content = manifest_file.read_text(file_size_limit_mb=UNLIMITED)
+
+    manifest = StageManifest.from_json(content, stage_fqn)
+    if manifest is None:
+        log.debug("Ignoring inconsistent manifest of %s", stage_fqn)
+    return manifest
+
+
+def write_stage_manifest(
+    stage_manager: StageManager, stage_fqn: str, manifest: StageManifest
+) -> None:
+    with SecurePath.temporary_directory() as tmp_dir:
+        manifest_file = tmp_dir / manifest_file_name(stage_fqn)
+        manifest_file.write_text(manifest.to_json())
+        stage_manager.put(
+            local_path=manifest_file.path,
+            stage_path=MANIFEST_STAGE_PATH,
+            overwrite=True,
+        )
+
+
+def remove_stage_manifest(stage_manager: StageManager, stage_fqn: str) -> None:
+    """
+    Removes the manifest, so that if the following changes to the stage are
+    interrupted, the next sync falls back to listing the stage.
+    """
+    stage_manager.remove(
+        stage_name=MANIFEST_STAGE_PATH, path=manifest_file_name(stage_fqn)
+    )
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import gzip
+import logging
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Generator, List
+
+from snowflake.cli.api.secure_path import UNLIMITED, SecurePath
+
+from .load import DEFAULT_COMPRESS_WORKERS, READ_BLOCK_BYTES
+
+DEFAULT_UNLOAD_FILE_FORMAT = "TYPE = CSV COMPRESSION = GZIP"
+# Snowflake writes unloaded files in parallel, each of at most this size
+DEFAULT_MAX_FILE_SIZE_MB = 100
+GZIP_SUFFIX = ".gz"
+
+log = logging.getLogger(__name__)
+
+
+def unload_directory_name() -> str:
+    """Returns a unique stage directory for the files of a single unload."""
+    return f"snow_unload_{uuid.uuid4().hex}"
+
+
+def concatenated_file_name(table_name: str, part: Path, decompress: bool) -> str:
+    """
+    Returns the name of the file concatenating all unloaded parts of the table,
+    with the extensions of the parts, e.g. `my_table.csv.gz`.
+    """
+    name = table_name.split(".")[-1].strip('"')
+    suffixes = part.suffixes
+    if decompress and suffixes[-1:] == [GZIP_SUFFIX]:
+        suffixes = suffixes[:-1]
+    return name + "".join(suffixes)
+
+
+@contextmanager
+def _open_part(part: Path, decompress: bool) -> Generator[BinaryIO, None, None]:
+    with SecurePath(part).open("rb", read_file_limit_mb=UNLIMITED) as source:
+        if decompress and part.suffix == GZIP_SUFFIX:
+            with gzip.GzipFile(fileobj=source, mode="rb") as decompressed:
+                yield decompressed  # type: ignore
+        else:
+            yield source
+
+
+def decompress_file(part: Path) -> Path:
+    """Replaces the gzipped file by its decompressed content."""
+    destination = part.with_suffix("")
+    with _open_part(part, decompress=True) as source, SecurePath(destination).open(
+        "wb"
+    ) as target:
+        shutil.copyfileobj(source, target, READ_BLOCK_BYTES)
+    SecurePath(part).unlink()
+    return destination
+
+
+def decompress_files(
+    parts: List[Path], workers: int = DEFAULT_COMPRESS_WORKERS
+) -> List[Path]:
+    """Decompresses the gzipped files concurrently, leaving the other ones as they are."""
+    gzipped = [part for part in parts if part.suffix == GZIP_SUFFIX]
+    log.info("Decompressing %d files using %d workers", len(gzipped), workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        decompressed = dict(zip(gzipped, executor.map(decompress_file, gzipped)))
+    return [decompressed.get(part, part) for part in parts]
+
+
+def concatenate_files(
+    parts: List[Path], destination: Path, decompress: bool, header_lines: int = 0
+) -> Path:
+    """
+    Streams the parts one after another into the destination file, decompressing
+    gzipped ones on the fly if requested. The header lines are only kept from the
+    first part. Gzipped parts can be concatenated as they are, as a sequence of
+    gzip members is a valid gzip file, but then their header lines are kept.
+    """
+    with SecurePath(destination).open("wb") as target:
+        for index, part in enumerate(parts):
+            with _open_part(part, decompress) as source:
+                if index:
+                    for _ in range(header_lines):
+                        source.readline()
+                shutil.copyfileobj(source, target, READ_BLOCK_BYTES)
+    return destination
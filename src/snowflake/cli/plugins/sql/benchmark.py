@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+PERCENTILES = (50, 90, 99)
+# columns of INFORMATION_SCHEMA.QUERY_HISTORY reported next to the client latency
+SERVER_METRICS = {
+    "TOTAL_ELAPSED_TIME": "server total (ms)",
+    "COMPILATION_TIME": "server compilation (ms)",
+    "EXECUTION_TIME": "server execution (ms)",
+}
+CLIENT_METRIC = "client latency (ms)"
+
+
+@dataclass
+class BenchmarkRun:
+    """A single measured execution of the benchmarked statements."""
+
+    client_seconds: float
+    query_ids: List[str] = field(default_factory=list)
+
+
+def percentile(values: Sequence[float], percent: float) -> float:
+    """Returns the nearest-rank percentile of non-empty values."""
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize(
+    runs: List[BenchmarkRun], server_times: Optional[Dict[str, Dict[str, int]]]
+) -> List[Dict]:
+    """
+    Returns min, percentiles and max of the client latency and, if the query
+    history is known, of the server times of each run, summed over its queries.
+    Runs with a query missing from the history or without the server time are
+    left out of that metric.
+    """
+    metrics = {CLIENT_METRIC: [run.client_seconds * 1000 for run in runs]}
+    if server_times:
+        for column, metric in SERVER_METRICS.items():
+            values = [
+                sum(server_times[qid][column] for qid in run.query_ids)
+                for run in runs
+                if all(
+                    server_times.get(qid, {}).get(column) is not None
+                    for qid in run.query_ids
+                )
+            ]
+            if values:
+                metrics[metric] = values
+
+    return [
+        {
+            "metric": metric,
+            "runs": len(values),
+            "min": round(min(values), 1),
+            **{f"p{p}": round(percentile(values, p), 1) for p in PERCENTILES},
+            "max": round(max(values), 1),
+        }
+        for metric, values in metrics.items()
+    ]
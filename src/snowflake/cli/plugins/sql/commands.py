@@ -1,10 +1,27 @@
+from itertools import chain
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, List, Optional
 
 import typer
+from click import ClickException, UsageError
 from snowflake.cli.api.commands.snow_typer import SnowTyper
-from snowflake.cli.api.output.types import CommandResult, MultipleResults, QueryResult
-from snowflake.cli.plugins.sql.manager import SqlManager
+from snowflake.cli.api.output.types import (
+    ArrowQueryResult,
+    CollectionResult,
+    CommandResult,
+    MessageResult,
+    MultipleResults,
+)
+from snowflake.cli.api.output.writers import OutputFileFormat, write_query_result
+from snowflake.cli.app.printing import print_result
+from snowflake.cli.plugins.sql.manager import (
+    DEFAULT_FILES_PARALLEL,
+    SqlManager,
+    expand_sql_files,
+)
+from snowflake.cli.plugins.sql.result_cache import ResultCache
+from snowflake.cli.plugins.sql.timings import StatementTimings
+from snowflake.connector.cursor import SnowflakeCursor
 
 # simple Typer with defaults because it won't become a command group as it contains only one command
 app = SnowTyper()
@@ -18,15 +35,15 @@ def execute_sql(
         "-q",
         help="Query to execute.",
     ),
-    file: Optional[Path] = typer.Option(
+    files: Optional[List[Path]] = typer.Option(
         None,
         "--filename",
         "-f",
         exists=True,
         file_okay=True,
-        dir_okay=False,
+        dir_okay=True,
         readable=True,
-        help="File to execute.",
+        help="File to execute. Can be specified multiple times or point to a directory, in which case all its `.sql` files are executed concurrently, each in a separate session.",
     ),
     std_in: Optional[bool] = typer.Option(
         False,
@@ -34,15 +51,166 @@ def execute_sql(
         "-i",
         help="Read the query from standard input. Use it when piping input to this command.",
     ),
-    **options
+    parallel: Optional[int] = typer.Option(
+        None,
+        "--parallel",
+        help=f"Number of statements to execute concurrently. Statements after a `-- @barrier` line start only once all previous statements finished. Statements changing the session, like `USE`, always run on their own. When executing multiple files, number of files executed concurrently, {DEFAULT_FILES_PARALLEL} by default.",
+        min=1,
+        show_default=False,
+    ),
+    cache_ttl: Optional[int] = typer.Option(
+        None,
+        "--cache-ttl",
+        help="Reuse results of read-only statements, like `SELECT` or `SHOW`, executed with the same connection, role, warehouse, database and schema within the given number of seconds. Results are cached on disk.",
+        min=1,
+        show_default=False,
+    ),
+    output_file: Optional[Path] = typer.Option(
+        None,
+        "--output-file",
+        file_okay=True,
+        dir_okay=False,
+        help="File to write the result of the last statement to, instead of printing it. The result is streamed to the file, so it does not need to fit in memory.",
+        show_default=False,
+    ),
+    output_file_format: Optional[OutputFileFormat] = typer.Option(
+        None,
+        "--output-file-format",
+        case_sensitive=False,
+        help="Format of the output file. By default it is inferred from the file extension: `.csv`, `.ndjson`, `.jsonl` or `.parquet`.",
+        show_default=False,
+    ),
+    timings: bool = typer.Option(
+        False,
+        "--timings",
+        help="Report the time spent connecting and, for each statement, its query id, execution time, time to first row, fetch time, rows and bytes after the results.",
+    ),
+    timings_file: Optional[Path] = typer.Option(
+        None,
+        "--timings-file",
+        file_okay=True,
+        dir_okay=False,
+        help="File to append the timings to as newline-delimited JSON. Implies `--timings`.",
+        show_default=False,
+    ),
+    benchmark: Optional[int] = typer.Option(
+        None,
+        "--benchmark",
+        help="Execute the query the given number of times with the result cache disabled and report the distribution of client latency and server times instead of the results. Use `--parallel` to run it in several sessions at the same time.",
+        min=1,
+        show_default=False,
+    ),
+    warmup: int = typer.Option(
+        0,
+        "--warmup",
+        help="Number of runs executed before the measured `--benchmark` runs.",
+        min=0,
+    ),
+    **options,
 ) -> CommandResult:
     """
     Executes Snowflake query.
 
     Query to execute can be specified using query option, filename option (all queries from file will be executed)
     or via stdin by piping output from other command. For example `cat my.sql | snow sql -i`.
+
+    When executing multiple files, a summary of each file is reported instead of query results.
     """
-    single_statement, cursors = SqlManager().execute(query, file, std_in)
-    if single_statement:
-        return QueryResult(next(cursors))
-    return MultipleResults((QueryResult(c) for c in cursors))
+    if output_file_format and not output_file:
+        raise UsageError("--output-file-format requires --output-file.")
+    if warmup and not benchmark:
+        raise UsageError("--warmup requires --benchmark.")
+    files = files or []
+    multiple_files = len(files) > 1 or any(path.is_dir() for path in files)
+    if benchmark and multiple_files:
+        raise UsageError("--benchmark cannot be used with multiple files.")
+    if benchmark and (cache_ttl or output_file or timings or timings_file):
+        raise UsageError(
+            "--benchmark cannot be used with --cache-ttl, --output-file or --timings."
+        )
+    for option_name, value in [
+        ("--cache-ttl", cache_ttl),
+        ("--output-file", output_file),
+        ("--timings", timings or timings_file),
+    ]:
+        if value and (multiple_files or (parallel and parallel > 1)):
+            raise UsageError(
+                f"{option_name} cannot be used with --parallel or multiple files."
+            )
+    if multiple_files:
+        if query or std_in:
+            raise UsageError(
+                "Multiple input sources specified. Please specify only one."
+            )
+        return _execute_files(expand_sql_files(files), parallel)
+    file = files[0] if files else None
+
+    if benchmark:
+        return CollectionResult(
+            SqlManager().benchmark(
+                query, file, std_in, benchmark, warmup, concurrency=parallel or 1
+            )
+        )
+
+    if parallel and parallel > 1:
+        cursors = SqlManager().execute_parallel(query, file, std_in, parallel)
+        if len(cursors) == 1:
+            return ArrowQueryResult(cursors[0])
+        return MultipleResults([ArrowQueryResult(c) for c in cursors])
+
+    result_cache = ResultCache.default(cache_ttl) if cache_ttl else None
+    statement_timings = StatementTimings() if timings or timings_file else None
+    single_statement, cursors = SqlManager().execute(
+        query, file, std_in, result_cache=result_cache, timings=statement_timings
+    )
+    if output_file:
+        file_format = output_file_format or OutputFileFormat.from_path(output_file)
+        result = _write_last_result(cursors, output_file, file_format)
+    elif single_statement:
+        result = ArrowQueryResult(next(cursors))
+    else:
+        result = MultipleResults((ArrowQueryResult(c) for c in cursors))
+
+    if statement_timings is None:
+        return result
+    # reported after the results, which are read while they are printed
+    results = result.result if isinstance(result, MultipleResults) else [result]
+    return MultipleResults(
+        chain(results, [_timings_result(statement_timings, timings_file)])
+    )
+
+
+def _execute_files(files: List[Path], parallel: Optional[int]) -> CommandResult:
+    summary = SqlManager().execute_files(files, parallel or DEFAULT_FILES_PARALLEL)
+    failed = [row for row in summary if row["error"]]
+    if failed:
+        # the summary is printed before failing, as it is the only record of
+        # which files succeeded
+        print_result(CollectionResult(summary))
+        raise ClickException(f"{len(failed)} of {len(summary)} files failed.")
+    return CollectionResult(summary)
+
+
+def _write_last_result(
+    cursors: Iterable[SnowflakeCursor], output_file: Path, file_format: OutputFileFormat
+) -> CommandResult:
+    last_cursor = None
+    # previous results are dropped as soon as the next statement finishes
+    for last_cursor in cursors:
+        pass
+    if last_cursor is None:
+        raise ClickException("No statement to write the result of.")
+    rows = write_query_result(ArrowQueryResult(last_cursor), output_file, file_format)
+    return MessageResult(f"Wrote {rows} rows to {output_file}.")
+
+
+def _timings_result(
+    timings: StatementTimings, timings_file: Optional[Path]
+) -> CommandResult:
+    def _rows():
+        rows = timings.to_rows()
+        if timings_file:
+            timings.append_to_file(timings_file)
+        yield from rows
+
+    return CollectionResult(_rows())
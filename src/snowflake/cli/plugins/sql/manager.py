@@ -1,19 +1,333 @@
+from __future__ import annotations
+
+import json
+import queue
+import re
 import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import ExitStack
 from io import StringIO
+from itertools import chain, islice
 from pathlib import Path
-from typing import Iterable, Optional, Tuple
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+)
 
-from click import UsageError
+from click import ClickException, UsageError
+from snowflake.cli.api.cli_global_context import cli_context
+from snowflake.cli.api.in_flight_queries import in_flight_queries
+from snowflake.cli.api.query_profile import query_profiler
 from snowflake.cli.api.secure_path import UNLIMITED, SecurePath
+from snowflake.cli.api.session_state import SessionState
 from snowflake.cli.api.sql_execution import SqlExecutionMixin
-from snowflake.connector.cursor import SnowflakeCursor
+from snowflake.cli.plugins.sql.benchmark import (
+    SERVER_METRICS,
+    BenchmarkRun,
+    summarize,
+)
+from snowflake.cli.plugins.sql.result_cache import (
+    ResultCache,
+    is_read_only_statement,
+)
+from snowflake.cli.plugins.sql.timings import (
+    StatementTimings,
+    TimedCursor,
+    result_bytes,
+)
+from snowflake.connector import SnowflakeConnection
+from snowflake.connector.cursor import DictCursor, SnowflakeCursor
+from snowflake.connector.errors import Error, ProgrammingError
 from snowflake.connector.util_text import split_statements
 
+BARRIER_MARKER = "-- @barrier"
+# statements changing the state of the session affect all statements running
+# concurrently in it, so they are always executed on their own
+SESSION_STATEMENT_REGEX = re.compile(
+    r"(use|alter\s+session|set|unset|begin|start\s+transaction|commit|rollback)\b",
+    re.I,
+)
+# files are transferred by the client, which asynchronous queries skip, so PUT and
+# GET are executed synchronously on their own
+FILE_TRANSFER_STATEMENT_REGEX = re.compile(r"(put|get)\s", re.I)
+MIN_POLL_INTERVAL_SECONDS = 0.05
+MAX_POLL_INTERVAL_SECONDS = 1.0
+DISABLE_RESULT_CACHE_QUERY = "alter session set USE_CACHED_RESULT = false"
+SQL_FILE_PATTERN = "*.sql"
+DEFAULT_FILES_PARALLEL = 4
+
+
+def split_into_phases(query: str) -> List[List[str]]:
+    """
+    Splits the query into phases of statements which can run concurrently. A new
+    phase starts at each line consisting of the barrier marker, and statements
+    changing the session state or transferring files get a phase of their own.
+    """
+    phases: List[List[str]] = [[]]
+    for raw_statement, _ in split_statements(StringIO(query), remove_comments=False):
+        if any(
+            line.strip().lower() == BARRIER_MARKER
+            for line in raw_statement.splitlines()
+        ):
+            phases.append([])
+        statements = [
+            statement
+            for statement, _ in split_statements(
+                StringIO(raw_statement), remove_comments=True
+            )
+            if statement
+        ]
+        for statement in statements:
+            if SESSION_STATEMENT_REGEX.match(
+                statement
+            ) or FILE_TRANSFER_STATEMENT_REGEX.match(statement):
+                phases.extend([[statement], []])
+            else:
+                phases[-1].append(statement)
+    return [phase for phase in phases if phase]
+
+
+def expand_sql_files(paths: List[Path]) -> List[Path]:
+    """
+    Replaces directories with the SQL files directly inside them, sorted by name.
+    """
+    files: List[Path] = []
+    for path in paths:
+        if path.is_dir():
+            dir_files = sorted(p for p in path.glob(SQL_FILE_PATTERN) if p.is_file())
+            if not dir_files:
+                raise UsageError(f"No {SQL_FILE_PATTERN} files found in {path}.")
+            files.extend(dir_files)
+        else:
+            files.append(path)
+    return files
+
 
 class SqlManager(SqlExecutionMixin):
+    def __init__(self, connection: Optional[SnowflakeConnection] = None):
+        """
+        By default all statements run on the global CLI connection. A different
+        connection can be passed to run them in a separate session instead.
+        """
+        super().__init__()
+        self._connection = connection
+        self._connection_session_state = SessionState()
+
+    @property
+    def _conn(self):
+        if self._connection is not None:
+            return self._connection
+        return cli_context.connection
+
+    @property
+    def _session_state(self) -> SessionState:
+        if self._connection is not None:
+            return self._connection_session_state
+        return cli_context.session_state
+
     def execute(
-        self, query: Optional[str], file: Optional[Path], std_in: bool
+        self,
+        query: Optional[str],
+        file: Optional[Path],
+        std_in: bool,
+        result_cache: Optional[ResultCache] = None,
+        timings: Optional[StatementTimings] = None,
     ) -> Tuple[int, Iterable[SnowflakeCursor]]:
+        """
+        Executes the statements one by one as they are read and split, so that
+        memory usage does not depend on the size of the input.
+        If a result cache is provided, results of read-only statements are taken
+        from it when available, and stored in it otherwise.
+        If timings are provided, the time spent connecting and on each statement is
+        recorded in them as the statements are executed and their results read.
+        """
+        self._check_inputs(query, file, std_in)
+        statements = self._read_statements(query, file, std_in)
+
+        # look ahead just enough to tell whether there is a single statement
+        lookahead = list(islice(statements, 2))
+        single_statement = len(lookahead) == 1
+
+        # arbitrary statements may change the role, warehouse, database or schema
+        self._session_state.invalidate()
+        return single_statement, self._execute_statements(
+            chain(lookahead, statements), result_cache, timings
+        )
+
+    def execute_parallel(
+        self, query: Optional[str], file: Optional[Path], std_in: bool, parallel: int
+    ) -> List[SnowflakeCursor]:
+        """
+        Executes the statements asynchronously, keeping up to `parallel` of them
+        running at the same time. All statements of a phase (see split_into_phases)
+        finish before the next phase starts. PUT and GET statements are executed
+        synchronously, as the files are transferred by the client. Returns the
+        results of all statements in their original order.
+        """
+        query = self._read_query(query, file, std_in)
+        phases = split_into_phases(query)
+
+        self._session_state.invalidate()
+        results: List[SnowflakeCursor] = []
+        submitted: List[SnowflakeCursor] = []
+        for phase in phases:
+            running: List[str] = []
+            for statement in phase:
+                if FILE_TRANSFER_STATEMENT_REGEX.match(statement):
+                    results.append(
+                        self._execute_statement(
+                            statement, is_put_or_get=True, result_cache=None
+                        )
+                    )
+                    continue
+                running = self._wait_for_queries(running, max_running=parallel - 1)
+                cursor = self._submit_query(statement)
+                results.append(cursor)
+                submitted.append(cursor)
+                running.append(cursor.sfqid)
+            self._wait_for_queries(running, max_running=0)
+
+        # fetched over REST, as result_scan would run another query per statement
+        for cursor in submitted:
+            cursor.query_result(cursor.sfqid)
+        return results
+
+    def benchmark(
+        self,
+        query: Optional[str],
+        file: Optional[Path],
+        std_in: bool,
+        runs: int,
+        warmup: int = 0,
+        concurrency: int = 1,
+    ) -> List[Dict]:
+        """
+        Executes the statements `warmup` times and then `runs` times with the result
+        cache disabled, on `concurrency` sessions at the same time. Returns the
+        distribution of the client latency of the measured runs, including fetching
+        their results, and of the server times reported in the query history.
+        """
+        query = self._read_query(query, file, std_in)
+        self._session_state.invalidate()
+        with ExitStack() as stack:
+            managers: List[SqlManager] = [self]
+            for _ in range(concurrency - 1):
+                # connections are opened here rather than in the workers, as
+                # connecting needs the click context of the main thread
+                connection = cli_context.new_connection()
+                stack.callback(connection.close)
+                managers.append(SqlManager(connection=connection))
+            for manager in managers:
+                manager._execute_query(DISABLE_RESULT_CACHE_QUERY)  # noqa: SLF001
+
+            self._run_concurrently(managers, query, warmup)
+            measured = self._run_concurrently(managers, query, runs)
+
+        query_ids = [qid for run in measured for qid in run.query_ids if qid]
+        return summarize(measured, self._server_times(query_ids))
+
+    @staticmethod
+    def _run_concurrently(
+        managers: List[SqlManager], query: str, count: int
+    ) -> List[BenchmarkRun]:
+        idle_managers: queue.SimpleQueue[SqlManager] = queue.SimpleQueue()
+        for manager in managers:
+            idle_managers.put(manager)
+
+        def _run(_) -> BenchmarkRun:
+            manager = idle_managers.get()
+            try:
+                return manager._timed_run(query)  # noqa: SLF001
+            finally:
+                idle_managers.put(manager)
+
+        with ThreadPoolExecutor(max_workers=len(managers)) as executor:
+            return list(executor.map(_run, range(count)))
+
+    def _timed_run(self, query: str) -> BenchmarkRun:
+        start = time.monotonic()
+        query_ids = []
+        for cursor in self._execute_string(query):
+            cursor.fetchall()
+            query_ids.append(cursor.sfqid)
+        return BenchmarkRun(
+            client_seconds=time.monotonic() - start, query_ids=query_ids
+        )
+
+    def _server_times(self, query_ids: List[str]) -> Optional[Dict[str, Dict]]:
+        """
+        Reads the server times of the queries from the query history. Returns None
+        if it is not available, e.g. when the session has no current database.
+        """
+        if not query_ids:
+            return None
+        ids = ", ".join(f"'{query_id}'" for query_id in query_ids)
+        try:
+            cursor = self._execute_query(
+                f"select query_id, {', '.join(SERVER_METRICS).lower()}"
+                " from table(information_schema.query_history(result_limit => 10000))"
+                f" where query_id in ({ids})",
+                cursor_class=DictCursor,
+            )
+        except ProgrammingError as err:
+            self._log.debug("Could not read the query history: %s", err)
+            return None
+        return {row["QUERY_ID"]: row for row in cursor}
+
+    def execute_files(self, files: List[Path], parallel: int) -> List[Dict]:
+        """
+        Executes the files concurrently, each in a new session, keeping up to
+        `parallel` of them running at the same time. Statements of a file run one by
+        one. A failing file does not stop the others. Returns a summary of each file
+        in the original order.
+        """
+        futures: List[Future] = []
+        with ThreadPoolExecutor(max_workers=parallel) as executor:
+            running: Set[Future] = set()
+            for file in files:
+                if len(running) >= parallel:
+                    _, running = wait(running, return_when=FIRST_COMPLETED)
+                # connections are opened here rather than in the workers, as
+                # connecting needs the click context of the main thread
+                connection = cli_context.new_connection()
+                futures.append(
+                    executor.submit(self._execute_file_in_session, file, connection)
+                )
+                running.add(futures[-1])
+        return [future.result() for future in futures]
+
+    @staticmethod
+    def _execute_file_in_session(file: Path, connection: SnowflakeConnection) -> Dict:
+        start = time.monotonic()
+        statements = rows = 0
+        error = None
+        try:
+            _, cursors = SqlManager(connection=connection).execute(None, file, False)
+            for cursor in cursors:
+                statements += 1
+                rows += cursor.rowcount or 0
+        except (Error, OSError) as err:
+            error = str(err)
+        finally:
+            connection.close()
+        return {
+            "file": str(file),
+            "status": "FAILED" if error else "SUCCESS",
+            "statements": statements,
+            "rows": rows,
+            "elapsed_seconds": round(time.monotonic() - start, 3),
+            "error": error,
+        }
+
+    @staticmethod
+    def _check_inputs(query: Optional[str], file: Optional[Path], std_in: bool):
         inputs = [query, file, std_in]
         if not any(inputs):
             raise UsageError("Use either query, filename or input option.")
@@ -24,15 +338,142 @@ class SqlManager(SqlExecutionMixin):
                 "Multiple input sources specified. Please specify only one."
             )
 
+    @classmethod
+    def _read_query(
+        cls, query: Optional[str], file: Optional[Path], std_in: bool
+    ) -> str:
+        cls._check_inputs(query, file, std_in)
         if std_in:
             query = sys.stdin.read()
         elif file:
             query = SecurePath(file).read_text(file_size_limit_mb=UNLIMITED)
+        return query  # type: ignore
 
-        statements = tuple(
-            statement
-            for statement, _ in split_statements(StringIO(query), remove_comments=True)
+    @classmethod
+    def _read_statements(
+        cls, query: Optional[str], file: Optional[Path], std_in: bool
+    ) -> Iterator[Tuple[str, Optional[bool]]]:
+        """
+        Yields the statements and whether they are PUT or GET commands, reading
+        the file or standard input incrementally.
+        """
+        if file:
+            with SecurePath(file).open("r", read_file_limit_mb=UNLIMITED) as fh:
+                yield from cls._split_stream(fh)
+        else:
+            yield from cls._split_stream(sys.stdin if std_in else StringIO(query))
+
+    @staticmethod
+    def _split_stream(stream: TextIO) -> Iterator[Tuple[str, Optional[bool]]]:
+        return (
+            (statement, is_put_or_get)
+            for statement, is_put_or_get in split_statements(
+                stream, remove_comments=True
+            )
+            if statement
         )
-        single_statement = len(statements) == 1
 
-        return single_statement, self._execute_string("\n".join(statements))
+    def _execute_statements(
+        self,
+        statements: Iterable[Tuple[str, Optional[bool]]],
+        result_cache: Optional[ResultCache] = None,
+        timings: Optional[StatementTimings] = None,
+    ) -> Iterator[SnowflakeCursor]:
+        """
+        Lazy counterpart of SnowflakeConnection.execute_stream, which splits the
+        whole input before executing the first statement.
+        """
+        if timings is not None:
+            # the connection is opened on first use
+            start = time.monotonic()
+            self._conn  # noqa: B018
+            timings.record_connect(time.monotonic() - start)
+
+        for statement, is_put_or_get in statements:
+            submitted = time.monotonic()
+            timing = timings.start(statement) if timings is not None else None
+            cursor = self._execute_statement(statement, is_put_or_get, result_cache)
+            if timing is not None:
+                timing.execute_seconds = time.monotonic() - submitted
+                timing.query_id = getattr(cursor, "sfqid", None)
+                timing.rows = getattr(cursor, "rowcount", None)
+                timing.bytes = result_bytes(cursor)
+                cursor = TimedCursor(cursor, timing, submitted)
+            yield cursor
+
+    def _execute_statement(
+        self,
+        statement: str,
+        is_put_or_get: Optional[bool],
+        result_cache: Optional[ResultCache],
+    ):
+        cache_key = None
+        if result_cache and is_read_only_statement(statement):
+            cache_key = self._result_cache_key(statement)
+            cached = result_cache.get(cache_key)
+            if cached is not None:
+                self._log.debug("Using cached result of %s", statement)
+                return cached
+
+        self._log.debug("Executing %s", statement)
+        cursor = self._conn.cursor()
+        start = time.monotonic()
+        with in_flight_queries.running_on(self._conn):
+            cursor.execute(statement, _is_put_get=is_put_or_get)
+        if cli_context.profile_queries:
+            query_profiler.record(self._conn, cursor, time.monotonic() - start)
+        if result_cache and cache_key:
+            return result_cache.store(cache_key, cursor)
+        return cursor
+
+    def _result_cache_key(self, statement: str) -> str:
+        """
+        Describes the statement together with the context it runs in, as the same
+        statement can return different results for a different account, user,
+        role, warehouse, database or schema.
+        """
+        conn = self._conn
+        context = [
+            conn.account,
+            conn.user,
+            conn.role,
+            conn.warehouse,
+            conn.database,
+            conn.schema,
+        ]
+        return json.dumps([*context, statement], default=str)
+
+    def _submit_query(self, statement: str) -> SnowflakeCursor:
+        self._log.debug("Submitting %s", statement)
+        cursor = self._conn.cursor()
+        cursor.execute_async(statement)
+        in_flight_queries.add_query(self._conn, cursor.sfqid)
+        return cursor
+
+    def _wait_for_queries(self, query_ids: List[str], max_running: int) -> List[str]:
+        """
+        Waits until at most max_running of the given queries are still running and
+        returns them. If any query failed, waits for all of them to finish instead
+        and raises the error of the first failed one.
+        """
+        interval = MIN_POLL_INTERVAL_SECONDS
+        failed: List[str] = []
+        while True:
+            still_running = []
+            for query_id in query_ids:
+                status = self._conn.get_query_status(query_id)
+                if self._conn.is_still_running(status):
+                    still_running.append(query_id)
+                    continue
+                in_flight_queries.remove_query(query_id)
+                if self._conn.is_an_error(status):
+                    failed.append(query_id)
+            query_ids = still_running
+
+            if failed and not query_ids:
+                self._conn.get_query_status_throw_if_error(failed[0])
+                raise ClickException(f"Query {failed[0]} failed.")
+            if not failed and len(query_ids) <= max_running:
+                return query_ids
+            time.sleep(interval)
+            interval = min(interval * 2, MAX_POLL_INTERVAL_SECONDS)
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from base64 import b64decode, b64encode
+from datetime import date, datetime
+from datetime import time as dt_time
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Iterator, List, NamedTuple, Optional, Sequence
+
+from snowflake.cli.api.config import get_cache_dir
+from snowflake.cli.api.secure_path import UNLIMITED, SecurePath
+from snowflake.connector.errors import NotSupportedError
+
+RESULT_CACHE_DIRECTORY_NAME = "sql_results"
+RESULT_CACHE_VERSION = 1
+DEFAULT_MAX_CACHE_BYTES = 64 * 1024 * 1024
+# larger results are not worth keeping, as reading them back would not be much
+# faster than running the query again
+MAX_CACHED_ROWS = 10_000
+_ENTRY_SUFFIX = ".json.gz"
+
+# statements which only read data or metadata and return the same result for the
+# same session context. Functions with side effects or depending on the previous
+# statements of the session disqualify a statement.
+_READ_ONLY_STATEMENT_REGEX = re.compile(r"(select|show|describe|desc|list|ls)\b", re.I)
+_NOT_CACHEABLE_REGEX = re.compile(r"\b(nextval|system\$\w+|last_query_id)\b", re.I)
+
+log = logging.getLogger(__name__)
+
+
+def is_read_only_statement(statement: str) -> bool:
+    return bool(
+        _READ_ONLY_STATEMENT_REGEX.match(statement.lstrip())
+        and not _NOT_CACHEABLE_REGEX.search(statement)
+    )
+
+
+class _ColumnMetadata(NamedTuple):
+    name: str
+
+
+class CachedCursor:
+    """
+    Read-only stand-in for a cursor whose result was stored in the result cache.
+    It supports what is needed to print the result.
+    """
+
+    def __init__(self, query: str, columns: Sequence[str], rows: List[tuple]):
+        self.query = query
+        self.description = [_ColumnMetadata(name) for name in columns]
+        self._rows = rows
+
+    @property
+    def rowcount(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[tuple]:
+        return iter(self._rows)
+
+    def fetchall(self) -> List[tuple]:
+        return list(self._rows)
+
+    def fetch_arrow_batches(self):
+        raise NotSupportedError("Cached results are not available in Arrow format.")
+
+
+class ResultCache:
+    """
+    On-disk cache of small query results, one compressed file per entry. Entries
+    older than ttl_seconds are ignored, and the least recently written ones are
+    evicted once the cache takes more than max_bytes. Keys are opaque strings
+    describing the statement together with the session context it ran in.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        ttl_seconds: int,
+        max_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+    ):
+        self._directory = directory
+        self._ttl_seconds = ttl_seconds
+        self._max_bytes = max_bytes
+
+    @classmethod
+    def default(cls, ttl_seconds: int) -> ResultCache:
+        return cls(get_cache_dir() / RESULT_CACHE_DIRECTORY_NAME, ttl_seconds)
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    def get(self, key: str) -> Optional[CachedCursor]:
+        """
+        Returns the cached result for the key, or None if there is no valid entry.
+        """
+        path = self._entry_path(key)
+        if not path.is_file():
+            return None
+        try:
+            with SecurePath(path).open("rb", read_file_limit_mb=UNLIMITED) as fh:
+                content = json.loads(gzip.decompress(fh.read()))
+            if content["version"] != RESULT_CACHE_VERSION or content["key"] != key:
+                return None
+            if content["created_at"] + self._ttl_seconds <= time.time():
+                SecurePath(path).unlink(missing_ok=True)
+                return None
+            return CachedCursor(
+                query=content["query"],
+                columns=content["columns"],
+                rows=[tuple(_decode(v) for v in row) for row in content["rows"]],
+            )
+        except (OSError, ValueError, KeyError, TypeError) as err:
+            log.debug("Ignoring unreadable cached result %s: %s", path, err)
+            SecurePath(path).unlink(missing_ok=True)
+            return None
+
+    def store(self, key: str, cursor) -> Any:
+        """
+        Reads the result of the cursor and stores it under the key. Returns an
+        equivalent cursor to be used instead of the consumed one. Results too large
+        to be cached are left untouched.
+        """
+        rowcount = getattr(cursor, "rowcount", None)
+        if rowcount is None or rowcount > MAX_CACHED_ROWS:
+            return cursor
+        cached = CachedCursor(
+            query=cursor.query,
+            columns=[column.name for column in cursor.description],
+            rows=[tuple(row) for row in cursor],
+        )
+        content = {
+            "version": RESULT_CACHE_VERSION,
+            "key": key,
+            "created_at": time.time(),
+            "query": cached.query,
+            "columns": [column.name for column in cached.description],
+            "rows": [[_encode(v) for v in row] for row in cached.fetchall()],
+        }
+        try:
+            data = gzip.compress(
+                json.dumps(content, separators=(",", ":")).encode("utf-8")
+            )
+        except (TypeError, ValueError) as err:
+            log.debug("Result of %s cannot be cached: %s", cached.query, err)
+            return cached
+        if len(data) <= self._max_bytes:
+            self._write(self._entry_path(key), data)
+            self._evict()
+        return cached
+
+    def clear(self) -> None:
+        for path in self._entries():
+            SecurePath(path).unlink(missing_ok=True)
+
+    def _entry_path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self._directory / f"{digest}{_ENTRY_SUFFIX}"
+
+    def _entries(self) -> List[Path]:
+        if not self._directory.is_dir():
+            return []
+        return [p for p in self._directory.iterdir() if p.name.endswith(_ENTRY_SUFFIX)]
+
+    def _write(self, path: Path, data: bytes) -> None:
+        """Replaces the entry atomically, so concurrent readers never see a part."""
+        SecurePath(self._directory).mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with SecurePath(tmp_path).open("wb") as fh:
+                fh.write(data)
+            os.replace(tmp_path, path)
+        except OSError as err:
+            log.debug("Could not save cached result %s: %s", path, err)
+            SecurePath(tmp_path).unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self._entries():
+            try:
+                stat_result = path.stat()
+            except OSError:
+                continue
+            entries.append((stat_result.st_mtime, stat_result.st_size, path))
+        total_bytes = sum(size for _, size, _ in entries)
+        # oldest first, as they are also the first ones to expire
+        for _, size, path in sorted(entries):
+            if total_bytes <= self._max_bytes:
+                break
+            SecurePath(path).unlink(missing_ok=True)
+            total_bytes -= size
+
+
+def _encode(value: Any) -> Any:
+    """Encodes values which JSON cannot represent, keeping their type."""
+    if isinstance(value, Decimal):
+        return {"$decimal": str(value)}
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, dt_time):
+        return {"$time": value.isoformat()}
+    if isinstance(value, (bytes, bytearray)):
+        return {"$binary": b64encode(value).decode("ascii")}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if not isinstance(value, dict) or len(value) != 1:
+        return value
+    (kind, encoded), *_ = value.items()
+    if kind == "$decimal":
+        return Decimal(encoded)
+    if kind == "$datetime":
+        return datetime.fromisoformat(encoded)
+    if kind == "$date":
+        return date.fromisoformat(encoded)
+    if kind == "$time":
+        return dt_time.fromisoformat(encoded)
+    if kind == "$binary":
+        return b64decode(encoded)
+    return value
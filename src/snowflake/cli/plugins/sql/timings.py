@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from snowflake.cli.api.secure_path import SecurePath
+
+CONNECT_STEP = "(connect)"
+
+
+@dataclass
+class StatementTiming:
+    """
+    Client-side timings of a single statement, in seconds. Time to first row is
+    measured from submitting the statement, fetch time from requesting the first
+    row until the last one arrived. Fetch timings stay empty if the result is
+    never read.
+    """
+
+    statement: str
+    query_id: Optional[str] = None
+    submitted_at: Optional[str] = None
+    execute_seconds: Optional[float] = None
+    first_row_seconds: Optional[float] = None
+    fetch_seconds: Optional[float] = None
+    rows: Optional[int] = None
+    bytes: Optional[int] = None  # noqa: A003
+
+    def to_row(self) -> Dict:
+        row = asdict(self)
+        for key, value in row.items():
+            if isinstance(value, float):
+                row[key] = round(value, 3)
+        return row
+
+
+@dataclass
+class StatementTimings:
+    """Collects the timings of all statements executed by a single command."""
+
+    statements: List[StatementTiming] = field(default_factory=list)
+
+    def record_connect(self, seconds: float) -> None:
+        self.statements.append(
+            StatementTiming(statement=CONNECT_STEP, execute_seconds=seconds)
+        )
+
+    def start(self, statement: str) -> StatementTiming:
+        timing = StatementTiming(
+            statement=statement,
+            submitted_at=datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        )
+        self.statements.append(timing)
+        return timing
+
+    def to_rows(self) -> List[Dict]:
+        return [timing.to_row() for timing in self.statements]
+
+    def append_to_file(self, path: Path) -> None:
+        """Appends the timings to a newline-delimited JSON metrics file."""
+        file_path = SecurePath(path)
+        if not file_path.exists():
+            file_path.touch()
+        with file_path.open("a") as fh:
+            for row in self.to_rows():
+                fh.write(json.dumps(row) + "\n")
+
+
+class TimedCursor:
+    """
+    Wraps a cursor, measuring how long its rows take to arrive once they are read.
+    All other attributes are those of the wrapped cursor.
+    """
+
+    def __init__(self, cursor, timing: StatementTiming, submitted: float):
+        self._cursor = cursor
+        self._timing = timing
+        self._submitted = submitted
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return self._timed(iter(self._cursor), row_count=lambda _: 1)
+
+    def fetch_arrow_batches(self):
+        batches = self._cursor.fetch_arrow_batches()
+        return self._timed(iter(batches), row_count=lambda batch: batch.num_rows)
+
+    def _timed(self, items: Iterator, row_count) -> Iterator:
+        fetch_start = time.monotonic()
+        rows = 0
+        for item in items:
+            if self._timing.first_row_seconds is None:
+                self._timing.first_row_seconds = time.monotonic() - self._submitted
+            rows += row_count(item)
+            yield item
+        self._timing.fetch_seconds = time.monotonic() - fetch_start
+        self._timing.rows = rows
+
+
+def result_bytes(cursor) -> Optional[int]:
+    """
+    Returns the uncompressed size of the result as reported by Snowflake, or None
+    if it is not known.
+    """
+    get_result_batches = getattr(cursor, "get_result_batches", None)
+    if not callable(get_result_batches):
+        return None
+    sizes = [
+        batch.uncompressed_size
+        for batch in get_result_batches() or []
+        if isinstance(batch.uncompressed_size, int)
+    ]
+    return sum(sizes) if sizes else None
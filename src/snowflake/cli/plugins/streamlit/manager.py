@@ -13,7 +13,11 @@ from snowflake.cli.plugins.connection.util import (
     MissingConnectionHostError,
     make_snowsight_url,
 )
-from snowflake.cli.plugins.object.stage.manager import StageManager
+from snowflake.cli.plugins.object.stage.manager import (
+    PutRequest,
+    StageManager,
+    StageSessionPool,
+)
 from snowflake.connector.cursor import SnowflakeCursor
 from snowflake.connector.errors import ProgrammingError
 
@@ -34,15 +38,13 @@ class StreamlitManager(SqlExecutionMixin):
         pages_dir: Optional[Path],
         additional_source_files: Optional[List[str]],
     ):
-        stage_manager = StageManager()
-
-        stage_manager.put(main_file, root_location, 4, True)
+        requests = [PutRequest(main_file, root_location)]
 
         if environment_file and environment_file.exists():
-            stage_manager.put(environment_file, root_location, 4, True)
+            requests.append(PutRequest(environment_file, root_location))
 
         if pages_dir and pages_dir.exists():
-            stage_manager.put(pages_dir / "*.py", f"{root_location}/pages", 4, True)
+            requests.append(PutRequest(pages_dir / "*.py", f"{root_location}/pages"))
 
         if additional_source_files:
             for file in additional_source_files:
@@ -53,7 +55,12 @@ class StreamlitManager(SqlExecutionMixin):
                     if "/" in file
                     else root_location
                 )
-                stage_manager.put(file, destination, 4, True)
+                requests.append(PutRequest(file, destination))
+
+        # the files are independent of each other, so with multiple upload sessions
+        # configured they are uploaded concurrently
+        with StageSessionPool() as session_pool:
+            session_pool.put(requests, overwrite=True, parallel=4)
 
     def _create_streamlit(
         self,
@@ -0,0 +1,66 @@
+import os
+import signal
+from unittest import mock
+
+import pytest
+from snowflake.cli.api.in_flight_queries import (
+    InFlightQueries,
+    cancel_queries_on_interrupt,
+)
+
+
+def _executed_queries(connection):
+    return [c.args[0] for c in connection.cursor.return_value.execute.mock_calls]
+
+
+def test_cancel_all_cancels_queries_and_busy_sessions():
+    registry = InFlightQueries()
+    async_connection = mock.Mock()
+    sync_connection = mock.Mock(session_id=1234)
+    registry.add_query(async_connection, "qid-1")
+    registry.add_query(async_connection, "qid-2")
+    registry.remove_query("qid-2")
+
+    with registry.running_on(sync_connection):
+        assert len(registry) == 2
+        assert registry.cancel_all(timeout=1) == 2
+
+    assert len(registry) == 0
+    assert _executed_queries(async_connection) == [
+        "select system$cancel_query('qid-1')"
+    ]
+    assert _executed_queries(sync_connection) == [
+        "select system$cancel_all_queries(1234)"
+    ]
+
+
+def test_cancel_all_ignores_errors():
+    registry = InFlightQueries()
+    connection = mock.Mock()
+    connection.cursor.return_value.execute.side_effect = Exception("gone")
+    registry.add_query(connection, "qid")
+
+    assert registry.cancel_all(timeout=1) == 1
+
+
+def test_running_on_is_reentrant():
+    registry = InFlightQueries()
+    connection = mock.Mock()
+    with registry.running_on(connection):
+        with registry.running_on(connection):
+            assert len(registry) == 1
+        assert len(registry) == 1
+    assert len(registry) == 0
+
+
+@mock.patch("snowflake.cli.api.in_flight_queries.in_flight_queries")
+def test_interrupt_cancels_queries_before_keyboard_interrupt(mock_registry):
+    mock_registry.__len__.return_value = 1
+    previous_handler = signal.getsignal(signal.SIGINT)
+
+    with pytest.raises(KeyboardInterrupt):
+        with cancel_queries_on_interrupt():
+            os.kill(os.getpid(), signal.SIGINT)
+
+    mock_registry.cancel_all.assert_called_once()
+    assert signal.getsignal(signal.SIGINT) is previous_handler
@@ -0,0 +1,99 @@
+from unittest import mock
+
+from snowflake.cli.api.query_profile import QueryProfiler
+from snowflake.connector.errors import ProgrammingError
+
+HISTORY_ROW = {
+    "QUERY_ID": "qid-1",
+    "TOTAL_ELAPSED_TIME": 150,
+    "COMPILATION_TIME": 40,
+    "QUEUED_PROVISIONING_TIME": 5,
+    "QUEUED_REPAIR_TIME": 0,
+    "QUEUED_OVERLOAD_TIME": 5,
+    "EXECUTION_TIME": 100,
+}
+
+
+def _cursor(query_id, query):
+    return mock.Mock(sfqid=query_id, query=query)
+
+
+def test_report_combines_client_and_server_times():
+    profiler = QueryProfiler()
+    first_session = mock.MagicMock(session_id=1)
+    second_session = mock.MagicMock(session_id=2)
+    profiler.record(first_session, _cursor("qid-1", "select\n  1"), 0.2)
+    profiler.record(second_session, _cursor("qid-2", "select " + "x" * 50), 0.05)
+    profiler.record(first_session, _cursor(None, "not executed"), 0.01)
+    first_session.cursor.return_value.__iter__.return_value = [HISTORY_ROW]
+
+    rows = profiler.report(first_session)
+
+    assert rows == [
+        {
+            "query_id": "qid-1",
+            "statement": "select 1",
+            "client_ms": 200,
+            "server_ms": 150,
+            "compilation_ms": 40,
+            "queued_ms": 10,
+            "execution_ms": 100,
+            "network_and_client_ms": 50,
+        },
+        {
+            "query_id": "qid-2",
+            "statement": "select " + "x" * 30 + "...",
+            "client_ms": 50,
+            "server_ms": None,
+            "compilation_ms": None,
+            "queued_ms": None,
+            "execution_ms": None,
+            "network_and_client_ms": None,
+        },
+        {
+            "query_id": "(total)",
+            "statement": "2 queries",
+            "client_ms": 250,
+            "server_ms": 150,
+            "compilation_ms": 40,
+            "queued_ms": 10,
+            "execution_ms": 100,
+            "network_and_client_ms": 50,
+        },
+    ]
+    (history_query,) = first_session.cursor.return_value.execute.call_args.args
+    assert history_query.count("query_history_by_session") == 2
+    assert "session_id => 1," in history_query
+    assert "union all" in history_query
+    assert len(profiler) == 0
+
+
+def test_report_without_query_history():
+    profiler = QueryProfiler()
+    connection = mock.MagicMock(session_id=1)
+    connection.cursor.return_value.execute.side_effect = ProgrammingError("no db")
+    profiler.record(connection, _cursor("qid-1", "select 1"), 0.2)
+
+    rows = profiler.report(connection)
+
+    assert rows[0]["client_ms"] == 200
+    assert rows[0]["server_ms"] is None
+    assert profiler.report(connection) == []
+
+
+@mock.patch("snowflake.connector.connect")
+def test_profile_queries_option(mock_connect, runner, mock_cursor):
+    cursor = mock_cursor([("xs",)], ["name"])
+    cursor._sfqid = "qid-1"  # noqa: SLF001
+    connection = mock_connect.return_value
+    connection.session_id = 7
+    connection.execute_stream.return_value = [cursor]
+    connection.cursor.return_value.__iter__.return_value = [HISTORY_ROW]
+
+    result = runner.invoke(
+        ["object", "list", "warehouse", "--profile-queries", "--format", "json"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert '"network_and_client_ms"' in result.output
+    assert '"query_id": "(total)"' in result.output
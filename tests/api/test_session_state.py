@@ -0,0 +1,73 @@
+from unittest import mock
+
+import pytest
+from snowflake.cli.api.cli_global_context import cli_context
+from snowflake.cli.api.session_state import SessionState
+from snowflake.cli.api.sql_execution import SqlExecutionMixin
+
+
+def _state_after(*queries: str) -> SessionState:
+    state = SessionState()
+    state.add_validated_schema("db", "sch")
+    for query in queries:
+        state.update_from_query(query)
+    return state
+
+
+@pytest.mark.parametrize(
+    "query, forgets_validated",
+    [
+        ("drop schema db.sch", True),
+        ("-- comment\nDROP DATABASE IF EXISTS db", True),
+        ("call my_procedure()", True),
+        ("execute immediate 'drop schema db.sch'", True),
+        ("begin drop schema db.sch; end", True),
+        ("use role accountadmin", False),
+        ("use db.other", False),
+        ("create schema db.other", False),
+        ("drop table t", False),
+        ("select 1", False),
+    ],
+)
+def test_update_from_query(query, forgets_validated):
+    state = _state_after(query)
+
+    assert state.is_schema_validated("db", "sch") != forgets_validated
+    assert state.is_database_validated("db") != forgets_validated
+
+
+def test_validated_schema_validates_its_database():
+    state = SessionState()
+    state.add_validated_schema("db", "sch")
+
+    assert state.is_database_validated("db")
+    assert not state.is_schema_validated("db", "other")
+
+
+@mock.patch("snowflake.cli.api.sql_execution.SqlExecutionMixin._execute_string")
+def test_executed_statements_update_session_state(mock_execute, mock_cursor):
+    queries = ["use db.sch", "drop schema db.sch"]
+    cursors = []
+    for query in queries:
+        cursor = mock_cursor([], [])
+        cursor.query = query
+        cursors.append(cursor)
+    mock_execute.return_value = iter(cursors)
+    mixin = SqlExecutionMixin()
+    cli_context.session_state.add_validated_schema("db", "sch")
+
+    mixin._execute_queries(";\n".join(queries))
+
+    assert not cli_context.session_state.is_schema_validated("db", "sch")
+
+
+@mock.patch("snowflake.cli.api.sql_execution.SqlExecutionMixin._execute_string")
+def test_failed_statements_invalidate_session_state(mock_execute):
+    mock_execute.side_effect = RuntimeError("failed")
+    mixin = SqlExecutionMixin()
+    cli_context.session_state.add_validated_schema("db", "sch")
+
+    with pytest.raises(RuntimeError):
+        mixin._execute_queries("use db.sch")
+
+    assert not cli_context.session_state.is_schema_validated("db", "sch")
@@ -1,3 +1,4 @@
+import json
 from unittest import mock
 
 from snowflake.cli.__about__ import VERSION
@@ -40,3 +41,21 @@ def test_executing_command_sends_telemetry_data(
         },
         "timestamp": "123",
     }
+
+
+@mock.patch("snowflake.cli.app.telemetry.cli_context")
+@mock.patch("snowflake.cli.app.telemetry.click.get_current_context")
+def test_command_query_tag(mock_click_context, mock_cli_context):
+    from snowflake.cli.app.telemetry import INVOCATION_ID, command_query_tag
+
+    mock_click_context.return_value.command_path = "snow snowpark deploy"
+    mock_click_context.return_value.params = {}
+    mock_cli_context.project_definition = {"project_name": "my_project"}
+
+    assert json.loads(command_query_tag()) == {
+        "source": "snowcli",
+        "version": VERSION,
+        "command": "snowpark deploy",
+        "invocation_id": INVOCATION_ID,
+        "project": "my_project",
+    }
@@ -3,6 +3,7 @@ from __future__ import annotations
 import logging
 from datetime import datetime
 from logging import FileHandler
+from unittest import mock
 
 import pytest
 from snowflake.cli.api.cli_global_context import cli_context_manager
@@ -10,6 +11,7 @@ from snowflake.cli.api.commands.decorators import global_options, with_output
 from snowflake.cli.api.config import config_init
 from snowflake.cli.api.console import cli_console
 from snowflake.cli.api.output.types import QueryResult
+from snowflake.cli.api.query_profile import query_profiler
 from snowflake.cli.app import loggers
 from snowflake.cli.app.cli_app import app
 
@@ -27,6 +29,7 @@ def reset_global_context_and_setup_config_and_logging_levels(
     request, test_snowcli_config
 ):
     cli_context_manager.reset()
+    query_profiler.clear()
     cli_context_manager.set_verbose(False)
     cli_context_manager.set_enable_tracebacks(False)
     config_init(test_snowcli_config)
@@ -34,6 +37,18 @@ def reset_global_context_and_setup_config_and_logging_levels(
     yield
 
 
+@pytest.fixture(autouse=True)
+# Unit tests which mock the executed queries do not open a connection. They get one
+# which, like a connection before its first query, does not know the current role,
+# database or schema. Commands invoked by the "runner" fixture replace it.
+def unknown_session_connection(
+    reset_global_context_and_setup_config_and_logging_levels,
+):
+    connection = mock.MagicMock(role=None, warehouse=None, database=None, schema=None)
+    cli_context_manager.connection_context._cached_connection = connection
+    yield connection
+
+
 # This automatically used cleanup fixture is required to avoid random breaking of logging
 # in one test caused by presence of capsys in other test.
 # See similar issues: https://github.com/pytest-dev/pytest/issues/5502
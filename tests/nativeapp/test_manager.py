@@ -10,7 +10,7 @@ from snowflake.cli.plugins.nativeapp.manager import (
     SnowflakeSQLExecutionError,
     ensure_correct_owner,
 )
-from snowflake.cli.plugins.object.stage.diff import DiffResult
+from snowflake.cli.plugins.object.stage.diff import DEFAULT_HASH_WORKERS, DiffResult
 from snowflake.cli.api.project.definition_manager import DefinitionManager
 from snowflake.connector.cursor import DictCursor
 
@@ -83,16 +83,48 @@ def test_sync_deploy_root_with_stage(
     ]
     assert mock_execute.mock_calls == expected
     mock_stage_diff.assert_called_once_with(
-        native_app_manager.deploy_root, "app_pkg.app_src.stage"
+        native_app_manager.deploy_root,
+        "app_pkg.app_src.stage",
+        hash_workers=DEFAULT_HASH_WORKERS,
+        use_manifest=True,
     )
     mock_local_diff_with_stage.assert_called_once_with(
         role="new_role",
         deploy_root_path=native_app_manager.deploy_root,
         diff_result=mock_diff_result,
         stage_path="app_pkg.app_src.stage",
+        update_manifest=True,
     )
 
 
+@mock.patch(NATIVEAPP_MANAGER_EXECUTE)
+@mock.patch(f"{NATIVEAPP_MODULE}.stage_diff")
+@mock.patch(f"{NATIVEAPP_MODULE}.sync_local_diff_with_stage")
+@pytest.mark.parametrize("from_manifest", [True, False])
+def test_sync_deploy_root_with_stage_without_changes(
+    mock_local_diff_with_stage,
+    mock_stage_diff,
+    mock_execute,
+    from_manifest,
+    temp_dir,
+    mock_cursor,
+):
+    mock_execute.return_value = mock_cursor([{"CURRENT_ROLE()": "old_role"}], [])
+    mock_stage_diff.return_value = DiffResult(
+        identical=["setup.sql"], from_manifest=from_manifest
+    )
+    create_named_file(
+        file_name="snowflake.yml",
+        dir=os.getcwd(),
+        contents=[mock_snowflake_yml_file],
+    )
+
+    _get_na_manager().sync_deploy_root_with_stage("new_role")
+
+    # the manifest only needs to be written if the stage had to be listed
+    assert mock_local_diff_with_stage.called != from_manifest
+
+
 @mock.patch(NATIVEAPP_MANAGER_EXECUTE)
 def test_get_app_pkg_distribution_in_snowflake(mock_execute, temp_dir, mock_cursor):
 
@@ -0,0 +1,158 @@
+import json
+import os
+from pathlib import Path
+from unittest import mock
+
+from snowflake.cli.plugins.object.stage.checksum_cache import (
+    CHECKSUM_CACHE_VERSION,
+    ChecksumCache,
+    FileSignature,
+)
+from snowflake.cli.plugins.object.stage.diff import compute_md5sum, stage_diff
+
+from tests.object.stage.test_diff import (
+    FILE_CONTENTS,
+    STAGE_LS_COLUMNS,
+    STAGE_MANAGER,
+    stage_contents,
+)
+from tests.testing_utils.files_and_dirs import temp_local_dir
+
+
+def _signature(file: Path) -> FileSignature:
+    return FileSignature.from_stat(file.stat())
+
+
+def test_checksum_is_computed_once_and_persisted(other_directory):
+    cache_path = Path(other_directory) / "checksums.json"
+    with temp_local_dir(FILE_CONTENTS) as local_path:
+        readme = local_path / "README.md"
+        compute = mock.Mock(wraps=compute_md5sum)
+
+        with ChecksumCache(cache_path) as cache:
+            first = cache.checksum(readme, compute)
+            assert cache.checksum(readme, compute) == first
+        assert compute.call_count == 1
+        assert cache_path.exists()
+
+        with ChecksumCache(cache_path) as cache:
+            assert cache.checksum(readme, compute) == first
+        assert compute.call_count == 1
+
+
+def test_modified_file_invalidates_entry(other_directory):
+    cache_path = Path(other_directory) / "checksums.json"
+    with temp_local_dir(FILE_CONTENTS) as local_path:
+        readme = local_path / "README.md"
+        with ChecksumCache(cache_path) as cache:
+            old = cache.checksum(readme, compute_md5sum)
+
+        readme.write_text("A completely different README")
+        stat = readme.stat()
+        os.utime(readme, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        with ChecksumCache(cache_path) as cache:
+            assert cache.get(readme, _signature(readme)) is None
+            assert cache.checksum(readme, compute_md5sum) != old
+
+
+def test_least_recently_used_entries_are_evicted(other_directory):
+    cache_path = Path(other_directory) / "checksums.json"
+    with temp_local_dir(FILE_CONTENTS) as local_path:
+        files = [local_path / f for f in sorted(FILE_CONTENTS)]
+        with ChecksumCache(cache_path, max_entries=2) as cache:
+            for file in files:
+                cache.checksum(file, compute_md5sum)
+            assert len(cache) == 2
+            assert cache.get(files[0], _signature(files[0])) is None
+            assert cache.get(files[2], _signature(files[2])) is not None
+
+
+def test_corrupted_cache_file_is_ignored(other_directory):
+    cache_path = Path(other_directory) / "checksums.json"
+    cache_path.write_text("{not json")
+    with temp_local_dir(FILE_CONTENTS) as local_path:
+        with ChecksumCache(cache_path) as cache:
+            assert len(cache) == 0
+            cache.checksum(local_path / "README.md", compute_md5sum)
+        with ChecksumCache(cache_path) as cache:
+            assert len(cache) == 1
+
+
+def test_cache_of_previous_version_is_ignored(other_directory):
+    cache_path = Path(other_directory) / "checksums.json"
+    with temp_local_dir(FILE_CONTENTS) as local_path:
+        readme = local_path / "README.md"
+        signature = _signature(readme)
+        cache_path.write_text(
+            json.dumps(
+                {
+                    "version": CHECKSUM_CACHE_VERSION - 1,
+                    "entries": {
+                        str(readme): [
+                            signature.size,
+                            signature.mtime_ns,
+                            signature.inode,
+                            "0" * 32,
+                        ]
+                    },
+                }
+            )
+        )
+        with ChecksumCache(cache_path) as cache:
+            assert len(cache) == 0
+
+
+def test_malformed_cache_entries_are_dropped(other_directory):
+    cache_path = Path(other_directory) / "checksums.json"
+    with temp_local_dir(FILE_CONTENTS) as local_path:
+        readme = local_path / "README.md"
+        signature = _signature(readme)
+        signature_list = [signature.size, signature.mtime_ns, signature.inode]
+        cache_path.write_text(
+            json.dumps(
+                {
+                    "version": CHECKSUM_CACHE_VERSION,
+                    "entries": {
+                        str(readme): [*signature_list, "0" * 32],
+                        str(local_path / "my.jar"): "0" * 32,
+                        str(local_path / "other"): [*signature_list, {"md5": "1"}],
+                    },
+                }
+            )
+        )
+        with ChecksumCache(cache_path) as cache:
+            assert len(cache) == 1
+            assert cache.get(readme, signature) is None
+            assert cache.checksum(readme, compute_md5sum) == compute_md5sum(readme)
+
+
+@mock.patch(f"{STAGE_MANAGER}.list_files")
+@mock.patch("snowflake.cli.plugins.object.stage.diff.compute_md5sum")
+def test_stage_diff_uses_cached_checksums(
+    mock_md5sum, mock_list, mock_cursor, other_directory
+):
+    mock_md5sum.side_effect = compute_md5sum
+    cache_path = Path(other_directory) / "checksums.json"
+
+    with temp_local_dir(FILE_CONTENTS) as local_path:
+        for _ in range(2):
+            mock_list.return_value = mock_cursor(
+                rows=stage_contents(FILE_CONTENTS), columns=STAGE_LS_COLUMNS
+            )
+            diff_result = stage_diff(
+                local_path, "a.b.c", checksum_cache=ChecksumCache(cache_path)
+            )
+            assert sorted(diff_result.identical) == sorted(FILE_CONTENTS.keys())
+
+    assert mock_md5sum.call_count == len(FILE_CONTENTS)
+
+
+def test_relative_and_absolute_paths_share_entries(other_directory, monkeypatch):
+    cache_path = Path(other_directory) / "checksums.json"
+    with temp_local_dir(FILE_CONTENTS) as local_path:
+        monkeypatch.chdir(local_path)
+        with ChecksumCache(cache_path) as cache:
+            checksum = cache.checksum(Path("README.md"), compute_md5sum)
+            readme = local_path / "README.md"
+            assert cache.get(readme, _signature(readme)) == checksum
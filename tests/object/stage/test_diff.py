@@ -1,12 +1,19 @@
 import hashlib
+import math
+import os
+import re
 from typing import Dict, Tuple
 
 from snowflake.cli.api.exceptions import SnowflakeSQLExecutionError
 from snowflake.cli.plugins.object.stage.diff import (
     DiffResult,
+    build_remove_patterns,
+    compute_md5sum,
+    compute_multipart_md5sum,
     delete_only_on_stage_files,
     enumerate_files,
     get_stage_path_from_file,
+    get_upload_chunk_sizes,
     put_files_on_stage,
     stage_diff,
     sync_local_diff_with_stage,
@@ -151,20 +158,52 @@ def test_get_stage_path_from_file():
     assert actual.sort() == expected
 
 
-@mock.patch(f"{STAGE_MANAGER}.remove")
-def test_delete_only_on_stage_files(mock_remove):
+@mock.patch(f"{STAGE_MANAGER}.use_role")
+@mock.patch(f"{STAGE_MANAGER}.remove_matching")
+def test_delete_only_on_stage_files(mock_remove, mock_use_role):
     stage_name = "some_stage_name"
     random_file = "some_file_on_stage"
 
-    delete_only_on_stage_files(StageManager(), stage_name, [random_file], "some_role")
+    delete_only_on_stage_files(
+        StageManager(), stage_name, [random_file, "ui/streamlit.py"], "some_role"
+    )
     mock_remove.assert_has_calls(
-        [mock.call(stage_name=stage_name, path=random_file, role="some_role")]
+        [
+            mock.call(
+                stage_name=stage_name,
+                pattern=r"^[^/]*/(some_file_on_stage|ui/streamlit\.py)$",
+            )
+        ]
     )
+    mock_use_role.assert_called_once_with("some_role")
+
+
+def test_build_remove_patterns_are_chunked():
+    files = [f"dir/file_{i}.txt" for i in range(10)]
+    patterns = build_remove_patterns(files, max_length=60)
+
+    assert len(patterns) > 1
+    assert all(len(pattern) <= 60 for pattern in patterns)
+    matched = [f for f in files if any(re.fullmatch(p, f"stage/{f}") for p in patterns)]
+    assert matched == files
+    assert not any(re.fullmatch(p, "stage/dir/file_1xtxt") for p in patterns)
+    assert not any(re.fullmatch(p, "stage/other/dir/file_1.txt") for p in patterns)
+
+
+def test_build_remove_patterns_do_not_match_paths_containing_a_file():
+    (pattern,) = build_remove_patterns(["a.txt", "dir/b.txt"])
+
+    assert re.search(pattern, "stage/a.txt")
+    assert re.search(pattern, "stage/dir/b.txt")
+    assert not re.search(pattern, "stage/data.txt")
+    assert not re.search(pattern, "stage/a.txt.bak")
+    assert not re.search(pattern, "stage/other/dir/b.txt")
 
 
+@mock.patch(f"{STAGE_MANAGER}.use_role")
 @mock.patch(f"{STAGE_MANAGER}.put")
 @pytest.mark.parametrize("overwrite_param", [True, False])
-def test_put_files_on_stage(mock_put, overwrite_param):
+def test_put_files_on_stage(mock_put, mock_use_role, overwrite_param):
     stage_name = "some_stage_name"
     with temp_local_dir(
         {
@@ -184,21 +223,102 @@ def test_put_files_on_stage(mock_put, overwrite_param):
             mock.call(
                 local_path=local_path / "ui/nested/environment.yml",
                 stage_path=f"{stage_name}/ui/nested",  # TODO: verify if trailing slash is needed, doesnt seem so from regression tests
-                role="some_role",
                 overwrite=overwrite_param,
+                parallel=4,
             ),
             mock.call(
                 local_path=local_path / "README.md",
                 stage_path=f"{stage_name}",
-                role="some_role",
                 overwrite=overwrite_param,
+                parallel=4,
             ),
         ]
-        assert mock_put.mock_calls == expected
+        assert mock_put.call_args_list == expected
+        mock_use_role.assert_called_once_with("some_role")
 
 
-@mock.patch(f"{STAGE_MANAGER}.remove")
-def test_sync_local_diff_with_stage(mock_remove, other_directory):
+@mock.patch(f"{STAGE_MANAGER}.put")
+def test_put_files_on_stage_uploads_whole_directory_with_wildcard(mock_put):
+    stage_name = "some_stage_name"
+    with temp_local_dir(
+        {
+            "ui/a.py": "# a\n",
+            "ui/b.py": "# b\n",
+            "ui/nested/c.py": "# c\n",
+        }
+    ) as local_path:
+        put_files_on_stage(
+            stage_manager=StageManager(),
+            stage_fqn=stage_name,
+            deploy_root_path=local_path,
+            files=["ui/a.py", "ui/b.py"],
+        )
+        mock_put.assert_called_once_with(
+            local_path=f"{local_path / 'ui'}/*",
+            stage_path=f"{stage_name}/ui",
+            overwrite=False,
+            parallel=4,
+        )
+
+
+@mock.patch(f"{STAGE_MANAGER}.put")
+def test_put_files_on_stage_mirrors_subset_of_directory(mock_put):
+    stage_name = "some_stage_name"
+    uploaded: Dict[str, str] = {}
+
+    def _collect_mirrored_files(local_path, **kwargs):
+        mirror_dir = Path(local_path[: -len("/*")])
+        uploaded.update({f.name: f.read_text() for f in mirror_dir.iterdir()})
+        return mock.DEFAULT
+
+    mock_put.side_effect = _collect_mirrored_files
+    with temp_local_dir(
+        {
+            "ui/a.py": "# a\n",
+            "ui/b.py": "# b\n",
+            "ui/c.py": "# c\n",
+        }
+    ) as local_path:
+        put_files_on_stage(
+            stage_manager=StageManager(),
+            stage_fqn=stage_name,
+            deploy_root_path=local_path,
+            files=["ui/a.py", "ui/c.py"],
+            parallel=8,
+        )
+
+    assert mock_put.call_count == 1
+    assert mock_put.call_args.kwargs["stage_path"] == f"{stage_name}/ui"
+    assert mock_put.call_args.kwargs["parallel"] == 8
+    assert uploaded == {"a.py": "# a\n", "c.py": "# c\n"}
+
+
+@mock.patch(f"{STAGE_MANAGER}.put")
+def test_put_files_on_stage_uploads_hidden_files_separately(mock_put):
+    stage_name = "some_stage_name"
+    with temp_local_dir(
+        {
+            "ui/.env": "KEY=value\n",
+            "ui/a.py": "# a\n",
+            "ui/b.py": "# b\n",
+        }
+    ) as local_path:
+        put_files_on_stage(
+            stage_manager=StageManager(),
+            stage_fqn=stage_name,
+            deploy_root_path=local_path,
+            files=["ui/.env", "ui/a.py", "ui/b.py"],
+        )
+        uploaded = {call.kwargs["local_path"] for call in mock_put.call_args_list}
+        assert uploaded == {f"{local_path / 'ui'}/*", local_path / "ui" / ".env"}
+        assert {call.kwargs["stage_path"] for call in mock_put.call_args_list} == {
+            f"{stage_name}/ui"
+        }
+
+
+@mock.patch(f"{STAGE_MANAGER}.use_role")
+@mock.patch(f"{STAGE_MANAGER}.remove_matching")
+def test_sync_local_diff_with_stage(mock_remove, mock_use_role, other_directory):
     temp_dir = Path(other_directory)
     mock_remove.side_effect = Exception("Mock Exception")
     mock_remove.return_value = None
@@ -213,3 +333,140 @@ def test_sync_local_diff_with_stage(mock_remove, other_directory):
             diff_result=diff,
             stage_path=stage_name,
         )
+
+
+@mock.patch(f"{STAGE_MANAGER}.list_files")
+@pytest.mark.parametrize("hash_workers", [1, 3])
+def test_modified_files_with_hash_workers(mock_list, mock_cursor, hash_workers):
+    mock_list.return_value = mock_cursor(
+        rows=stage_contents(FILE_CONTENTS),
+        columns=STAGE_LS_COLUMNS,
+    )
+
+    with temp_local_dir(
+        {
+            **FILE_CONTENTS,
+            "README.md": "This is a modification to the existing README",
+            "ui/streamlit.py": "# this is a modified streamlit\n",
+        }
+    ) as local_path:
+        diff_result = stage_diff(local_path, "a.b.c", hash_workers=hash_workers)
+        assert len(diff_result.only_on_stage) == 0
+        assert diff_result.different == ["README.md", "ui/streamlit.py"]
+        assert diff_result.identical == ["my.jar"]
+        assert len(diff_result.only_local) == 0
+
+
+def multipart_md5_of(contents: bytes, chunk_size: int) -> str:
+    chunks = [contents[i : i + chunk_size] for i in range(0, len(contents), chunk_size)]
+    digests = b"".join(hashlib.md5(chunk).digest() for chunk in chunks)
+    return f"{hashlib.md5(digests).hexdigest()}-{len(chunks)}"
+
+
+def test_compute_multipart_md5sum():
+    contents = b"0123456789abcdefghij"
+    with temp_local_dir({"file.bin": contents}) as local_path:
+        assert compute_multipart_md5sum(
+            local_path / "file.bin", chunk_size=8
+        ) == multipart_md5_of(contents, 8)
+
+
+def test_get_upload_chunk_sizes():
+    assert get_upload_chunk_sizes(100 * 1024**2) == [8 * 1024**2, 4 * 1024**2]
+    # S3 allows at most 10000 parts, so the connector uses larger chunks
+    assert get_upload_chunk_sizes(100 * 1024**3)[0] == math.ceil(
+        100 * 1024**3 / 10000
+    )
+
+
+@mock.patch(f"{STAGE_MANAGER}.list_files")
+@mock.patch("snowflake.cli.plugins.object.stage.diff.get_upload_chunk_sizes")
+def test_multipart_uploaded_files(mock_chunk_sizes, mock_list, mock_cursor):
+    mock_chunk_sizes.return_value = [10, 4]
+    unchanged = b"I was uploaded in multiple parts"
+    modified = b"I was uploaded in multiple parts too"
+    mock_list.return_value = mock_cursor(
+        rows=[
+            ("stage/unchanged.bin", len(unchanged), multipart_md5_of(unchanged, 4), ""),
+            ("stage/modified.bin", len(modified), multipart_md5_of(unchanged, 4), ""),
+        ],
+        columns=STAGE_LS_COLUMNS,
+    )
+
+    with temp_local_dir(
+        {"unchanged.bin": unchanged, "modified.bin": modified}
+    ) as local_path:
+        diff_result = stage_diff(local_path, "a.b.c")
+        assert diff_result.identical == ["unchanged.bin"]
+        assert diff_result.different == ["modified.bin"]
+
+
+@mock.patch(f"{STAGE_MANAGER}.list_files")
+@mock.patch("snowflake.cli.plugins.object.stage.diff.compute_md5sum")
+def test_files_with_different_size_are_not_hashed(mock_md5sum, mock_list, mock_cursor):
+    mock_md5sum.side_effect = compute_md5sum
+    mock_list.return_value = mock_cursor(
+        rows=stage_contents(FILE_CONTENTS),
+        columns=STAGE_LS_COLUMNS,
+    )
+
+    with temp_local_dir(
+        {
+            **FILE_CONTENTS,
+            "README.md": "This is a modification to the existing README",
+            "ui/streamlit.py": "# this is a STREAMLIT\n",
+        }
+    ) as local_path:
+        diff_result = stage_diff(local_path, "a.b.c")
+        assert diff_result.different == ["README.md", "ui/streamlit.py"]
+        assert diff_result.identical == ["my.jar"]
+
+    # only the files of matching size need to be hashed
+    hashed = sorted(call.args[0].name for call in mock_md5sum.mock_calls)
+    assert hashed == ["my.jar", "streamlit.py"]
+
+
+def test_enumerate_files_skips_ignored_files_and_directories():
+    with temp_local_dir(
+        {
+            **FILE_CONTENTS,
+            "ui/streamlit.pyc": b"compiled",
+            "node_modules/lib/index.js": "// a lot of files\n",
+            "ui/node_modules": "# a file, not a directory\n",
+            "ui/build/out.txt": "out\n",
+            "build/out.txt": "out\n",
+        }
+    ) as local_path:
+        local_files = enumerate_files(
+            local_path, ignore_patterns=["*.pyc", "node_modules/", "/build"]
+        )
+        relpaths = sorted(
+            str(f.relative_to(local_path)).replace(os.sep, "/") for f in local_files
+        )
+    assert relpaths == [
+        "README.md",
+        "my.jar",
+        "ui/build/out.txt",
+        "ui/node_modules",
+        "ui/streamlit.py",
+    ]
+
+
+@mock.patch(f"{STAGE_MANAGER}.list_files")
+def test_ignored_files_are_not_diffed(mock_list, mock_cursor):
+    mock_list.return_value = mock_cursor(
+        rows=stage_contents(FILE_CONTENTS),
+        columns=STAGE_LS_COLUMNS,
+    )
+
+    with temp_local_dir(
+        {
+            **FILE_CONTENTS,
+            ".snowignore": "# local artifacts\n.snowignore\n*.log\n\ntmp/\n",
+            "debug.log": "some logs\n",
+            "tmp/scratch.txt": "scratch\n",
+        }
+    ) as local_path:
+        diff_result = stage_diff(local_path, "a.b.c")
+        assert sorted(diff_result.identical) == sorted(FILE_CONTENTS.keys())
+        assert len(diff_result.only_local) == 0
@@ -0,0 +1,86 @@
+import gzip
+from pathlib import Path
+
+import pytest
+from click import ClickException
+from snowflake.cli.plugins.object.stage.load import (
+    PARQUET_COPY_OPTIONS,
+    default_copy_options,
+    default_file_format,
+    plan_chunks,
+    prepare_chunks,
+)
+
+
+def _write_csv(path: Path, rows: int) -> bytes:
+    content = b"id,name\n" + b"".join(b"%d,name_%d\n" % (i, i) for i in range(rows))
+    path.write_bytes(content)
+    return content
+
+
+def test_plan_chunks_ends_at_line_breaks(tmp_path):
+    source = tmp_path / "data.csv"
+    content = _write_csv(source, 100)
+
+    chunks = plan_chunks(source, tmp_path, raw_chunk_size=100, header_lines=1)
+
+    assert len(chunks) > 1
+    assert chunks[0].start == len(b"id,name\n")
+    assert chunks[-1].end == len(content)
+    for previous, following in zip(chunks, chunks[1:]):
+        assert previous.end == following.start
+        assert content[previous.end - 1 : previous.end] == b"\n"
+    assert [c.destination.name for c in chunks[:2]] == [
+        "data_0.csv.gz",
+        "data_1.csv.gz",
+    ]
+
+
+def test_plan_chunks_without_size_is_single_chunk(tmp_path):
+    source = tmp_path / "data.csv"
+    content = _write_csv(source, 10)
+
+    chunks = plan_chunks(source, tmp_path, raw_chunk_size=None)
+
+    assert [(c.start, c.end) for c in chunks] == [(0, len(content))]
+
+
+def test_prepare_chunks_repeats_header(tmp_path):
+    source_dir = tmp_path / "source"
+    target_dir = tmp_path / "target"
+    source_dir.mkdir()
+    target_dir.mkdir()
+    content = _write_csv(source_dir / "data.csv", 2000)
+    (source_dir / "data.parquet").write_bytes(b"PAR1")
+
+    chunks = prepare_chunks(
+        [source_dir / "data.csv", source_dir / "data.parquet"],
+        target_dir,
+        chunk_size_bytes=1024,
+        header_lines=1,
+        workers=3,
+    )
+
+    assert chunks[0].name == "1_data.parquet"
+    assert chunks[0].read_bytes() == b"PAR1"
+    csv_chunks = [gzip.decompress(chunk.read_bytes()) for chunk in chunks[1:]]
+    assert len(csv_chunks) > 1
+    assert all(chunk.startswith(b"id,name\n") for chunk in csv_chunks)
+    assert b"id,name\n" + b"".join(c[len(b"id,name\n") :] for c in csv_chunks) == (
+        content
+    )
+
+
+def test_default_file_format():
+    assert default_file_format([Path("a.csv"), Path("b.CSV")]) == "TYPE = CSV"
+    assert (
+        default_file_format([Path("a.csv")], header_lines=1)
+        == "TYPE = CSV SKIP_HEADER = 1"
+    )
+    assert default_file_format([Path("a.parquet")]) == "TYPE = PARQUET"
+    assert default_copy_options([Path("a.parquet")]) == PARQUET_COPY_OPTIONS
+    assert default_copy_options([Path("a.csv")]) is None
+    with pytest.raises(ClickException):
+        default_file_format([Path("a.csv"), Path("b.parquet")])
+    with pytest.raises(ClickException):
+        default_file_format([Path("a.txt")])
@@ -0,0 +1,261 @@
+import json
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from snowflake.cli.api.exceptions import SnowflakeSQLExecutionError
+from snowflake.cli.plugins.object.stage.diff import (
+    DiffResult,
+    build_stage_manifest,
+    compute_md5sum,
+    stage_diff,
+    sync_local_diff_with_stage,
+)
+from snowflake.cli.plugins.object.stage.manifest import (
+    MANIFEST_STAGE_PATH,
+    MANIFEST_VERSION,
+    StageFileInfo,
+    StageManifest,
+    manifest_file_name,
+)
+
+from tests.object.stage.test_diff import (
+    FILE_CONTENTS,
+    STAGE_LS_COLUMNS,
+    STAGE_MANAGER,
+    md5_of,
+    stage_contents,
+)
+from tests.testing_utils.files_and_dirs import temp_local_dir
+from tests.testing_utils.fixtures import *
+
+
+def _manifest_for(contents, stage_fqn="a.b.c") -> StageManifest:
+    return StageManifest(
+        stage_fqn=stage_fqn,
+        files={
+            path: StageFileInfo(size=len(data), md5=md5_of(data))
+            for path, data in contents.items()
+        },
+        stage_fingerprint="fingerprint",
+    )
+
+
+def _serve_manifest(content: str):
+    def _get(stage_name, dest_path, parallel=4):
+        assert stage_name == f"{MANIFEST_STAGE_PATH}/a.b.c.json"
+        (Path(dest_path) / "a.b.c.json").write_text(content)
+
+    return _get
+
+
+def test_manifest_round_trip():
+    manifest = _manifest_for(FILE_CONTENTS)
+    assert StageManifest.from_json(manifest.to_json(), "A.B.C") == StageManifest(
+        stage_fqn="A.B.C", files=manifest.files, stage_fingerprint="fingerprint"
+    )
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "{not json",
+        {"version": MANIFEST_VERSION + 1},
+        {"stage": "x.y.z"},
+        {"files": {"f": [1, 2]}},
+        {"fingerprint": None},
+    ],
+)
+def test_inconsistent_manifest_is_rejected(content):
+    if isinstance(content, dict):
+        content = json.dumps(
+            {
+                "version": MANIFEST_VERSION,
+                "stage": "a.b.c",
+                "fingerprint": "fingerprint",
+                "files": {},
+                **content,
+            }
+        )
+    assert StageManifest.from_json(content, "a.b.c") is None
+
+
+@pytest.mark.parametrize(
+    "stage_fqn, file_name",
+    [
+        ("db.schema.stage", "db.schema.stage.json"),
+        ('DB."My Schema".STAGE', "db._my_schema_.stage.json"),
+    ],
+)
+def test_manifest_file_name(stage_fqn, file_name):
+    assert manifest_file_name(stage_fqn) == file_name
+
+
+@mock.patch(f"{STAGE_MANAGER}.fingerprint_listed_files", return_value="fingerprint")
+@mock.patch(f"{STAGE_MANAGER}.list_files")
+@mock.patch(f"{STAGE_MANAGER}.get")
+def test_stage_diff_reads_manifest_instead_of_listing(
+    mock_get, mock_list, mock_fingerprint
+):
+    mock_get.side_effect = _serve_manifest(_manifest_for(FILE_CONTENTS).to_json())
+
+    with temp_local_dir(
+        {**FILE_CONTENTS, "README.md": "This is a modification to the README"}
+    ) as local_path:
+        diff_result = stage_diff(local_path, "a.b.c", use_manifest=True)
+
+    mock_fingerprint.assert_called_once_with(mock_list.return_value)
+    mock_list.return_value.fetchall.assert_not_called()
+    assert diff_result.from_manifest
+    assert diff_result.different == ["README.md"]
+    assert diff_result.identical == ["my.jar", "ui/streamlit.py"]
+
+
+@mock.patch(f"{STAGE_MANAGER}.list_files")
+@mock.patch(f"{STAGE_MANAGER}.get")
+@pytest.mark.parametrize("manifest_content", [None, "{not json"])
+def test_stage_diff_falls_back_to_listing(
+    mock_get, mock_list, manifest_content, mock_cursor
+):
+    if manifest_content is not None:
+        mock_get.side_effect = _serve_manifest(manifest_content)
+    mock_list.return_value = mock_cursor(
+        rows=stage_contents(FILE_CONTENTS), columns=STAGE_LS_COLUMNS
+    )
+
+    with temp_local_dir(FILE_CONTENTS) as local_path:
+        diff_result = stage_diff(local_path, "a.b.c", use_manifest=True)
+
+    mock_list.assert_called_once_with("a.b.c")
+    assert not diff_result.from_manifest
+    assert diff_result.identical == sorted(FILE_CONTENTS)
+    assert set(diff_result.identical_stage_files) == set(FILE_CONTENTS)
+
+
+@mock.patch(f"{STAGE_MANAGER}.fingerprint_listed_files", return_value="changed")
+@mock.patch(f"{STAGE_MANAGER}.list_files")
+@mock.patch(f"{STAGE_MANAGER}.get")
+def test_stage_diff_ignores_manifest_of_changed_stage(
+    mock_get, mock_list, mock_fingerprint, mock_cursor
+):
+    mock_get.side_effect = _serve_manifest(_manifest_for(FILE_CONTENTS).to_json())
+    mock_list.return_value = mock_cursor(
+        rows=stage_contents({"README.md": FILE_CONTENTS["README.md"]}),
+        columns=STAGE_LS_COLUMNS,
+    )
+
+    with temp_local_dir(FILE_CONTENTS) as local_path:
+        diff_result = stage_diff(local_path, "a.b.c", use_manifest=True)
+
+    mock_fingerprint.assert_called_once()
+    assert not diff_result.from_manifest
+    assert diff_result.identical == ["README.md"]
+    assert diff_result.only_local == ["my.jar", "ui/streamlit.py"]
+
+
+def test_build_stage_manifest(other_directory):
+    identical_info = StageFileInfo(size=17, md5=md5_of(FILE_CONTENTS["README.md"]))
+    diff_result = DiffResult(
+        identical=["README.md"],
+        identical_stage_files={"README.md": identical_info},
+        different=["ui/streamlit.py"],
+        only_local=["my.jar"],
+        only_on_stage=["old.txt"],
+        local_md5sums={"ui/streamlit.py": "computed-by-diff"},
+    )
+
+    with temp_local_dir(FILE_CONTENTS) as local_path:
+        expected_md5 = compute_md5sum(local_path / "my.jar")
+        with mock.patch(
+            "snowflake.cli.plugins.object.stage.diff.compute_md5sum",
+            side_effect=compute_md5sum,
+        ) as mock_compute:
+            manifest = build_stage_manifest("a.b.c", local_path, diff_result)
+
+    assert sorted(manifest.files) == ["README.md", "my.jar", "ui/streamlit.py"]
+    assert manifest.files["README.md"] == identical_info
+    assert manifest.files["my.jar"].md5 == expected_md5
+    assert manifest.files["my.jar"].size == len(FILE_CONTENTS["my.jar"])
+    assert manifest.files["my.jar"].last_modified is not None
+    assert manifest.files["ui/streamlit.py"].md5 == "computed-by-diff"
+    mock_compute.assert_called_once_with(local_path / "my.jar")
+
+
+@mock.patch(f"{STAGE_MANAGER}.list_files")
+def test_stage_diff_keeps_md5sums_of_different_files(mock_list, mock_cursor):
+    readme = FILE_CONTENTS["README.md"]
+    mock_list.return_value = mock_cursor(
+        rows=stage_contents({"README.md": "x" * len(readme)}),
+        columns=STAGE_LS_COLUMNS,
+    )
+
+    with temp_local_dir({"README.md": readme}) as local_path:
+        diff_result = stage_diff(local_path, "a.b.c")
+
+    assert diff_result.different == ["README.md"]
+    assert diff_result.local_md5sums == {"README.md": md5_of(readme)}
+
+
+@mock.patch(f"{STAGE_MANAGER}.fingerprint_listed_files", return_value="fingerprint")
+@mock.patch(f"{STAGE_MANAGER}.list_files")
+@mock.patch(f"{STAGE_MANAGER}.remove_matching")
+@mock.patch(f"{STAGE_MANAGER}.remove")
+@mock.patch(f"{STAGE_MANAGER}.put")
+def test_sync_replaces_manifest(
+    mock_put, mock_remove, mock_remove_matching, mock_list, mock_fingerprint
+):
+    uploaded_manifests = []
+
+    def _put(local_path, stage_path, **kwargs):
+        if stage_path == MANIFEST_STAGE_PATH:
+            assert Path(local_path).name == "a.b.c.json"
+            uploaded_manifests.append(Path(local_path).read_text())
+        return mock.DEFAULT
+
+    mock_put.side_effect = _put
+    diff_result = DiffResult(only_local=["README.md"], only_on_stage=["old.txt"])
+
+    with temp_local_dir(FILE_CONTENTS) as local_path:
+        sync_local_diff_with_stage(
+            role=None,
+            deploy_root_path=local_path,
+            diff_result=diff_result,
+            stage_path="a.b.c",
+            update_manifest=True,
+        )
+
+    mock_remove.assert_called_once_with(
+        stage_name=MANIFEST_STAGE_PATH, path="a.b.c.json"
+    )
+    mock_remove_matching.assert_called_once()
+    assert len(uploaded_manifests) == 1
+    manifest = StageManifest.from_json(uploaded_manifests[0], "a.b.c")
+    assert list(manifest.files) == ["README.md"]
+    assert manifest.stage_fingerprint == "fingerprint"
+    mock_list.assert_called_once_with("a.b.c")
+    mock_fingerprint.assert_called_once_with(mock_list.return_value)
+    assert mock_put.call_args.kwargs["overwrite"] is True
+
+
+@mock.patch(f"{STAGE_MANAGER}.remove_matching")
+@mock.patch(f"{STAGE_MANAGER}.remove")
+@mock.patch(f"{STAGE_MANAGER}.put")
+def test_sync_fails_cleanly_if_manifest_cannot_be_built(
+    mock_put, mock_remove, mock_remove_matching
+):
+    # the file was removed locally after the diff
+    diff_result = DiffResult(only_local=["missing.txt"], only_on_stage=["old.txt"])
+
+    with temp_local_dir(FILE_CONTENTS) as local_path:
+        with pytest.raises(SnowflakeSQLExecutionError):
+            sync_local_diff_with_stage(
+                role=None,
+                deploy_root_path=local_path,
+                diff_result=diff_result,
+                stage_path="a.b.c",
+                update_manifest=True,
+            )
+
+    mock_remove.assert_not_called()
+    mock_remove_matching.assert_not_called()
+    mock_put.assert_not_called()
@@ -1,9 +1,16 @@
+import gzip
+import re
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from unittest import mock
 
 import pytest
-from snowflake.cli.plugins.object.stage.manager import StageManager
+from snowflake.cli.plugins.object.stage.manager import (
+    PutRequest,
+    StageManager,
+    StageSessionPool,
+    split_files_by_size,
+)
 from snowflake.connector.cursor import DictCursor
 
 STAGE_MANAGER = "snowflake.cli.plugins.object.stage.manager.StageManager"
@@ -364,6 +371,20 @@ def test_stage_internal_remove_no_role_change(mock_execute, mock_cursor):
     assert mock_execute.mock_calls == expected
 
 
+@mock.patch(f"{STAGE_MANAGER}._execute_query")
+def test_stage_internal_remove_matching(mock_execute, mock_cursor):
+    mock_execute.return_value = mock_cursor([{"CURRENT_ROLE()": "old_role"}], [])
+    sm = StageManager()
+    sm.remove_matching("stageName", r"^[^/]*/(my/file/foo\.csv|bar\.txt)$", "new_role")
+    expected = [
+        mock.call("select current_role()", cursor_class=DictCursor),
+        mock.call("use role new_role"),
+        mock.call(r"remove @stageName pattern='^[^/]*/(my/file/foo\\.csv|bar\\.txt)$'"),
+        mock.call("use role old_role"),
+    ]
+    assert mock_execute.mock_calls == expected
+
+
 @mock.patch(f"{STAGE_MANAGER}._execute_query")
 def test_stage_internal_put(mock_execute, mock_cursor):
     mock_execute.return_value = mock_cursor([{"CURRENT_ROLE()": "old_role"}], [])
@@ -433,3 +454,280 @@ def test_stage_internal_put_quoted_path(
             mock.call("use role old_role"),
         ]
         assert mock_execute.mock_calls == expected
+
+
+PUT_COLUMNS = ["source", "target", "source_size", "status"]
+
+
+@mock.patch(
+    "snowflake.cli.api.cli_global_context._CliGlobalContextAccess.new_connection"
+)
+@mock.patch(f"{STAGE_MANAGER}._execute_query")
+def test_stage_copy_local_to_remote_with_upload_sessions(
+    mock_execute, mock_new_connection, runner, mock_cursor
+):
+    mock_execute.side_effect = lambda query: mock_cursor(
+        [("f", "f", 100, "UPLOADED")], PUT_COLUMNS
+    )
+    with TemporaryDirectory() as tmp_dir:
+        for name, size in [
+            ("a.txt", 300),
+            ("b.txt", 200),
+            ("c.txt", 150),
+            (".env", 10),
+        ]:
+            (Path(tmp_dir) / name).write_text("x" * size)
+        result = runner.invoke(
+            [
+                "object",
+                "stage",
+                "copy",
+                "-c",
+                "empty",
+                "--upload-sessions",
+                "2",
+                str(tmp_dir),
+                "@stageName",
+            ]
+        )
+
+    assert result.exit_code == 0, result.output
+    assert "Uploaded 3 files" in result.output
+    mock_new_connection.assert_called_once()
+    mock_new_connection.return_value.close.assert_called_once()
+    queries = sorted(c.args[0] for c in mock_execute.mock_calls)
+    assert len(queries) == 3
+    assert (
+        f"put file://{Path(tmp_dir).resolve()}/.env @stageName auto_compress=false parallel=4 overwrite=False"
+        in queries
+    )
+    assert (
+        f"put file://{Path(tmp_dir).resolve()}/a.txt @stageName auto_compress=false parallel=4 overwrite=False"
+        in queries
+    )
+    assert any(
+        q.endswith("/* @stageName auto_compress=false parallel=4 overwrite=False")
+        for q in queries
+    )
+
+
+def test_split_files_by_size(temp_dir):
+    files = []
+    for name, size in [("a", 50), ("b", 40), ("c", 30), ("d", 20), ("e", 5)]:
+        path = Path(temp_dir) / name
+        path.write_text("x" * size)
+        files.append(path)
+
+    batches = split_files_by_size(files, 2)
+
+    assert [[f.name for f in batch] for batch in batches] == [
+        ["a", "d", "e"],
+        ["b", "c"],
+    ]
+    assert split_files_by_size(files[:1], 3) == [files[:1]]
+    assert split_files_by_size([], 3) == []
+
+
+@mock.patch(
+    "snowflake.cli.api.cli_global_context._CliGlobalContextAccess.new_connection"
+)
+@mock.patch(f"{STAGE_MANAGER}.use_role")
+def test_stage_session_pool(mock_use_role, mock_new_connection, mock_cursor):
+    connections = [mock.Mock(), mock.Mock()]
+    mock_new_connection.side_effect = connections
+
+    def _put(self, local_path, **kwargs):
+        return mock_cursor([(local_path, local_path, 10, "UPLOADED")], PUT_COLUMNS)
+
+    requests = [PutRequest(f"file_{i}", "@stage") for i in range(6)]
+    with mock.patch.object(StageManager, "put", autospec=True, side_effect=_put):
+        with StageSessionPool(sessions=3, role="some_role") as pool:
+            rows = pool.put(requests)
+
+    assert [row["source"] for row in rows] == [f"file_{i}" for i in range(6)]
+    assert pool.summary.files == 6
+    assert pool.summary.size_bytes == 60
+    assert mock_new_connection.call_count == 2
+    assert all(c.close.call_count == 1 for c in connections)
+    assert mock_use_role.mock_calls.count(mock.call("some_role")) == 3
+
+
+@mock.patch(f"{STAGE_MANAGER}._execute_query")
+def test_stage_copy_local_to_remote_recursively(mock_execute, runner, mock_cursor):
+    mock_execute.side_effect = lambda query: mock_cursor(
+        [("f.txt", "f.txt", 1, "UPLOADED")], PUT_COLUMNS
+    )
+    with TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir).resolve()
+        for file in ["a.txt", "b.txt", "dir/.env", "dir/c.txt", "dir/nested/d.txt"]:
+            (root / file).parent.mkdir(parents=True, exist_ok=True)
+            (root / file).write_text(file)
+        result = runner.invoke(
+            [
+                "object",
+                "stage",
+                "copy",
+                "-c",
+                "empty",
+                "--recursive",
+                str(root),
+                "@stageName/prefix/",
+            ]
+        )
+
+    assert result.exit_code == 0, result.output
+    assert [c.args[0] for c in mock_execute.mock_calls] == [
+        f"put file://{root}/* @stageName/prefix auto_compress=false parallel=4 overwrite=False",
+        f"put file://{root}/dir/c.txt @stageName/prefix/dir auto_compress=false parallel=4 overwrite=False",
+        f"put file://{root}/dir/.env @stageName/prefix/dir auto_compress=false parallel=4 overwrite=False",
+        f"put file://{root}/dir/nested/d.txt @stageName/prefix/dir/nested auto_compress=false parallel=4 overwrite=False",
+    ]
+    assert "Uploaded 1 file(s) to @stageName/prefix/dir/nested" in result.output
+    assert "dir/nested/f.txt" in result.output
+
+
+def test_stage_copy_remote_to_local_recursively_is_not_supported(runner):
+    result = runner.invoke(
+        ["object", "stage", "copy", "-c", "empty", "-r", "@stageName", "local/path"]
+    )
+    assert result.exit_code == 2
+    assert "--recursive is only supported when uploading" in result.output
+
+
+@mock.patch(f"{STAGE_MANAGER}._execute_query")
+def test_stage_load(mock_execute, runner, mock_cursor, tmp_path):
+    mock_execute.side_effect = lambda query: mock_cursor(
+        [("f", "f", 100, "UPLOADED")], PUT_COLUMNS
+    )
+    source = tmp_path / "data.csv"
+    source.write_text("id\n" + "".join(f"{i}\n" for i in range(10)))
+
+    with mock.patch(
+        "snowflake.cli.plugins.object.stage.commands.load_directory_name",
+        return_value="snow_load_1",
+    ):
+        result = runner.invoke(
+            [
+                "object",
+                "stage",
+                "load",
+                "-c",
+                "empty",
+                "--header-lines",
+                "1",
+                "--purge",
+                "stageName",
+                "my_table",
+                str(source),
+            ]
+        )
+
+    assert result.exit_code == 0, result.output
+    put_query, copy_query = [c.args[0] for c in mock_execute.mock_calls]
+    assert put_query.startswith("put file://")
+    assert put_query.endswith(
+        "/0_data_0.csv.gz @stageName/snow_load_1 auto_compress=false parallel=4 overwrite=False"
+    )
+    assert copy_query == (
+        "copy into my_table from @stageName/snow_load_1 "
+        "file_format = (TYPE = CSV SKIP_HEADER = 1) purge = True"
+    )
+    assert "Prepared 1 chunk(s)" in result.output
+    assert "Uploaded 1 files" in result.output
+    assert "Loaded 1 file(s)" in result.output
+
+
+@pytest.mark.parametrize(
+    "flags, expected_files",
+    [
+        ([], ["data_0_0_0.csv.gz", "data_0_0_1.csv.gz"]),
+        (["--decompress"], ["data_0_0_0.csv", "data_0_0_1.csv"]),
+        (["--decompress", "--concatenate", "--header"], ["my_table.csv"]),
+    ],
+)
+@mock.patch(f"{STAGE_MANAGER}._execute_query")
+def test_stage_unload(
+    mock_execute, runner, mock_cursor, tmp_path, flags, expected_files
+):
+    def _execute(query):
+        if query.startswith("copy into"):
+            return mock_cursor(
+                [(4, 20, 20)], ["rows_unloaded", "input_bytes", "output_bytes"]
+            )
+        if query.startswith("get"):
+            download_dir = Path(re.search(r"file://(\S+)/ ", query).group(1))
+            rows = []
+            for index in range(2):
+                name = f"data_0_0_{index}.csv.gz"
+                (download_dir / name).write_bytes(gzip.compress(b"id\n%d\n" % index))
+                rows.append((name, 10, "DOWNLOADED", ""))
+            return mock_cursor(rows, ["file", "size", "status", "message"])
+        return mock_cursor([], [])
+
+    mock_execute.side_effect = _execute
+    destination = tmp_path / "export"
+
+    with mock.patch(
+        "snowflake.cli.plugins.object.stage.commands.unload_directory_name",
+        return_value="snow_unload_1",
+    ):
+        result = runner.invoke(
+            [
+                "object",
+                "stage",
+                "unload",
+                "-c",
+                "empty",
+                "--purge",
+                *flags,
+                "stageName",
+                "my_table",
+                str(destination),
+            ]
+        )
+
+    assert result.exit_code == 0, result.output
+    queries = [c.args[0] for c in mock_execute.mock_calls]
+    header = " header = true" if "--header" in flags else ""
+    assert queries[0] == (
+        "copy into @stageName/snow_unload_1/ from my_table "
+        f"file_format = (TYPE = CSV COMPRESSION = GZIP) max_file_size = 104857600{header}"
+    )
+    assert queries[1].startswith("get @stageName/snow_unload_1/ file://")
+    assert queries[2] == "remove @stageName/snow_unload_1/"
+    assert sorted(p.name for p in destination.iterdir()) == expected_files
+    assert "Unloaded 4 rows" in result.output
+    assert "Downloaded 2 files" in result.output
+    if "--concatenate" in flags:
+        assert (destination / "my_table.csv").read_text() == "id\n0\n1\n"
+
+
+def test_stage_unload_cannot_concatenate_parquet(runner, tmp_path):
+    result = runner.invoke(
+        [
+            "object",
+            "stage",
+            "unload",
+            "--concatenate",
+            "--file-format",
+            "TYPE = PARQUET",
+            "stageName",
+            "my_table",
+            str(tmp_path),
+        ]
+    )
+    assert result.exit_code == 2
+    assert "Parquet files cannot be concatenated." in result.output
+
+
+@mock.patch(f"{STAGE_MANAGER}._execute_query")
+def test_fingerprint_listed_files(mock_execute, mock_cursor):
+    list_files_cursor = mock_cursor([], [])
+    list_files_cursor._sfqid = "ls-query-id"  # noqa: SLF001
+    mock_execute.return_value = mock_cursor([(-42,)], ["HASH"])
+
+    assert StageManager().fingerprint_listed_files(list_files_cursor) == "-42"
+    mock_execute.assert_called_once_with(
+        'select hash_agg("name", "size", "md5", "last_modified") '
+        "from table(result_scan('ls-query-id'))"
+    )
@@ -0,0 +1,61 @@
+import gzip
+from pathlib import Path
+
+from snowflake.cli.plugins.object.stage.unload import (
+    concatenate_files,
+    concatenated_file_name,
+    decompress_files,
+)
+
+
+def _write_parts(directory: Path):
+    parts = []
+    for index in range(3):
+        part = directory / f"data_0_0_{index}.csv.gz"
+        part.write_bytes(gzip.compress(f"id\n{index}\n".encode()))
+        parts.append(part)
+    return parts
+
+
+def test_decompress_files(tmp_path):
+    parts = _write_parts(tmp_path) + [tmp_path / "data.parquet"]
+    parts[-1].write_bytes(b"PAR1")
+
+    decompressed = decompress_files(parts, workers=2)
+
+    assert [p.name for p in decompressed] == [
+        "data_0_0_0.csv",
+        "data_0_0_1.csv",
+        "data_0_0_2.csv",
+        "data.parquet",
+    ]
+    assert decompressed[1].read_text() == "id\n1\n"
+    assert not any(part.exists() for part in parts[:3])
+
+
+def test_concatenate_files_skips_repeated_headers(tmp_path):
+    parts = _write_parts(tmp_path)
+
+    result = concatenate_files(
+        parts, tmp_path / "table.csv", decompress=True, header_lines=1
+    )
+
+    assert result.read_text() == "id\n0\n1\n2\n"
+
+
+def test_concatenate_files_keeps_gzip_members(tmp_path):
+    parts = _write_parts(tmp_path)
+
+    result = concatenate_files(parts, tmp_path / "table.csv.gz", decompress=False)
+
+    assert gzip.decompress(result.read_bytes()) == b"id\n0\nid\n1\nid\n2\n"
+
+
+def test_concatenated_file_name():
+    part = Path("data_0_0_0.csv.gz")
+    assert concatenated_file_name('db.schema."Table"', part, False) == "Table.csv.gz"
+    assert concatenated_file_name("my_table", part, True) == "my_table.csv"
+    assert (
+        concatenated_file_name("t", Path("data_0_0_0.snappy.parquet"), True)
+        == "t.snappy.parquet"
+    )
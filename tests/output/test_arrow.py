@@ -0,0 +1,106 @@
+import io
+import json
+
+import pytest
+from snowflake.cli.api.output.arrow import (
+    fetch_arrow_batches,
+    iter_json_chunks,
+    write_csv,
+    write_parquet,
+)
+
+from tests.testing_utils.fixtures import *
+
+pyarrow = pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def batches():
+    schema = pyarrow.schema([("ID", pyarrow.int64()), ("NAME", pyarrow.string())])
+    return [
+        pyarrow.table({"ID": [1, 2], "NAME": ["a", 'b "quoted"']}, schema=schema),
+        pyarrow.table({"ID": [3], "NAME": [None]}, schema=schema),
+    ]
+
+
+def test_fetch_arrow_batches_falls_back_without_arrow_result(mock_cursor):
+    assert fetch_arrow_batches(mock_cursor(rows=[(1,)], columns=["ID"])) is None
+
+
+def test_write_parquet_of_batches_with_different_int_widths(
+    batches_with_different_int_widths, tmp_path
+):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "result.parquet"
+    write_parquet(batches_with_different_int_widths, path)
+
+    table = parquet.read_table(path)
+    assert table.schema.field("ID").type == pyarrow.int64()
+    assert table.to_pydict() == {"ID": [1, 2, 1000]}
+
+
+@pytest.mark.parametrize("indent", [2, 4])
+def test_iter_json_chunks_matches_json_dump(batches, indent):
+    rows = [{"ID": 1, "NAME": "a"}, {"ID": 2, "NAME": 'b "quoted"'}]
+    rows.append({"ID": 3, "NAME": None})
+    encoder = json.JSONEncoder(indent=indent)
+
+    chunks = iter_json_chunks(batches, ["ID", "NAME"], encoder, indent=indent)
+
+    assert list(chunks) == list(encoder.iterencode(rows))
+
+
+def test_iter_json_chunks_of_empty_result():
+    chunks = iter_json_chunks(iter([]), ["ID"], json.JSONEncoder(), indent=4)
+
+    assert "".join(chunks) == json.dumps([], indent=4)
+
+
+def test_write_csv(batches):
+    stream = io.BytesIO()
+    write_csv(batches, stream)
+
+    assert stream.getvalue().decode().splitlines() == [
+        '"ID","NAME"',
+        '1,"a"',
+        '2,"b ""quoted"""',
+        "3,",
+    ]
+
+
+@pytest.fixture
+def batches_with_different_int_widths():
+    return [
+        pyarrow.table({"ID": pyarrow.array([1, 2], pyarrow.int8())}),
+        pyarrow.table({"ID": pyarrow.array([1000], pyarrow.int16())}),
+    ]
+
+
+def test_write_csv_of_batches_with_different_int_widths(
+    batches_with_different_int_widths,
+):
+    stream = io.BytesIO()
+    rows = write_csv(batches_with_different_int_widths, stream)
+
+    assert rows == 3
+    assert stream.getvalue().decode().splitlines() == ['"ID"', "1", "2", "1000"]
+
+
+def test_write_empty_csv():
+    stream = io.BytesIO()
+    write_csv(iter([]), stream)
+
+    assert stream.getvalue() == b""
+
+
+def test_write_parquet(batches, tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "result.parquet"
+    write_parquet(batches, path)
+
+    parquet_file = parquet.ParquetFile(path)
+    assert parquet_file.num_row_groups == 2
+    assert parquet_file.read().to_pydict() == {
+        "ID": [1, 2, 3],
+        "NAME": ["a", 'b "quoted"', None],
+    }
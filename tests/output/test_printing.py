@@ -1,8 +1,11 @@
-from datetime import datetime
+import json
+from datetime import date, datetime
+from decimal import Decimal
 from textwrap import dedent
 
 from snowflake.cli.api.output.formats import OutputFormat
 from snowflake.cli.api.output.types import (
+    ArrowQueryResult,
     CollectionResult,
     MessageResult,
     MultipleResults,
@@ -11,6 +14,7 @@ from snowflake.cli.api.output.types import (
     SingleQueryResult,
 )
 from snowflake.cli.app.printing import print_result
+from snowflake.connector.cursor import ResultMetadata
 
 from tests.testing_utils.conversion import get_output, get_output_as_json
 from tests.testing_utils.fixtures import *
@@ -18,6 +22,8 @@ from tests.testing_utils.fixtures import *
 
 class MockResultMetadata(NamedTuple):
     name: str
+    type_code: Optional[int] = None
+    scale: Optional[int] = None
 
 
 def test_single_value_from_query(capsys, mock_cursor):
@@ -301,6 +307,90 @@ def test_print_with_no_response_json(capsys):
     assert get_output(capsys) == "null"
 
 
+def _print_json(result, multiple, capsys):
+    print_result(
+        MultipleResults([result]) if multiple else result,
+        output_format=OutputFormat.JSON,
+    )
+    return get_output(capsys)
+
+
+def _typed_columns(**type_codes):
+    return [
+        ResultMetadata(name, type_code, None, None, None, scale, True)
+        for name, (type_code, scale) in type_codes.items()
+    ]
+
+
+@pytest.mark.parametrize("multiple", [False, True])
+def test_print_json_from_arrow_batches(capsys, mock_cursor, multiple):
+    pyarrow = pytest.importorskip("pyarrow")
+    columns = _typed_columns(
+        date=(3, None), timestamp=(8, None), number=(0, 0), text=(2, None)
+    )
+    rows = [
+        (date(2022, 3, 21), datetime(2022, 3, 21, 10, 30, 0, 5), 42, "zażółć"),
+        (None, None, None, None),
+    ]
+    batches = [
+        pyarrow.table(
+            {
+                "date": pyarrow.array([rows[0][0], None], pyarrow.date32()),
+                # Snowflake sends nanoseconds, while the rows hold microseconds
+                "timestamp": pyarrow.array(
+                    [1647858600000005999, None], pyarrow.timestamp("ns")
+                ),
+                "number": pyarrow.array([42, None], pyarrow.int8()),
+                "text": [rows[0][3], None],
+            }
+        )
+    ]
+
+    def _cursor():
+        cursor = mock_cursor(rows=list(rows), columns=[])
+        cursor._columns = columns  # noqa: SLF001
+        return cursor
+
+    without_arrow = _print_json(ArrowQueryResult(_cursor()), multiple, capsys)
+    cursor = _cursor()
+    with mock.patch.object(cursor, "fetch_arrow_batches", return_value=batches):
+        with_arrow = _print_json(ArrowQueryResult(cursor), multiple, capsys)
+    # the rows were not read, so the output comes from the batches
+    assert cursor.fetchone() == rows[0]
+
+    assert with_arrow == without_arrow
+    expected = [
+        {
+            "date": "2022-03-21",
+            "timestamp": "2022-03-21T10:30:00.000005",
+            "number": 42,
+            "text": "zażółć",
+        },
+        dict.fromkeys(["date", "timestamp", "number", "text"]),
+    ]
+    assert json.loads(with_arrow) == ([expected] if multiple else expected)
+    assert "za\\u017c\\u00f3\\u0142\\u0107" in with_arrow
+
+
+def test_print_json_of_scaled_numbers_does_not_use_arrow_batches(capsys, mock_cursor):
+    cursor = mock_cursor(rows=[(Decimal("1.50"),)], columns=[])
+    cursor._columns = _typed_columns(decimal=(0, 2))  # noqa: SLF001
+
+    with mock.patch.object(cursor, "fetch_arrow_batches") as mock_fetch:
+        output = _print_json(ArrowQueryResult(cursor), False, capsys)
+
+    mock_fetch.assert_not_called()
+    assert json.loads(output) == [{"decimal": "1.50"}]
+
+
+def test_print_arrow_result_without_arrow_batches_json(capsys, _create_mock_cursor):
+    print_result(
+        ArrowQueryResult(_create_mock_cursor()), output_format=OutputFormat.JSON
+    )
+
+    assert [row["number"] for row in get_output_as_json(capsys)] == [42, 43]
+
+
 @pytest.fixture
 def _empty_cursor(mock_cursor):
     return lambda: mock_cursor(
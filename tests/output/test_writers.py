@@ -0,0 +1,144 @@
+import csv
+import json
+from datetime import datetime
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from click import ClickException
+from snowflake.cli.api.output.types import ArrowQueryResult, QueryResult
+from snowflake.cli.api.output.writers import OutputFileFormat, write_query_result
+
+from tests.testing_utils.fixtures import *
+
+COLUMNS = ["ID", "NAME", "CREATED", "AMOUNT"]
+ROWS = [
+    (1, "a", datetime(2024, 1, 2, 3, 4, 5), Decimal("1.50")),
+    (2, 'b, "quoted"', datetime(2024, 1, 3), None),
+]
+
+
+@pytest.fixture
+def _query_result(mock_cursor):
+    return lambda rows=ROWS: QueryResult(mock_cursor(rows=list(rows), columns=COLUMNS))
+
+
+@pytest.mark.parametrize(
+    "file_name, expected",
+    [
+        ("out.csv", OutputFileFormat.CSV),
+        ("out.NDJSON", OutputFileFormat.NDJSON),
+        ("out.jsonl", OutputFileFormat.NDJSON),
+        ("out.parquet", OutputFileFormat.PARQUET),
+    ],
+)
+def test_output_file_format_from_path(file_name, expected):
+    assert OutputFileFormat.from_path(Path(file_name)) == expected
+
+
+def test_output_file_format_from_unknown_extension():
+    with pytest.raises(ClickException, match="Cannot infer the format of out.txt"):
+        OutputFileFormat.from_path(Path("out.txt"))
+
+
+def test_write_csv_from_rows(_query_result, tmp_path):
+    path = tmp_path / "out.csv"
+
+    assert write_query_result(_query_result(), path, OutputFileFormat.CSV) == 2
+
+    with path.open(newline="") as fh:
+        assert list(csv.reader(fh)) == [
+            COLUMNS,
+            ["1", "a", "2024-01-02T03:04:05", "1.50"],
+            ["2", 'b, "quoted"', "2024-01-03T00:00:00", ""],
+        ]
+
+
+def test_write_empty_csv_from_rows_has_header(_query_result, tmp_path):
+    path = tmp_path / "out.csv"
+
+    assert write_query_result(_query_result([]), path, OutputFileFormat.CSV) == 0
+    assert path.read_text().splitlines() == [",".join(COLUMNS)]
+
+
+def test_write_ndjson_from_rows(_query_result, tmp_path):
+    path = tmp_path / "out.ndjson"
+
+    assert write_query_result(_query_result(), path, OutputFileFormat.NDJSON) == 2
+
+    assert [json.loads(line) for line in path.read_text().splitlines()] == [
+        {"ID": 1, "NAME": "a", "CREATED": "2024-01-02T03:04:05", "AMOUNT": "1.50"},
+        {
+            "ID": 2,
+            "NAME": 'b, "quoted"',
+            "CREATED": "2024-01-03T00:00:00",
+            "AMOUNT": None,
+        },
+    ]
+
+
+def test_write_parquet_from_rows_in_chunks(_query_result, tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "out.parquet"
+
+    with mock.patch("snowflake.cli.api.output.writers.ROWS_PER_CHUNK", 1):
+        assert write_query_result(_query_result(), path, OutputFileFormat.PARQUET) == 2
+
+    parquet_file = parquet.ParquetFile(path)
+    assert parquet_file.num_row_groups == 2
+    assert parquet_file.read().column("NAME").to_pylist() == ["a", 'b, "quoted"']
+
+
+def test_write_empty_parquet_from_rows_keeps_columns(_query_result, tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "out.parquet"
+
+    assert write_query_result(_query_result([]), path, OutputFileFormat.PARQUET) == 0
+    assert parquet.read_table(path).column_names == COLUMNS
+
+
+@pytest.mark.parametrize(
+    "file_format", [OutputFileFormat.CSV, OutputFileFormat.PARQUET]
+)
+def test_write_from_arrow_batches(file_format, mock_cursor, tmp_path):
+    pyarrow = pytest.importorskip("pyarrow")
+    cursor = mock_cursor(rows=[], columns=["ID"])
+    batches = [pyarrow.table({"ID": [1, 2]}), pyarrow.table({"ID": [3]})]
+    path = tmp_path / f"out.{file_format.value}"
+
+    with mock.patch.object(cursor, "fetch_arrow_batches", return_value=batches):
+        rows = write_query_result(ArrowQueryResult(cursor), path, file_format)
+
+    assert rows == 3
+    if file_format == OutputFileFormat.CSV:
+        assert path.read_text().splitlines() == ['"ID"', "1", "2", "3"]
+    else:
+        parquet = pytest.importorskip("pyarrow.parquet")
+        assert parquet.read_table(path).column("ID").to_pylist() == [1, 2, 3]
+
+
+def test_write_ndjson_from_arrow_batches(mock_cursor, tmp_path):
+    pyarrow = pytest.importorskip("pyarrow")
+    cursor = mock_cursor(rows=[], columns=["ID"])
+    batches = [pyarrow.table({"ID": [1, None]}), pyarrow.table({"ID": [3]})]
+    path = tmp_path / "out.ndjson"
+
+    with mock.patch.object(cursor, "fetch_arrow_batches", return_value=batches):
+        rows = write_query_result(
+            ArrowQueryResult(cursor), path, OutputFileFormat.NDJSON
+        )
+
+    assert rows == 3
+    assert path.read_text().splitlines() == ['{"ID":1}', '{"ID":null}', '{"ID":3}']
+
+
+def test_write_empty_csv_from_arrow_batches_has_header(mock_cursor, tmp_path):
+    pytest.importorskip("pyarrow")
+    cursor = mock_cursor(rows=[], columns=["ID", "NAME"])
+    path = tmp_path / "out.csv"
+
+    with mock.patch.object(cursor, "fetch_arrow_batches", return_value=iter([])):
+        rows = write_query_result(ArrowQueryResult(cursor), path, OutputFileFormat.CSV)
+
+    assert rows == 0
+    assert path.read_text().splitlines() == ['"ID","NAME"']
@@ -18,6 +18,7 @@ _KNOWN_SIG_GLOBAL_PARAMETERS_WITH_CONNECTION = [
     "warehouse",
     "temporary_connection",
     "mfa_passcode",
+    "profile_queries",
     "format",
     "verbose",
     "debug",
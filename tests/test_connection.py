@@ -293,6 +293,7 @@ def test_temporary_connection(mock_connector, mock_ctx, option, runner):
     assert result.exit_code == 0
     mock_connector.assert_called_once_with(
         application="SNOWCLI.OBJECT.LIST",
+        session_parameters={"QUERY_TAG": mock.ANY},
         account="test_account",
         user="snowcli_test",
         password="top_secret",
@@ -371,6 +372,7 @@ def test_key_pair_authentication(mock_connector, mock_ctx, runner):
     assert result.exit_code == 0
     mock_connector.assert_called_once_with(
         application="SNOWCLI.OBJECT.LIST",
+        session_parameters={"QUERY_TAG": mock.ANY},
         private_key=private_key,
         account="test_account",
         user="snowcli_test",
@@ -420,6 +422,7 @@ def test_key_pair_authentication_from_config(
     mock_load.assert_called_once_with("~/sf_private_key.p8")
     mock_connector.assert_called_once_with(
         application="SNOWCLI.OBJECT.LIST",
+        session_parameters={"QUERY_TAG": mock.ANY},
         account="my_account",
         user="jdoe",
         authenticator="SNOWFLAKE_JWT",
@@ -543,6 +546,7 @@ def test_connection_details_are_resolved_using_environment_variables(
         assert kwargs == {
             "account": "some_account",
             "application": "SNOWCLI.SQL",
+            "session_parameters": {"QUERY_TAG": mock.ANY},
             "database": "test_database",
             "warehouse": "large",
             "schema": "my_schema",
@@ -601,6 +605,7 @@ def test_flags_take_precedence_before_environment_variables(
         assert kwargs == {
             "account": "account_from_flag",
             "application": "SNOWCLI.SQL",
+            "session_parameters": {"QUERY_TAG": mock.ANY},
             "database": "database_from_flag",
             "warehouse": "large",
             "schema": "schema_from_flag",
@@ -640,6 +645,7 @@ def test_source_precedence(mock_connect, runner):
         "user": "python",  # from config
         "account": "account_from_flag",
         "application": "SNOWCLI.SQL",
+        "session_parameters": {"QUERY_TAG": mock.ANY},
         "database": "database_from_connection_env",
         "role": "role_from_global_env",
     }
@@ -41,6 +41,7 @@ def test_custom_config_path(mock_conn, runner, mock_cursor):
     assert result.exit_code == 0, result.output
     mock_conn.assert_called_once_with(
         application="SNOWCLI.OBJECT.LIST",
+        session_parameters={"QUERY_TAG": mock.ANY},
         database="db_for_test",
         schema="test_public",
         role="test_role",
@@ -1,3 +1,5 @@
+import json
+
 from tests.testing_utils.fixtures import *
 
 
@@ -68,3 +70,42 @@ def test_no_output_from_connection(mock_connect, runner):
 
     result = runner.invoke(["sql", "-q", "select 1"])
     assert funny_text not in result.output
+
+
+@mock.patch("snowflake.connector.connect")
+def test_query_tag_is_set_for_command(mock_connect, runner):
+    result = runner.invoke(["sql", "-q", "select 1", "-c", "empty"])
+
+    assert result.exit_code == 0, result.output
+    session_parameters = mock_connect.call_args.kwargs["session_parameters"]
+    query_tag = json.loads(session_parameters["QUERY_TAG"])
+    assert query_tag["source"] == "snowcli"
+    assert query_tag["command"] == "sql"
+    assert len(query_tag["invocation_id"]) == 32
+    assert "project" not in query_tag
+
+
+@mock.patch("snowflake.connector.connect")
+@mock.patch("snowflake.cli.app.snow_connector.get_connection")
+def test_query_tag_from_connection_is_kept(mock_get_connection, mock_connect, runner):
+    mock_get_connection.return_value = {
+        "account": "account",
+        "session_parameters": {"query_tag": "my_tag"},
+    }
+
+    result = runner.invoke(["sql", "-q", "select 1", "-c", "tagged"])
+
+    assert result.exit_code == 0, result.output
+    assert mock_connect.call_args.kwargs["session_parameters"] == {
+        "query_tag": "my_tag"
+    }
+
+
+@pytest.mark.parametrize("value", ["false", "0", "off"])
+@mock.patch("snowflake.connector.connect")
+def test_query_tag_can_be_turned_off(mock_connect, runner, value):
+    with mock.patch.dict(os.environ, {"SNOWFLAKE_CLI_SET_QUERY_TAG": value}):
+        result = runner.invoke(["sql", "-q", "select 1", "-c", "empty"])
+
+    assert result.exit_code == 0, result.output
+    assert "session_parameters" not in mock_connect.call_args.kwargs
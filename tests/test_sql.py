@@ -1,8 +1,20 @@
+from io import StringIO
 from pathlib import Path
+from textwrap import dedent
 from tempfile import NamedTemporaryFile
 from unittest import mock
 from snowflake.connector.cursor import DictCursor
+from snowflake.cli.api.cli_global_context import cli_context
 from snowflake.cli.api.sql_execution import SqlExecutionMixin
+from click import UsageError
+from snowflake.cli.plugins.sql.manager import (
+    DEFAULT_FILES_PARALLEL,
+    SqlManager,
+    expand_sql_files,
+    split_into_phases,
+)
+from snowflake.connector.constants import QueryStatus
+from snowflake.connector.errors import ProgrammingError
 from snowflake.cli.api.exceptions import SnowflakeSQLExecutionError
 
 import pytest
@@ -11,19 +23,30 @@ from typer.testing import CliRunner
 from tests.testing_utils.result_assertions import assert_that_result_is_usage_error
 
 
-@mock.patch("snowflake.cli.plugins.sql.manager.SqlExecutionMixin._execute_string")
-def test_sql_execute_query(mock_execute, runner, mock_cursor):
-    mock_execute.return_value = (mock_cursor(["row"], []) for _ in range(1))
+@pytest.fixture
+def _mock_execute_statements(mock_cursor):
+    executed = []
 
+    def _execute(statements, *_):
+        for statement, _ in statements:
+            executed.append(statement)
+            yield mock_cursor(["row"], [])
+
+    with mock.patch(
+        "snowflake.cli.plugins.sql.manager.SqlManager._execute_statements",
+        side_effect=_execute,
+    ):
+        yield executed
+
+
+def test_sql_execute_query(_mock_execute_statements, runner):
     result = runner.invoke(["sql", "-q", "query"])
 
     assert result.exit_code == 0
-    mock_execute.assert_called_once_with("query")
+    assert _mock_execute_statements == ["query"]
 
 
-@mock.patch("snowflake.cli.plugins.sql.manager.SqlExecutionMixin._execute_string")
-def test_sql_execute_file(mock_execute, runner, mock_cursor):
-    mock_execute.return_value = (mock_cursor(["row"], []) for _ in range(1))
+def test_sql_execute_file(_mock_execute_statements, runner):
     query = "query from file"
 
     with NamedTemporaryFile("r") as tmp_file:
@@ -31,18 +54,59 @@ def test_sql_execute_file(mock_execute, runner, mock_cursor):
         result = runner.invoke(["sql", "-f", tmp_file.name])
 
     assert result.exit_code == 0
-    mock_execute.assert_called_once_with(query)
+    assert _mock_execute_statements == [query]
 
 
-@mock.patch("snowflake.cli.plugins.sql.manager.SqlExecutionMixin._execute_string")
-def test_sql_execute_from_stdin(mock_execute, runner, mock_cursor):
-    mock_execute.return_value = (mock_cursor(["row"], []) for _ in range(1))
+def test_sql_execute_from_stdin(_mock_execute_statements, runner):
     query = "query from input"
 
     result = runner.invoke(["sql", "-i"], input=query)
 
     assert result.exit_code == 0
-    mock_execute.assert_called_once_with(query)
+    assert _mock_execute_statements == [query]
+
+
+def test_sql_execute_multiple_statements_from_file(_mock_execute_statements, runner):
+    with NamedTemporaryFile("r") as tmp_file:
+        Path(tmp_file.name).write_text(
+            "select 1;\n-- comment\nselect 2;\n\nput file://a @stage;\n"
+        )
+        result = runner.invoke(["sql", "-f", tmp_file.name])
+
+    assert result.exit_code == 0, result.output
+    assert _mock_execute_statements == [
+        "select 1;",
+        "select 2;",
+        "put file://a @stage;",
+    ]
+
+
+def test_sql_statements_are_executed_as_they_are_read():
+    conn = mock.MagicMock()
+    reads = []
+
+    class _Stream(StringIO):
+        def readline(self, *args):
+            line = super().readline(*args)
+            reads.append(line)
+            return line
+
+    with mock.patch(
+        "snowflake.cli.plugins.sql.manager.SqlManager._conn", conn
+    ), mock.patch("sys.stdin", _Stream("select 1;\nselect 2;\nselect 3;\n")):
+        single_statement, cursors = SqlManager().execute(None, None, True)
+        assert not single_statement
+        # only the statements needed to tell there are several were read so far
+        assert reads == ["select 1;\n", "select 2;\n"]
+        next(cursors)
+        assert reads == ["select 1;\n", "select 2;\n"]
+        assert len(list(cursors)) == 2
+
+    assert conn.cursor.return_value.execute.mock_calls == [
+        mock.call("select 1;", _is_put_get=False),
+        mock.call("select 2;", _is_put_get=False),
+        mock.call("select 3;", _is_put_get=False),
+    ]
 
 
 def test_sql_fails_if_no_query_file_or_stdin(runner):
@@ -170,3 +234,458 @@ def test_show_specific_object_sql_execution_error(mock_execute):
     mock_execute.assert_called_once_with(
         r"show objects like 'EXAMPLE\\_ID'", cursor_class=DictCursor
     )
+
+
+def _follow_use_statements(connection):
+    """Updates the mock connection from executed USE statements, like the connector."""
+
+    def _execute(query, **kwargs):
+        words = query.split()
+        if words[:2] == ["use", "role"]:
+            connection.role = words[2].upper()
+        elif words[:2] == ["USE", "DATABASE"]:
+            connection.database, connection.schema = words[2].upper(), "PUBLIC"
+        elif words[0] == "USE":
+            connection.database, connection.schema = words[1].upper().split(".")
+
+    return _execute
+
+
+@mock.patch("snowflake.cli.plugins.sql.manager.SqlExecutionMixin._execute_query")
+def test_nested_use_role_reads_current_role_from_connection(
+    mock_execute, unknown_session_connection
+):
+    unknown_session_connection.role = "OLD_ROLE"
+    mock_execute.side_effect = _follow_use_statements(unknown_session_connection)
+    mixin = SqlExecutionMixin()
+
+    with mixin.use_role("new_role"):
+        with mixin.use_role("new_role"):
+            pass
+        with mixin.use_role("other_role"):
+            pass
+
+    assert mock_execute.mock_calls == [
+        mock.call("use role new_role"),
+        mock.call("use role other_role"),
+        mock.call("use role NEW_ROLE"),
+        mock.call("use role OLD_ROLE"),
+    ]
+
+
+@mock.patch("snowflake.cli.plugins.sql.manager.SqlExecutionMixin._execute_query")
+def test_check_schema_exists_skips_schema_in_use(
+    mock_execute, unknown_session_connection
+):
+    mock_execute.side_effect = _follow_use_statements(unknown_session_connection)
+    mixin = SqlExecutionMixin()
+
+    mixin.check_schema_exists("db", "schema")
+    mixin.check_schema_exists("db", "schema")
+    mixin.check_database_exists("db")
+    mixin.check_schema_exists("db", "other_schema")
+
+    assert mock_execute.mock_calls == [
+        mock.call("USE DATABASE db"),
+        mock.call("USE db.schema"),
+        mock.call("USE db.other_schema"),
+    ]
+
+
+@mock.patch("snowflake.cli.plugins.sql.manager.SqlExecutionMixin._execute_query")
+def test_validated_schema_is_only_restored(mock_execute, unknown_session_connection):
+    mock_execute.side_effect = _follow_use_statements(unknown_session_connection)
+    mixin = SqlExecutionMixin()
+
+    mixin.check_schema_exists("db", "schema")
+    # e.g. changed by a procedure the CLI does not know about
+    unknown_session_connection.schema = "OTHER_SCHEMA"
+    mixin.check_schema_exists("db", "schema")
+
+    assert mock_execute.mock_calls == [
+        mock.call("USE DATABASE db"),
+        mock.call("USE db.schema"),
+        mock.call("USE db.schema"),
+    ]
+
+
+@mock.patch("snowflake.cli.plugins.sql.manager.SqlExecutionMixin._execute_query")
+def test_execute_schema_query_validates_schema_once(
+    mock_execute, unknown_session_connection
+):
+    unknown_session_connection.database = "DB"
+    unknown_session_connection.schema = "SCHEMA"
+    mixin = SqlExecutionMixin()
+    for name in ["a", "b", "c"]:
+        mixin._execute_schema_query(f"describe service {name}")
+
+    assert mock_execute.mock_calls == [
+        mock.call("USE DATABASE DB"),
+        mock.call("USE DB.SCHEMA"),
+        mock.call("describe service a"),
+        mock.call("describe service b"),
+        mock.call("describe service c"),
+    ]
+
+
+def test_split_into_phases():
+    query = dedent(
+        """\
+        create table a as select 1;
+        create table b as select 2; -- not a barrier
+        -- @barrier
+        insert into a select * from b;
+        use warehouse xl;
+        insert into b select 3;
+        put file:///tmp/data.csv @stage;
+        insert into b select 4;
+        -- @barrier
+        """
+    )
+
+    assert split_into_phases(query) == [
+        ["create table a as select 1;", "create table b as select 2;"],
+        ["insert into a select * from b;"],
+        ["use warehouse xl;"],
+        ["insert into b select 3;"],
+        ["put file:///tmp/data.csv @stage;"],
+        ["insert into b select 4;"],
+    ]
+
+
+def _mock_async_connection(statuses):
+    """Returns connection mock whose queries report the given statuses in order."""
+    conn = mock.MagicMock()
+    submitted = []
+
+    def _cursor():
+        cursor = mock.MagicMock()
+
+        def _execute_async(statement):
+            submitted.append(statement)
+            cursor.sfqid = f"qid{len(submitted)}"
+
+        cursor.execute_async.side_effect = _execute_async
+        return cursor
+
+    conn.cursor.side_effect = _cursor
+    conn.get_query_status.side_effect = lambda qid: statuses[qid].pop(0)
+    conn.is_still_running.side_effect = lambda status: status == QueryStatus.RUNNING
+    conn.is_an_error.side_effect = (
+        lambda status: status == QueryStatus.FAILED_WITH_ERROR
+    )
+    return conn, submitted
+
+
+@mock.patch("snowflake.cli.plugins.sql.manager.time.sleep")
+@mock.patch("snowflake.cli.plugins.sql.manager.SqlExecutionMixin._execute_query")
+def test_execute_parallel(mock_execute, mock_sleep):
+    conn, submitted = _mock_async_connection(
+        {
+            "qid1": [QueryStatus.RUNNING, QueryStatus.RUNNING, QueryStatus.SUCCESS],
+            "qid2": [QueryStatus.SUCCESS],
+            "qid3": [QueryStatus.SUCCESS],
+        }
+    )
+
+    with mock.patch.object(
+        SqlManager, "_conn", new_callable=mock.PropertyMock, return_value=conn
+    ):
+        results = SqlManager().execute_parallel(
+            "select 1;\nselect 2;\n-- @barrier\nselect 3;", None, False, parallel=2
+        )
+
+    assert submitted == ["select 1;", "select 2;", "select 3;"]
+    for i, cursor in enumerate(results, start=1):
+        cursor.query_result.assert_called_once_with(f"qid{i}")
+    # results are fetched without running result_scan queries
+    mock_execute.assert_not_called()
+    # the barrier waits until the first query finished
+    mock_sleep.assert_called_once()
+
+
+@mock.patch("snowflake.cli.plugins.sql.manager.time.sleep")
+@mock.patch("snowflake.cli.plugins.sql.manager.SqlExecutionMixin._execute_query")
+def test_execute_parallel_transfers_files_synchronously(mock_execute, mock_sleep):
+    conn, submitted = _mock_async_connection(
+        {"qid1": [QueryStatus.SUCCESS], "qid2": [QueryStatus.SUCCESS]}
+    )
+
+    with mock.patch.object(
+        SqlManager, "_conn", new_callable=mock.PropertyMock, return_value=conn
+    ):
+        results = SqlManager().execute_parallel(
+            "select 1;\nput file:///tmp/data.csv @stage;\nselect 2;",
+            None,
+            False,
+            parallel=2,
+        )
+
+    assert submitted == ["select 1;", "select 2;"]
+    put_cursor = results[1]
+    put_cursor.execute.assert_called_once_with(
+        "put file:///tmp/data.csv @stage;", _is_put_get=True
+    )
+    put_cursor.execute_async.assert_not_called()
+    put_cursor.query_result.assert_not_called()
+    results[0].query_result.assert_called_once_with("qid1")
+    results[2].query_result.assert_called_once_with("qid2")
+    mock_execute.assert_not_called()
+
+
+@mock.patch("snowflake.cli.plugins.sql.manager.time.sleep")
+@mock.patch("snowflake.cli.plugins.sql.manager.SqlExecutionMixin._execute_query")
+def test_execute_parallel_stops_after_failure(mock_execute, mock_sleep):
+    conn, submitted = _mock_async_connection(
+        {
+            "qid1": [QueryStatus.RUNNING, QueryStatus.FAILED_WITH_ERROR],
+            "qid2": [QueryStatus.RUNNING, QueryStatus.SUCCESS],
+        }
+    )
+    conn.get_query_status_throw_if_error.side_effect = ProgrammingError("failed")
+
+    with mock.patch.object(
+        SqlManager, "_conn", new_callable=mock.PropertyMock, return_value=conn
+    ):
+        with pytest.raises(ProgrammingError):
+            SqlManager().execute_parallel(
+                "select 1;\nselect 2;\n-- @barrier\nselect 3;", None, False, parallel=2
+            )
+
+    assert submitted == ["select 1;", "select 2;"]
+    conn.get_query_status_throw_if_error.assert_called_once_with("qid1")
+    mock_execute.assert_not_called()
+
+
+@mock.patch("snowflake.cli.plugins.sql.commands.SqlManager.execute_parallel")
+def test_sql_execute_parallel(mock_execute_parallel, runner, mock_cursor):
+    mock_execute_parallel.return_value = [
+        mock_cursor(rows=[(1,)], columns=["A"]),
+        mock_cursor(rows=[(2,)], columns=["B"]),
+    ]
+
+    result = runner.invoke(
+        ["sql", "-q", "select 1 as a; select 2 as b", "--parallel", "4"]
+    )
+
+    assert result.exit_code == 0, result.output
+    mock_execute_parallel.assert_called_once_with(
+        "select 1 as a; select 2 as b", None, False, 4
+    )
+    assert result.output.index("A") < result.output.index("B")
+
+
+def _write_sql_files(directory: Path, contents):
+    for name, content in contents.items():
+        (directory / name).write_text(content)
+
+
+def test_expand_sql_files(temp_dir):
+    directory = Path(temp_dir)
+    _write_sql_files(directory, {"2.sql": "", "1.sql": "", "notes.txt": ""})
+    (directory / "nested").mkdir()
+    other_file = directory / "nested" / "other.sql"
+    other_file.write_text("")
+
+    assert expand_sql_files([directory, other_file]) == [
+        directory / "1.sql",
+        directory / "2.sql",
+        other_file,
+    ]
+
+
+def test_expand_sql_files_fails_on_directory_without_sql_files(temp_dir):
+    with pytest.raises(UsageError, match="No \\*.sql files found"):
+        expand_sql_files([Path(temp_dir)])
+
+
+@mock.patch("snowflake.cli.plugins.sql.manager.cli_context")
+def test_execute_files_runs_each_file_in_new_session(mock_context, temp_dir):
+    directory = Path(temp_dir)
+    _write_sql_files(
+        directory,
+        {"a.sql": "select 1;\nselect 2;", "b.sql": "fail;", "c.sql": "select 3;"},
+    )
+    connections = []
+
+    def _new_connection():
+        connection = mock.MagicMock()
+        cursor = connection.cursor.return_value
+        cursor.rowcount = 10
+
+        def _execute(statement, **kwargs):
+            if statement == "fail;":
+                raise ProgrammingError("syntax error")
+
+        cursor.execute.side_effect = _execute
+        connections.append(connection)
+        return connection
+
+    mock_context.new_connection.side_effect = _new_connection
+    files = [directory / name for name in ("a.sql", "b.sql", "c.sql")]
+
+    summary = SqlManager().execute_files(files, parallel=2)
+
+    assert [(row["file"], row["status"]) for row in summary] == [
+        (str(files[0]), "SUCCESS"),
+        (str(files[1]), "FAILED"),
+        (str(files[2]), "SUCCESS"),
+    ]
+    assert [(row["statements"], row["rows"]) for row in summary] == [
+        (2, 20),
+        (0, 0),
+        (1, 10),
+    ]
+    assert "syntax error" in summary[1]["error"]
+    assert len(connections) == 3
+    for connection in connections:
+        connection.close.assert_called_once()
+
+
+@mock.patch("snowflake.cli.plugins.sql.commands.SqlManager.execute_files")
+def test_sql_execute_directory(mock_execute_files, runner, temp_dir):
+    directory = Path(temp_dir)
+    _write_sql_files(directory, {"b.sql": "select 2;", "a.sql": "select 1;"})
+    mock_execute_files.return_value = [
+        {
+            "file": name,
+            "status": "SUCCESS",
+            "statements": 1,
+            "rows": 1,
+            "elapsed_seconds": 0.5,
+            "error": None,
+        }
+        for name in ("a.sql", "b.sql")
+    ]
+
+    result = runner.invoke(["sql", "-f", str(directory), "--parallel", "3"])
+
+    assert result.exit_code == 0, result.output
+    mock_execute_files.assert_called_once_with(
+        [directory / "a.sql", directory / "b.sql"], 3
+    )
+    assert "a.sql" in result.output and "SUCCESS" in result.output
+
+
+@mock.patch("snowflake.cli.plugins.sql.commands.SqlManager.execute_files")
+def test_sql_execute_multiple_files_reports_failures(
+    mock_execute_files, runner, temp_dir
+):
+    directory = Path(temp_dir)
+    _write_sql_files(directory, {"a.sql": "select 1;", "b.sql": "fail;"})
+    mock_execute_files.return_value = [
+        {
+            "file": "a.sql",
+            "status": "SUCCESS",
+            "statements": 1,
+            "rows": 1,
+            "elapsed_seconds": 0.5,
+            "error": None,
+        },
+        {
+            "file": "b.sql",
+            "status": "FAILED",
+            "statements": 0,
+            "rows": 0,
+            "elapsed_seconds": 0.1,
+            "error": "syntax error",
+        },
+    ]
+
+    result = runner.invoke(
+        ["sql", "-f", str(directory / "a.sql"), "-f", str(directory / "b.sql")]
+    )
+
+    assert result.exit_code == 1
+    mock_execute_files.assert_called_once_with(
+        [directory / "a.sql", directory / "b.sql"], DEFAULT_FILES_PARALLEL
+    )
+    assert "syntax error" in result.output
+    assert "1 of 2 files failed." in result.output
+
+
+def test_sql_fails_if_query_and_multiple_files_provided(runner, temp_dir):
+    result = runner.invoke(["sql", "-q", "select 1", "-f", temp_dir])
+
+    assert_that_result_is_usage_error(
+        result, "Multiple input sources specified. Please specify only one. "
+    )
+
+
+@mock.patch("snowflake.cli.plugins.sql.commands.SqlManager.execute")
+def test_sql_cache_ttl_passes_result_cache(mock_execute, runner, mock_cursor):
+    mock_execute.return_value = (True, iter([mock_cursor(["row"], ["A"])]))
+
+    result = runner.invoke(["sql", "-q", "select 1", "--cache-ttl", "30"])
+
+    assert result.exit_code == 0, result.output
+    result_cache = mock_execute.call_args.kwargs["result_cache"]
+    assert result_cache.directory.name == "sql_results"
+
+
+def test_sql_cache_ttl_cannot_be_used_with_parallel(runner):
+    result = runner.invoke(
+        ["sql", "-q", "select 1", "--cache-ttl", "30", "--parallel", "2"]
+    )
+
+    assert_that_result_is_usage_error(
+        result, "--cache-ttl cannot be used with --parallel or multiple files."
+    )
+
+
+@mock.patch("snowflake.cli.plugins.sql.commands.SqlManager.execute")
+def test_sql_writes_last_result_to_output_file(
+    mock_execute, runner, mock_cursor, temp_dir
+):
+    mock_execute.return_value = (
+        False,
+        iter(
+            [
+                mock_cursor(rows=[("Statement executed",)], columns=["status"]),
+                mock_cursor(rows=[(1, "a"), (2, "b")], columns=["ID", "NAME"]),
+            ]
+        ),
+    )
+    output_file = Path(temp_dir) / "result.csv"
+
+    result = runner.invoke(
+        ["sql", "-q", "use db; select * from t", "--output-file", str(output_file)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert f"Wrote 2 rows to {output_file}." in result.output
+    assert output_file.read_text().splitlines() == ["ID,NAME", "1,a", "2,b"]
+
+
+@mock.patch("snowflake.cli.plugins.sql.commands.SqlManager.execute")
+def test_sql_output_file_format_overrides_extension(
+    mock_execute, runner, mock_cursor, temp_dir
+):
+    mock_execute.return_value = (
+        True,
+        iter([mock_cursor(rows=[(1,)], columns=["ID"])]),
+    )
+    output_file = Path(temp_dir) / "result.txt"
+
+    result = runner.invoke(
+        [
+            "sql",
+            "-q",
+            "select 1 as id",
+            "--output-file",
+            str(output_file),
+            "--output-file-format",
+            "NDJSON",
+        ]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert output_file.read_text() == '{"ID": 1}\n'
+
+
+def test_sql_output_file_format_requires_output_file(runner):
+    result = runner.invoke(["sql", "-q", "select 1", "--output-file-format", "csv"])
+
+    assert_that_result_is_usage_error(
+        result, "--output-file-format requires --output-file."
+    )
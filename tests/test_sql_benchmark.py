@@ -0,0 +1,185 @@
+from itertools import count
+from unittest import mock
+
+import pytest
+from snowflake.cli.plugins.sql.benchmark import (
+    CLIENT_METRIC,
+    BenchmarkRun,
+    percentile,
+    summarize,
+)
+from snowflake.cli.plugins.sql.manager import DISABLE_RESULT_CACHE_QUERY, SqlManager
+from snowflake.connector.errors import ProgrammingError
+
+from tests.testing_utils.fixtures import *
+from tests.testing_utils.result_assertions import assert_that_result_is_usage_error
+
+MANAGER = "snowflake.cli.plugins.sql.manager.SqlManager"
+
+
+@pytest.mark.parametrize(
+    "percent, expected", [(0, 1), (50, 50), (90, 90), (99, 99), (100, 100)]
+)
+def test_percentile(percent, expected):
+    assert percentile(list(range(100, 0, -1)), percent) == expected
+
+
+def test_summarize_client_and_server_times():
+    runs = [
+        BenchmarkRun(client_seconds=0.1, query_ids=["a", "b"]),
+        BenchmarkRun(client_seconds=0.3, query_ids=["c"]),
+        BenchmarkRun(client_seconds=0.2, query_ids=["d"]),
+    ]
+    server_times = {
+        qid: {"TOTAL_ELAPSED_TIME": t, "COMPILATION_TIME": 1, "EXECUTION_TIME": t - 1}
+        for qid, t in [("a", 20), ("b", 30), ("c", 90)]
+    }
+
+    client, total, compilation, execution = summarize(runs, server_times)
+
+    assert client == {
+        "metric": CLIENT_METRIC,
+        "runs": 3,
+        "min": 100.0,
+        "p50": 200.0,
+        "p90": 300.0,
+        "p99": 300.0,
+        "max": 300.0,
+    }
+    # the run of "d" is missing from the query history
+    assert (total["runs"], total["min"], total["max"]) == (2, 50, 90)
+    assert (compilation["min"], compilation["max"]) == (1, 2)
+    assert (execution["min"], execution["max"]) == (48, 89)
+
+
+def test_summarize_skips_missing_server_times():
+    runs = [
+        BenchmarkRun(client_seconds=0.1, query_ids=["a"]),
+        BenchmarkRun(client_seconds=0.2, query_ids=["b"]),
+    ]
+    server_times = {
+        "a": {"TOTAL_ELAPSED_TIME": 20, "COMPILATION_TIME": None, "EXECUTION_TIME": 15},
+        "b": {"TOTAL_ELAPSED_TIME": 30, "COMPILATION_TIME": 2, "EXECUTION_TIME": None},
+    }
+
+    _, total, compilation, execution = summarize(runs, server_times)
+
+    assert (total["runs"], total["min"], total["max"]) == (2, 20, 30)
+    assert (compilation["runs"], compilation["min"]) == (1, 2)
+    assert (execution["runs"], execution["min"]) == (1, 15)
+
+
+def test_summarize_without_query_history():
+    metrics = summarize([BenchmarkRun(client_seconds=0.1, query_ids=["a"])], None)
+    assert [m["metric"] for m in metrics] == [CLIENT_METRIC]
+
+
+@mock.patch("snowflake.cli.plugins.sql.manager.cli_context")
+@mock.patch(f"{MANAGER}._execute_query")
+@mock.patch(f"{MANAGER}._execute_string")
+def test_benchmark_runs_on_concurrent_sessions(
+    mock_execute_string, mock_execute_query, mock_context
+):
+    query_ids = count()
+
+    def _execute_string(query):
+        cursor = mock.MagicMock()
+        cursor.sfqid = f"qid{next(query_ids)}"
+        return iter([cursor])
+
+    def _execute_query(query, **kwargs):
+        if "query_history" in query:
+            return [
+                {
+                    "QUERY_ID": f"qid{i}",
+                    "TOTAL_ELAPSED_TIME": 10,
+                    "COMPILATION_TIME": 2,
+                    "EXECUTION_TIME": 8,
+                }
+                for i in range(2, 7)
+            ]
+        return mock.MagicMock()
+
+    mock_execute_string.side_effect = _execute_string
+    mock_execute_query.side_effect = _execute_query
+    connection = mock_context.new_connection.return_value
+
+    metrics = SqlManager().benchmark(
+        "select 1", None, False, runs=5, warmup=2, concurrency=3
+    )
+
+    assert mock_context.new_connection.call_count == 2
+    assert connection.close.call_count == 2
+    assert (
+        mock_execute_query.call_args_list[:3]
+        == [mock.call(DISABLE_RESULT_CACHE_QUERY)] * 3
+    )
+    history_query = mock_execute_query.call_args.args[0]
+    # warmup runs are not measured
+    assert "'qid0'" not in history_query and "'qid1'" not in history_query
+    assert all(f"'qid{i}'" in history_query for i in range(2, 7))
+    assert [(m["metric"], m["runs"]) for m in metrics] == [
+        (CLIENT_METRIC, 5),
+        ("server total (ms)", 5),
+        ("server compilation (ms)", 5),
+        ("server execution (ms)", 5),
+    ]
+
+
+@mock.patch(f"{MANAGER}._execute_query")
+@mock.patch(f"{MANAGER}._execute_string")
+def test_benchmark_without_query_history(mock_execute_string, mock_execute_query):
+    mock_execute_string.side_effect = lambda _: iter([mock.MagicMock(sfqid="qid")])
+
+    def _execute_query(query, **kwargs):
+        if "query_history" in query:
+            raise ProgrammingError("no current database")
+
+    mock_execute_query.side_effect = _execute_query
+
+    metrics = SqlManager().benchmark("select 1", None, False, runs=3)
+
+    assert [(m["metric"], m["runs"]) for m in metrics] == [(CLIENT_METRIC, 3)]
+
+
+@mock.patch("snowflake.cli.plugins.sql.commands.SqlManager.benchmark")
+def test_sql_benchmark_command(mock_benchmark, runner):
+    mock_benchmark.return_value = [
+        {"metric": CLIENT_METRIC, "runs": 10, "min": 1.0, "max": 2.0}
+    ]
+
+    result = runner.invoke(
+        [
+            "sql",
+            "-q",
+            "select 1",
+            "--benchmark",
+            "10",
+            "--warmup",
+            "2",
+            "--parallel",
+            "4",
+        ]
+    )
+
+    assert result.exit_code == 0, result.output
+    mock_benchmark.assert_called_once_with(
+        "select 1", None, False, 10, 2, concurrency=4
+    )
+    assert CLIENT_METRIC in result.output
+
+
+@pytest.mark.parametrize(
+    "options, error",
+    [
+        (["--warmup", "2"], "--warmup requires --benchmark."),
+        (
+            ["--benchmark", "2", "--timings"],
+            "--benchmark cannot be used with --cache-ttl, --output-file or --timings.",
+        ),
+    ],
+)
+def test_sql_benchmark_usage_errors(runner, options, error):
+    result = runner.invoke(["sql", "-q", "select 1", *options])
+
+    assert_that_result_is_usage_error(result, error)
@@ -0,0 +1,130 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from snowflake.cli.plugins.sql.manager import SqlManager
+from snowflake.cli.plugins.sql.result_cache import (
+    MAX_CACHED_ROWS,
+    ResultCache,
+    is_read_only_statement,
+)
+
+from tests.testing_utils.fixtures import *
+
+
+@pytest.fixture
+def result_cache(temp_dir):
+    return ResultCache(Path(temp_dir) / "results", ttl_seconds=60)
+
+
+def _cursor(rows, columns=("A",), query="select a"):
+    cursor = mock.MagicMock()
+    cursor.query = query
+    cursor.description = [mock.Mock() for _ in columns]
+    for metadata, name in zip(cursor.description, columns):
+        metadata.name = name
+    cursor.rowcount = len(rows)
+    cursor.__iter__.return_value = iter(rows)
+    return cursor
+
+
+@pytest.mark.parametrize(
+    "statement, expected",
+    [
+        ("select * from t;", True),
+        ("  SHOW tables;", True),
+        ("describe table t;", True),
+        ("ls @stage;", True),
+        ("insert into t values (1);", False),
+        ("use role r;", False),
+        ("select seq.nextval;", False),
+        ("select system$wait(1);", False),
+        ("select * from table(result_scan(last_query_id()));", False),
+    ],
+)
+def test_is_read_only_statement(statement, expected):
+    assert is_read_only_statement(statement) == expected
+
+
+def test_result_round_trip(result_cache):
+    rows = [
+        (1, "a", None, Decimal("1.50"), date(2024, 1, 2), b"\x00\x01"),
+        (2, "b", True, Decimal("-3"), date(2024, 1, 3), b""),
+    ]
+    columns = ("ID", "NAME", "FLAG", "AMOUNT", "DAY", "BIN")
+
+    stored = result_cache.store("key", _cursor(rows, columns))
+    cached = result_cache.get("key")
+
+    assert list(stored) == rows
+    assert list(cached) == rows
+    assert [column.name for column in cached.description] == list(columns)
+    assert cached.query == "select a"
+    assert result_cache.get("other key") is None
+
+
+def test_timestamps_keep_their_timezone(result_cache):
+    timestamp = datetime(2024, 1, 2, 3, 4, 5, 6, tzinfo=timezone.utc)
+    result_cache.store("key", _cursor([(timestamp,)]))
+
+    assert list(result_cache.get("key")) == [(timestamp,)]
+
+
+def test_expired_result_is_ignored(result_cache):
+    with mock.patch("time.time", return_value=1000):
+        result_cache.store("key", _cursor([(1,)]))
+    with mock.patch("time.time", return_value=1059):
+        assert list(result_cache.get("key")) == [(1,)]
+    with mock.patch("time.time", return_value=1060):
+        assert result_cache.get("key") is None
+
+
+def test_large_result_is_not_cached(result_cache):
+    cursor = _cursor([(1,)])
+    cursor.rowcount = MAX_CACHED_ROWS + 1
+
+    assert result_cache.store("key", cursor) is cursor
+    assert result_cache.get("key") is None
+
+
+def test_oldest_results_are_evicted(temp_dir):
+    result_cache = ResultCache(Path(temp_dir), ttl_seconds=60, max_bytes=1000)
+    for i in range(10):
+        result_cache.store(f"key{i}", _cursor([(f"value {i}" * 20,)]))
+        os.utime(result_cache._entry_path(f"key{i}"), (i, i))  # noqa: SLF001
+
+    assert result_cache.get("key0") is None
+    assert result_cache.get("key9") is not None
+    assert sum(p.stat().st_size for p in Path(temp_dir).iterdir()) <= 1000
+
+
+def test_unreadable_result_is_ignored(result_cache):
+    result_cache.store("key", _cursor([(1,)]))
+    result_cache._entry_path("key").write_bytes(b"garbage")  # noqa: SLF001
+
+    assert result_cache.get("key") is None
+
+
+def test_sql_manager_reuses_cached_results(result_cache):
+    connection = mock.MagicMock(role="R", warehouse="W", database="D", schema="S")
+    connection.cursor.side_effect = lambda: _cursor([(1,)], query="select 1")
+    manager = SqlManager(connection=connection)
+
+    def _execute(query):
+        _, cursors = manager.execute(query, None, False, result_cache=result_cache)
+        return [list(cursor) for cursor in cursors]
+
+    assert _execute("select 1;") == [[(1,)]]
+    assert _execute("select 1;") == [[(1,)]]
+    assert connection.cursor.call_count == 1
+
+    # different session context
+    connection.role = "OTHER"
+    assert _execute("select 1;") == [[(1,)]]
+    assert connection.cursor.call_count == 2
+
+    # statements which are not read-only are never cached
+    _execute("insert into t values (1);")
+    _execute("insert into t values (1);")
+    assert connection.cursor.call_count == 4
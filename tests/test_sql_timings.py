@@ -0,0 +1,119 @@
+import json
+from unittest import mock
+
+from snowflake.cli.plugins.sql.manager import SqlManager
+from snowflake.cli.plugins.sql.timings import (
+    CONNECT_STEP,
+    StatementTimings,
+    TimedCursor,
+)
+
+from tests.testing_utils.fixtures import *
+
+
+def _cursor(rows, query_id):
+    cursor = mock.MagicMock()
+    cursor.sfqid = query_id
+    cursor.rowcount = len(rows)
+    cursor.__iter__.return_value = iter(rows)
+    cursor.get_result_batches.return_value = [
+        mock.Mock(uncompressed_size=None),
+        mock.Mock(uncompressed_size=100),
+        mock.Mock(uncompressed_size=50),
+    ]
+    return cursor
+
+
+def test_sql_manager_records_statement_timings():
+    connection = mock.MagicMock()
+    connection.cursor.side_effect = [
+        _cursor([(1,), (2,)], "qid1"),
+        _cursor([], "qid2"),
+    ]
+    timings = StatementTimings()
+
+    _, cursors = SqlManager(connection=connection).execute(
+        "select a from t; delete from t;", None, False, timings=timings
+    )
+    first, second = list(cursors)
+    assert list(first) == [(1,), (2,)]
+
+    connect, select, delete = timings.statements
+    assert connect.statement == CONNECT_STEP
+    assert connect.execute_seconds is not None
+    assert (select.statement, select.query_id, select.rows, select.bytes) == (
+        "select a from t;",
+        "qid1",
+        2,
+        150,
+    )
+    assert select.submitted_at is not None
+    assert select.execute_seconds <= select.first_row_seconds
+    assert select.fetch_seconds is not None
+    # the result of the second statement was never read
+    assert (delete.query_id, delete.first_row_seconds, delete.fetch_seconds) == (
+        "qid2",
+        None,
+        None,
+    )
+
+
+def test_timed_cursor_counts_rows_of_arrow_batches():
+    cursor = mock.MagicMock()
+    cursor.fetch_arrow_batches.return_value = [
+        mock.Mock(num_rows=3),
+        mock.Mock(num_rows=2),
+    ]
+    timings = StatementTimings()
+    timing = timings.start("select 1")
+
+    batches = list(TimedCursor(cursor, timing, submitted=0).fetch_arrow_batches())
+
+    assert len(batches) == 2
+    assert timing.rows == 5
+    assert timing.fetch_seconds is not None
+
+
+def test_timings_are_appended_to_file(temp_dir):
+    path = Path(temp_dir) / "metrics.ndjson"
+    for statement in ["select 1", "select 2"]:
+        timings = StatementTimings()
+        timings.start(statement).execute_seconds = 0.12345
+        timings.append_to_file(path)
+
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [row["statement"] for row in rows] == ["select 1", "select 2"]
+    assert rows[0]["execute_seconds"] == 0.123
+
+
+@mock.patch("snowflake.cli.plugins.sql.commands.SqlManager.execute")
+def test_sql_reports_timings_after_results(mock_execute, runner, mock_cursor, temp_dir):
+    def _execute(query, file, std_in, result_cache=None, timings=None):
+        timings.record_connect(0.5)
+        timing = timings.start("select 1 as a")
+        timing.query_id = "qid"
+        return True, iter([mock_cursor(rows=[(1,)], columns=["A"])])
+
+    mock_execute.side_effect = _execute
+    timings_file = Path(temp_dir) / "metrics.ndjson"
+
+    result = runner.invoke(
+        [
+            "sql",
+            "-q",
+            "select 1 as a",
+            "--timings-file",
+            str(timings_file),
+            "--format",
+            "json",
+        ]
+    )
+
+    assert result.exit_code == 0, result.output
+    query_result, timings = json.loads(result.output)
+    assert query_result == [{"A": 1}]
+    assert [(t["statement"], t["query_id"]) for t in timings] == [
+        (CONNECT_STEP, None),
+        ("select 1 as a", "qid"),
+    ]
+    assert len(timings_file.read_text().splitlines()) == 2
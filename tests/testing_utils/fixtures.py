@@ -110,7 +110,8 @@ class MockConnectionCtx(mock.MagicMock):
 
     @property
     def role(self):
-        return "MockRole"
+        # unlike the connector, the mock does not follow executed USE ROLE statements
+        return None
 
     @property
     def host(self):
@@ -138,6 +139,8 @@ class MockConnectionCtx(mock.MagicMock):
 def mock_cursor():
     class MockResultMetadata(NamedTuple):
         name: str
+        type_code: Optional[int] = None
+        scale: Optional[int] = None
 
     class _MockCursor(SnowflakeCursor):
         def __init__(self, rows: List[Union[tuple, dict]], columns: List[str]):